@@ -4,6 +4,17 @@ try:
     from rpython.rlib.rbigint import _divrem as divrem, rbigint as bigint_type
     from rpython.rlib.rarithmetic import string_to_int
     from rpython.rlib.rstring import ParseStringOverflowError
+    from rpython.rlib.rfloat import formatd
+
+    def bigint_to_str(value):
+        return value.str()
+
+    def bigint_hash(value):
+        return value.hash()
+
+    def float_to_str(value):
+        """ The shortest string that reads back as the same float """
+        return formatd(value, 'r', 0)
 
     bigint_from_int = rbigint.fromint
     bigint_from_str = rbigint.fromstr
@@ -19,6 +30,15 @@ except ImportError:
     def bigint_from_str(value):
         return int(value)
 
+    def bigint_to_str(value):
+        return str(value)
+
+    def bigint_hash(value):
+        return hash(value)
+
+    def float_to_str(value):
+        return repr(value)
+
     def divrem(a, b):
         raise Exception("not yet implemented")
 
@@ -3,6 +3,9 @@ try:
 
     def encode_to_bytes(str_value):
         return str_value
+
+    def decode_from_bytes(bytes_value):
+        return bytes_value
 except ImportError:
     "NOT_RPYTHON"
     class Stream(object):
@@ -15,10 +18,16 @@ except ImportError:
     if sys.version_info.major > 2:
         def encode_to_bytes(str_value):
             return str_value.encode('utf-8')
+
+        def decode_from_bytes(bytes_value):
+            return bytes_value.decode('utf-8', 'replace')
     else:
         def encode_to_bytes(str_value):
             return str_value
 
+        def decode_from_bytes(bytes_value):
+            return bytes_value
+
 
 class StringStream(Stream):
     def __init__(self, string):
@@ -1,3 +1,4 @@
+from rlib.objectmodel import instantiate, we_are_translated
 from rlib.unroll import unrolling_iterable
 
 
@@ -8,12 +9,30 @@ class AbstractNode(object):
 def _get_all_child_fields(cls):
     field_names = []
     while cls is not AbstractNode:
-        if hasattr(cls, '_child_nodes_'):
+        # only the fields declared by the class itself, not the inherited ones
+        if '_child_nodes_' in cls.__dict__:
             field_names = field_names + cls._child_nodes_
         cls = cls.__base__
     return field_names
 
 
+def _get_all_data_fields(cls):
+    """ The fields declared in _immutable_fields_, which are not child nodes """
+    child_fields = [f[:-3] if f.endswith('[*]') else f
+                    for f in _get_all_child_fields(cls)]
+    field_names = []
+    while cls is not object:
+        for field in cls.__dict__.get('_immutable_fields_', []):
+            if field.endswith('[*]'):
+                field = field[:-3]
+            if field.endswith('?'):
+                field = field[:-1]
+            if field not in child_fields and field not in field_names:
+                field_names.append(field)
+        cls = cls.__base__
+    return field_names
+
+
 def _generate_replace_method(cls):
     child_fields = unrolling_iterable(_get_all_child_fields(cls))
 
@@ -45,6 +64,60 @@ def _generate_replace_method(cls):
     cls._replace_child_with = _replace_child_with
 
 
+def _generate_get_children_method(cls):
+    child_fields = unrolling_iterable(_get_all_child_fields(cls))
+
+    def get_children(parent_node):
+        children = []
+        for child_slot in child_fields:
+            if child_slot.endswith('[*]'):
+                nodes = getattr(parent_node, child_slot[:-3])
+                if nodes:
+                    for n in nodes:
+                        children.append(n)
+            else:
+                current = getattr(parent_node, child_slot)
+                if current is not None:
+                    children.append(current)
+        return children
+
+    cls.get_children = get_children
+
+
+def _generate_copy_method(cls):
+    child_fields = unrolling_iterable(_get_all_child_fields(cls))
+    data_fields  = unrolling_iterable(_get_all_data_fields(cls))
+
+    def _copy_node(node):
+        """ Copy the node and deep copy its children. Fields that are not
+            declared in _immutable_fields_ are not copied """
+        new_node = instantiate(cls)
+        for field in data_fields:
+            setattr(new_node, field, getattr(node, field))
+        for child_slot in child_fields:
+            if child_slot.endswith('[*]'):
+                slot_name = child_slot[:-3]
+                nodes = getattr(node, slot_name)
+                if nodes is not None:
+                    nodes = new_node.adopt_children(
+                        [n.deep_copy() for n in nodes])
+                setattr(new_node, slot_name, nodes)
+            else:
+                current = getattr(node, child_slot)
+                if current is not None:
+                    current = new_node.adopt_child(current.deep_copy())
+                setattr(new_node, child_slot, current)
+        new_node._parent = None
+
+        if not we_are_translated():
+            missing = set(node.__dict__) - set(new_node.__dict__)
+            assert not missing, "%s: fields %s are not copied" % (
+                cls.__name__, ", ".join(sorted(missing)))
+        return new_node
+
+    cls._copy_node = _copy_node
+
+
 class NodeInitializeMetaClass(type):
     def __init__(cls, name, bases, dic):
         type.__init__(cls, name, bases, dic)
@@ -52,3 +125,5 @@ class NodeInitializeMetaClass(type):
 
     def _initialize_node_class(cls):
         _generate_replace_method(cls)
+        _generate_get_children_method(cls)
+        _generate_copy_method(cls)
@@ -48,6 +48,11 @@ class Node(BaseNode):
             child._parent = self
         return children
 
+    def deep_copy(self):
+        """ Return a copy of the node and its children, which is not adopted
+            by any parent yet """
+        return self._copy_node()
+
     def replace(self, node):
         if node:
             self._parent._replace_child_with(self, node)
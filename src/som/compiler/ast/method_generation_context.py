@@ -5,13 +5,18 @@ from rtruffle.source_section import SourceSection
 from .variable import Argument, Local
 from ..method_generation_context import MethodGenerationContextBase
 
+from ...interpreter.ast.nodes.block_node import BlockNode, \
+    BlockNodeWithContext
 from ...interpreter.ast.nodes.field_node import create_write_node, \
                                                       create_read_node
 from ...interpreter.ast.nodes.global_read_node import \
     UninitializedGlobalReadNode
+from ...interpreter.ast.nodes.literal_node import LiteralNode
+from ...interpreter.ast.nodes.sequence_node import SequenceNode
 from ...interpreter.ast.nodes.return_non_local_node import CatchNonLocalReturnNode
 from ...interpreter.ast.invokable import Invokable
 
+from ...vm.globals import nilObject
 from ...vmobjects.primitive import empty_primitive
 from ...vmobjects.method_ast import AstMethod
 
@@ -24,7 +29,9 @@ class MethodGenerationContext(MethodGenerationContextBase):
         self._arguments   = OrderedDict()
         self._locals      = OrderedDict()
 
+        # the generation contexts of the embedded blocks, for inlining
         self._embedded_block_methods = []
+        self._embedded_block_gencs   = []
 
         # does non-local return, directly or indirectly via a nested block
         self._throws_non_local_return             = False
@@ -32,8 +39,76 @@ class MethodGenerationContext(MethodGenerationContextBase):
         self._needs_to_catch_non_local_returns    = False
         self._accesses_variables_of_outer_context = False
 
-    def add_embedded_block_method(self, block_method):
+    def add_embedded_block_method(self, block_method, block_genc):
         self._embedded_block_methods.append(block_method)
+        self._embedded_block_gencs.append(block_genc)
+
+    def get_inlinable_block(self, node, num_args):
+        """ Get the generation context of the block, if the node is a literal
+            block of this method or block with the given number of arguments,
+            and none of its variables are captured by nested blocks. Otherwise,
+            the block cannot be inlined and None is returned. """
+        if (not isinstance(node, BlockNode) and
+                not isinstance(node, BlockNodeWithContext)):
+            return None
+
+        block_method = node.get_value()
+        for i in range(len(self._embedded_block_methods)):
+            if self._embedded_block_methods[i] is block_method:
+                block_genc = self._embedded_block_gencs[i]
+                if (block_genc._get_number_of_block_arguments() == num_args and
+                        not block_genc._has_captured_variables()):
+                    return block_genc
+        return None
+
+    def _get_number_of_block_arguments(self):
+        # without the block itself
+        return len(self._arguments) - 1
+
+    def _has_captured_variables(self):
+        for arg in self._arguments.values():
+            if arg.is_accessed_out_of_context():
+                return True
+        for local in self._locals.values():
+            if local.is_accessed_out_of_context():
+                return True
+        return False
+
+    def inline_block(self, block_genc, arg_locals, reset_locals):
+        """ Inline the body of the block into this method or block, and return
+            it. The locals of the block become locals of this context, and the
+            given locals replace its arguments. If the body is executed
+            repeatedly, the locals are reset to nil, as they would be for each
+            activation of the block. """
+        i = self._embedded_block_gencs.index(block_genc)
+        invokable = self._embedded_block_methods[i].get_invokable()
+        del self._embedded_block_methods[i]
+        del self._embedded_block_gencs[i]
+        self._embedded_block_methods.extend(
+            block_genc._embedded_block_methods)
+        self._embedded_block_gencs.extend(block_genc._embedded_block_gencs)
+
+        invokable.adapt_after_inlining(arg_locals, 0)
+        body = invokable.get_expr_or_sequence()
+
+        # the locals are not accessible by name anymore
+        block_locals = block_genc._locals.values()
+        for local in block_locals:
+            self._locals["$inlined" + str(len(self._locals))] = local
+
+        if not reset_locals or not block_locals:
+            return body
+        exprs = [local.get_write_node(0, LiteralNode(nilObject))
+                 for local in block_locals]
+        exprs.append(body)
+        return SequenceNode(exprs, body.get_source_section())
+
+    def add_inlined_local(self):
+        """ Add a local that replaces an argument of an inlined block """
+        name = "$inlined" + str(len(self._locals))
+        local = Local(name, len(self._locals))
+        self._locals[name] = local
+        return local
 
     def make_catch_non_local_return(self):
         self._throws_non_local_return = True
@@ -101,7 +176,9 @@ class MethodGenerationContext(MethodGenerationContextBase):
         method_body = self._add_argument_initialization(method_body)
         method = Invokable(self._get_source_section_for_method(method_body),
                            method_body, arg_mapping, len(local_tmps),
-                           len(non_local_tmps), self._universe)
+                           len(non_local_tmps),
+                           self.needs_to_catch_non_local_return(),
+                           self._universe)
         return AstMethod(self._signature, method,
                       # copy list to make it immutable for RPython
                       self._embedded_block_methods[:],
@@ -7,11 +7,21 @@ from ..parser import ParserBase
 from ...interpreter.ast.nodes.block_node import BlockNode, BlockNodeWithContext
 from ...interpreter.ast.nodes.global_read_node import UninitializedGlobalReadNode
 from ...interpreter.ast.nodes.literal_node import LiteralNode
+from ...interpreter.ast.nodes.message.eager_node import create_eager_node
 from ...interpreter.ast.nodes.message.uninitialized_node import UninitializedMessageNode
 from ...interpreter.ast.nodes.return_non_local_node import ReturnNonLocalNode
 from ...interpreter.ast.nodes.sequence_node import SequenceNode
+from ...interpreter.ast.nodes.specialized.and_or_node import InlinedAndOrNode
+from ...interpreter.ast.nodes.specialized.if_nil_node import InlinedIfNilNode
+from ...interpreter.ast.nodes.specialized.if_true_false import \
+    InlinedIfNode, InlinedIfTrueIfFalseNode
+from ...interpreter.ast.nodes.specialized.times_repeat_node import \
+    InlinedTimesRepeatNode
+from ...interpreter.ast.nodes.specialized.to_do_node import InlinedToDoNode
+from ...interpreter.ast.nodes.specialized.while_node import InlinedWhileNode
 
 from ..symbol import Symbol
+from ...vm.globals import trueObject, falseObject
 from ...vmobjects.string import String
 
 
@@ -146,7 +156,7 @@ class Parser(ParserBase):
 
             block_body   = self._nested_block(bgenc)
             block_method = bgenc.assemble(block_body)
-            mgenc.add_embedded_block_method(block_method)
+            mgenc.add_embedded_block_method(block_method, bgenc)
 
             if bgenc.requires_context():
                 result = BlockNodeWithContext(block_method, self._universe)
@@ -174,7 +184,7 @@ class Parser(ParserBase):
     def _unary_message(self, receiver):
         coord = self._lexer.get_source_coordinate()
         selector = self._unary_selector()
-        msg = UninitializedMessageNode(selector, self._universe, receiver, [])
+        msg = self._create_message_node(selector, receiver, [])
         return self._assign_source(msg, coord)
 
     def _binary_message(self, mgenc, receiver):
@@ -182,8 +192,7 @@ class Parser(ParserBase):
         selector = self._binary_selector()
         operand  = self._binary_operand(mgenc)
 
-        msg = UninitializedMessageNode(selector, self._universe, receiver,
-                                       [operand])
+        msg = self._create_message_node(selector, receiver, [operand])
         return self._assign_source(msg, coord)
 
     def _binary_operand(self, mgenc):
@@ -202,11 +211,101 @@ class Parser(ParserBase):
             keyword.append(self._keyword())
             arguments.append(self._formula(mgenc))
 
-        selector = self._universe.symbol_for("".join(keyword))
-        msg = UninitializedMessageNode(selector, self._universe, receiver,
-                                       arguments[:])
+        selector_str = "".join(keyword)
+        inlined = self._inline_control_structure(mgenc, selector_str,
+                                                 receiver, arguments)
+        if inlined is not None:
+            return self._assign_source(inlined, coord)
+
+        selector = self._universe.symbol_for(selector_str)
+        msg = self._create_message_node(selector, receiver, arguments[:])
         return self._assign_source(msg, coord)
 
+    def _create_message_node(self, selector, receiver, arguments):
+        # sends of well-known selectors evaluate their primitive directly, as
+        # long as the receiver is of the expected class
+        msg = create_eager_node(selector, self._universe, receiver, arguments)
+        if msg is None:
+            msg = UninitializedMessageNode(selector, self._universe, receiver,
+                                           arguments)
+        return msg
+
+    def _inline_control_structure(self, mgenc, selector, receiver, arguments):
+        # control structures with literal blocks are replaced by nodes that
+        # directly execute the blocks' bodies, which are inlined into the
+        # current method or block
+        if receiver.is_super_node():
+            return None
+
+        if selector == "ifTrue:" or selector == "ifFalse:":
+            block = mgenc.get_inlinable_block(arguments[0], 0)
+            if block is None:
+                return None
+            body = mgenc.inline_block(block, [], False)
+            if selector == "ifTrue:":
+                return InlinedIfNode(receiver, body, trueObject)
+            else:
+                return InlinedIfNode(receiver, body, falseObject)
+
+        if selector == "ifTrue:ifFalse:" or selector == "ifFalse:ifTrue:":
+            block1 = mgenc.get_inlinable_block(arguments[0], 0)
+            block2 = mgenc.get_inlinable_block(arguments[1], 0)
+            if block1 is None or block2 is None:
+                return None
+            body1 = mgenc.inline_block(block1, [], False)
+            body2 = mgenc.inline_block(block2, [], False)
+            if selector == "ifTrue:ifFalse:":
+                return InlinedIfTrueIfFalseNode(receiver, body1, body2)
+            else:
+                return InlinedIfTrueIfFalseNode(receiver, body2, body1)
+
+        if selector == "ifNil:":
+            block = mgenc.get_inlinable_block(arguments[0], 0)
+            if block is None:
+                return None
+            return InlinedIfNilNode(receiver,
+                                    mgenc.inline_block(block, [], False))
+
+        if selector == "and:" or selector == "or:":
+            block = mgenc.get_inlinable_block(arguments[0], 0)
+            if block is None:
+                return None
+            body = mgenc.inline_block(block, [], False)
+            if selector == "and:":
+                return InlinedAndOrNode(receiver, body, falseObject)
+            else:
+                return InlinedAndOrNode(receiver, body, trueObject)
+
+        if selector == "whileTrue:" or selector == "whileFalse:":
+            condition_block = mgenc.get_inlinable_block(receiver, 0)
+            body_block      = mgenc.get_inlinable_block(arguments[0], 0)
+            if condition_block is None or body_block is None:
+                return None
+            condition = mgenc.inline_block(condition_block, [], True)
+            body      = mgenc.inline_block(body_block, [], True)
+            if selector == "whileTrue:":
+                return InlinedWhileNode(condition, body, trueObject)
+            else:
+                return InlinedWhileNode(condition, body, falseObject)
+
+        if selector == "to:do:":
+            block = mgenc.get_inlinable_block(arguments[1], 1)
+            if block is None:
+                return None
+            index = mgenc.add_inlined_local()
+            body  = mgenc.inline_block(block, [index], True)
+            return InlinedToDoNode(receiver, arguments[0], body, index,
+                                   self._universe)
+
+        if selector == "timesRepeat:":
+            block = mgenc.get_inlinable_block(arguments[0], 0)
+            if block is None:
+                return None
+            return InlinedTimesRepeatNode(
+                receiver, mgenc.inline_block(block, [], True), self._universe)
+
+        return None
+
     def _formula(self, mgenc):
         operand = self._binary_operand(mgenc)
 
@@ -11,7 +11,9 @@ class _Variable(object):
     def __init__(self, name):
         self._name      = name
         self._is_accessed = False
-        self._is_accessed_out_of_context = False
+        # accesses from blocks, which are dropped again when a block
+        # is inlined into the scope of the variable
+        self._out_of_context_accesses = 0
         self._access_idx = -1
 
     def set_access_index(self, value):
@@ -22,12 +24,26 @@ class _Variable(object):
         return self._is_accessed
 
     def is_accessed_out_of_context(self):
-        return self._is_accessed_out_of_context
+        return self._out_of_context_accesses > 0
 
     def _mark_accessed(self, context_level):
         self._is_accessed = True
         if context_level > 0:
-            self._is_accessed_out_of_context = True
+            self._out_of_context_accesses += 1
+
+    def _unmark_accessed(self, context_level):
+        if context_level > 0:
+            self._out_of_context_accesses -= 1
+
+    def get_inlined_read_node(self, context_level):
+        """ The read node for an access from a block that was inlined, and is
+            one context level closer to the variable now """
+        self._unmark_accessed(context_level)
+        return self.get_read_node(context_level - 1)
+
+    def get_inlined_write_node(self, context_level, value_expr):
+        self._unmark_accessed(context_level)
+        return self.get_write_node(context_level - 1, value_expr)
 
 
 class Argument(_Variable):
@@ -96,17 +112,12 @@ class Local(_Variable):
     def __init__(self, name, idx):
         _Variable.__init__(self, name)
         self._is_written = False
-        self._is_written_out_of_context = False
         assert idx >= 0
         self._declaration_idx = idx
 
     def is_accessed(self):
         return _Variable.is_accessed(self) or self._is_written
 
-    def is_accessed_out_of_context(self):
-        return (_Variable.is_accessed_out_of_context(self) or
-                self._is_written_out_of_context)
-
     def get_read_node(self, context_level):
         self._mark_accessed(context_level)
         return UninitializedReadNode(self, context_level, None)
@@ -125,7 +136,7 @@ class Local(_Variable):
     def get_write_node(self, context_level, value_expr):
         self._is_written = True
         if context_level > 0:
-            self._is_written_out_of_context = True
+            self._out_of_context_accesses += 1
         return UninitializedWriteNode(self, context_level, value_expr, None)
 
     def get_initialized_write_node(self, context_level, value_expr,
@@ -4,13 +4,15 @@ from som.interpreter.bc.bytecodes import Bytecodes as BC
 class BytecodeGenerator(object):
 
     def emitPOP(self, mgenc):
-        self._emit1(mgenc, BC.pop)
+        if not mgenc.optimize_dup_pop_pop_sequence():
+            self._emit1(mgenc, BC.pop)
 
     def emitPUSHARGUMENT(self, mgenc, idx, ctx):
         self._emit3(mgenc, BC.push_argument, idx, ctx)
 
     def emitRETURNLOCAL(self, mgenc):
-        self._emit1(mgenc, BC.return_local)
+        if not mgenc.optimize_return_local():
+            self._emit1(mgenc, BC.return_local)
 
     def emitRETURNNONLOCAL(self, mgenc):
         self._emit1(mgenc, BC.return_non_local)
@@ -19,16 +21,20 @@ class BytecodeGenerator(object):
         self._emit1(mgenc, BC.dup)
 
     def emitPUSHBLOCK(self, mgenc, block_method):
-        self._emit2(mgenc, BC.push_block, mgenc.find_literal_index(block_method))
+        self._emit_literal(mgenc, BC.push_block,
+                           mgenc.find_literal_index(block_method))
 
     def emitPUSHLOCAL(self, mgenc, idx, ctx):
         self._emit3(mgenc, BC.push_local, idx, ctx)
 
     def emitPUSHFIELD(self, mgenc, field_name):
-        self._emit2(mgenc, BC.push_field, mgenc.get_field_index(field_name))
+        self._emit_field_access(mgenc, BC.push_field,
+                                mgenc.get_field_index(field_name))
 
     def emitPUSHGLOBAL(self, mgenc, glob):
-        self._emit2(mgenc, BC.push_global, mgenc.find_literal_index(glob))
+        self._emit_literal(mgenc, BC.push_global,
+                           mgenc.find_literal_index(glob))
+        self._emit_site(mgenc)
 
     def emitPOPARGUMENT(self, mgenc, idx, ctx):
         self._emit3(mgenc, BC.pop_argument, idx, ctx)
@@ -37,30 +43,53 @@ class BytecodeGenerator(object):
         self._emit3(mgenc, BC.pop_local, idx, ctx)
 
     def emitPOPFIELD(self, mgenc, field_name):
-        self._emit2(mgenc, BC.pop_field, mgenc.get_field_index(field_name))
+        self._emit_field_access(mgenc, BC.pop_field,
+                                mgenc.get_field_index(field_name))
 
     def emitSUPERSEND(self, mgenc, msg):
-        self._emit2(mgenc, BC.super_send, mgenc.find_literal_index(msg))
+        self._emit_literal(mgenc, BC.super_send, mgenc.find_literal_index(msg))
+        self._emit_site(mgenc)
 
     def emitSEND(self, mgenc, msg):
-        self._emit2(mgenc, BC.send, mgenc.find_literal_index(msg))
+        self._emit_literal(mgenc, BC.send, mgenc.find_literal_index(msg))
+        self._emit_site(mgenc)
 
     def emitQUICKSEND(self, mgenc, msg):
-        m = msg.get_embedded_string()
-        if m == "+":
-            self._emit1(mgenc, BC.add)
-        elif m == "*":
-            self._emit1(mgenc, BC.multiply)
-        elif m == "-":
-            self._emit1(mgenc, BC.subtract)
-        else:
-            raise RuntimeError("Unsupported msg: " + str(msg))
+        self._emit1(mgenc, _quick_sends[msg.get_embedded_string()])
+        self._emit_site(mgenc)
 
     def emitPUSHCONSTANT(self, mgenc, lit):
-        self._emit2(mgenc, BC.push_constant, mgenc.find_literal_index(lit))
+        self._emit_literal(mgenc, BC.push_constant,
+                           mgenc.find_literal_index(lit))
 
     def emitPUSHCONSTANT_index(self, mgenc, lit_index):
-        self._emit2(mgenc, BC.push_constant, lit_index)
+        self._emit_literal(mgenc, BC.push_constant, lit_index)
+
+    def emitJUMP(self, mgenc):
+        return self._emit_jump(mgenc, BC.jump)
+
+    def emitJUMPONTRUETOPNIL(self, mgenc):
+        return self._emit_jump(mgenc, BC.jump_on_true_top_nil)
+
+    def emitJUMPONFALSETOPNIL(self, mgenc):
+        return self._emit_jump(mgenc, BC.jump_on_false_top_nil)
+
+    def emitJUMPONTRUEPOP(self, mgenc):
+        return self._emit_jump(mgenc, BC.jump_on_true_pop)
+
+    def emitJUMPONFALSEPOP(self, mgenc):
+        return self._emit_jump(mgenc, BC.jump_on_false_pop)
+
+    def emitJUMPBACKWARD(self, mgenc, target_index):
+        offset = mgenc.get_number_of_bytecodes() - target_index
+        self._emit3(mgenc, BC.jump_backward, offset & 0xFF, offset >> 8)
+
+    def _emit_jump(self, mgenc, code):
+        # the offset is not yet known, it is patched via
+        # mgenc.patch_jump_offset_to_point_to_next_instruction()
+        jump_index = mgenc.get_number_of_bytecodes()
+        self._emit3(mgenc, code, 0, 0)
+        return jump_index
 
     def _emit1(self, mgenc, code):
         mgenc.add_bytecode(code)
@@ -73,3 +102,38 @@ class BytecodeGenerator(object):
         mgenc.add_bytecode(code)
         mgenc.add_bytecode(idx)
         mgenc.add_bytecode(ctx)
+
+    def _emit_literal(self, mgenc, code, lit_index):
+        self._emit3(mgenc, code, lit_index & 0xFF, lit_index >> 8)
+
+    def _emit_field_access(self, mgenc, code, field_index):
+        self._emit2(mgenc, code, field_index)
+        self._emit_site(mgenc)
+
+    def _emit_site(self, mgenc):
+        # the number of the send site, field access site or global site is
+        # assigned when the method is assembled
+        mgenc.add_bytecode(0)
+        mgenc.add_bytecode(0)
+
+
+_quick_sends = {
+    "+":       BC.add,
+    "*":       BC.multiply,
+    "-":       BC.subtract,
+    "<":       BC.less_than,
+    ">":       BC.greater_than,
+    "<=":      BC.less_than_equal,
+    "=":       BC.equal,
+    "==":      BC.equal_equal,
+    "//":      BC.double_div,
+    "/":       BC.int_div,
+    "%":       BC.modulo,
+    "at:":     BC.at,
+    "at:put:": BC.at_put,
+    "value":   BC.value,
+}
+
+
+def is_quick_send(msg):
+    return msg.get_embedded_string() in _quick_sends
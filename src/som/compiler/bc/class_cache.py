@@ -0,0 +1,321 @@
+"""
+The class cache stores compiled classes in a compact binary format, so that
+loading a class does not need to run the parser. A cache file is only used
+if the modification time and the hash of the source file match the ones
+recorded in it. By default, cache files are stored next to the source files.
+"""
+import os
+
+from som.compiler.class_generation_context import ClassGenerationContext
+from som.vm.binary_data import (BinaryReader, BinaryWriter, CorruptData,
+                                string_hash, read_file, write_file)
+from som.vm.globals import nilObject, trueObject, falseObject
+from som.vmobjects.biginteger import BigInteger
+from som.vmobjects.block_bc import BcBlock
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
+from som.vmobjects.method_bc import BcMethod
+from som.vmobjects.primitive import empty_primitive
+from som.vmobjects.string import String
+from som.vmobjects.symbol import Symbol
+
+from rlib.arithmetic import bigint_from_str, bigint_to_str, float_to_str
+from rlib.osext import path_split
+
+
+# needs to be changed whenever the format or the bytecode set changes
+_MAGIC   = "SOMc"
+_VERSION = 11
+
+_CACHE_FILE_EXTENSION = ".somc"
+
+_METHOD    = "m"
+_PRIMITIVE = "p"
+
+_LIT_SYMBOL  = "y"
+_LIT_STRING  = "s"
+_LIT_INTEGER = "i"
+_LIT_BIGINT  = "b"
+_LIT_DOUBLE  = "d"
+_LIT_METHOD  = "m"
+_LIT_BLOCK   = "k"
+_LIT_NIL     = "n"
+_LIT_TRUE    = "t"
+_LIT_FALSE   = "f"
+
+
+class ClassCacheError(Exception):
+    """ Raised for classes the cache cannot store """
+
+    def __init__(self, message):
+        self.message = message
+
+
+class ClassCache(object):
+    """ Stores compiled classes in a cache directory. Without one, which
+        is the default, nothing is cached, so that the class path is never
+        written to. """
+
+    def __init__(self, universe):
+        self._universe  = universe
+        self._enabled   = True
+        self._cache_dir = None
+
+    def disable(self):
+        self._enabled = False
+
+    def set_cache_dir(self, directory):
+        self._cache_dir = directory
+
+    def is_enabled(self):
+        return self._enabled and self._cache_dir is not None
+
+    def _cache_file_for(self, source_file):
+        assert self._cache_dir is not None
+        _, class_name, _ = path_split(source_file)
+        return (self._cache_dir + os.sep + class_name + "-" +
+                ("%x" % string_hash(source_file)) + _CACHE_FILE_EXTENSION)
+
+    def load(self, source_file):
+        """ Return the ClassGenerationContext for the cached class, or None
+            if there is no valid cache file for the source file. """
+        if not self.is_enabled():
+            return None
+        try:
+            mtime, source_hash = _source_key(source_file)
+            data = read_file(self._cache_file_for(source_file))
+        except OSError:
+            return None
+
+        try:
+            return _Reader(data, self._universe).read_class(mtime, source_hash)
+        except CorruptData:
+            return None
+
+    def store(self, source_file, cgenc):
+        if not self.is_enabled():
+            return
+        try:
+            mtime, source_hash = _source_key(source_file)
+            writer = _Writer()
+            writer.write_class(mtime, source_hash, cgenc)
+            write_file(self._cache_file_for(source_file), writer.get_data())
+        except OSError:
+            pass  # the cache is an optimization only
+        except ClassCacheError:
+            pass  # the class is compiled from source again next time
+
+
+def _source_key(source_file):
+    mtime = int(os.stat(source_file).st_mtime)
+    return mtime, string_hash(read_file(source_file))
+
+
+class _Writer(BinaryWriter):
+
+    def _write_symbol(self, symbol):
+        self.write_str(symbol.get_embedded_string())
+
+    def _write_symbols(self, symbols):
+        self.write_uint(len(symbols))
+        for symbol in symbols:
+            self._write_symbol(symbol)
+
+    def write_class(self, mtime, source_hash, cgenc):
+        self.write_raw(_MAGIC)
+        self.write_uint(_VERSION)
+        self.write_uint(mtime)
+        self.write_uint(source_hash)
+
+        self._write_symbol(cgenc.get_name())
+        self._write_symbol(cgenc.get_super_name())
+        self._write_symbols(cgenc.get_instance_fields())
+        self._write_symbols(cgenc.get_class_fields())
+        self._write_methods(cgenc.get_instance_methods())
+        self._write_methods(cgenc.get_class_methods())
+
+    def _write_methods(self, methods):
+        self.write_uint(len(methods))
+        for method in methods:
+            if method.is_primitive():
+                self.write_char(_PRIMITIVE)
+                self._write_symbol(method.get_signature())
+            else:
+                self.write_char(_METHOD)
+                self._write_method(method)
+
+    def _write_method(self, method):
+        assert isinstance(method, BcMethod)
+        self._write_symbol(method.get_signature())
+        self.write_uint(method.get_number_of_locals())
+        self.write_uint(method.get_maximum_number_of_stack_elements())
+        self.write_uint(1 if method.creates_blocks() else 0)
+        self.write_uint(method.get_number_of_context_values())
+        captured_args = method.get_captured_arguments()
+        self.write_uint(len(captured_args))
+        for arg_idx in captured_args:
+            self.write_uint(arg_idx)
+        self.write_uint(method.get_number_of_send_sites())
+        self.write_uint(method.get_number_of_field_sites())
+        self.write_uint(method.get_number_of_global_sites())
+
+        num_bytecodes = method.get_number_of_bytecodes()
+        self.write_uint(num_bytecodes)
+        for i in range(num_bytecodes):
+            self.write_char(chr(method.get_bytecode(i)))
+
+        num_literals = method.get_number_of_literals()
+        self.write_uint(num_literals)
+        for i in range(num_literals):
+            self._write_literal(method.get_literal(i))
+
+    def _write_literal(self, literal):
+        if isinstance(literal, Symbol):
+            self.write_char(_LIT_SYMBOL)
+            self._write_symbol(literal)
+        elif isinstance(literal, String):
+            self.write_char(_LIT_STRING)
+            self.write_str(literal.get_embedded_string())
+        elif isinstance(literal, Integer):
+            self.write_char(_LIT_INTEGER)
+            self.write_int(literal.get_embedded_integer())
+        elif isinstance(literal, BigInteger):
+            self.write_char(_LIT_BIGINT)
+            self.write_str(bigint_to_str(literal.get_embedded_biginteger()))
+        elif isinstance(literal, Double):
+            self.write_char(_LIT_DOUBLE)
+            self.write_str(float_to_str(literal.get_embedded_double()))
+        elif isinstance(literal, BcMethod):
+            self.write_char(_LIT_METHOD)
+            self._write_method(literal)
+        elif isinstance(literal, BcBlock):
+            # the preallocated block of a clean block
+            assert literal.get_context() is None
+            self.write_char(_LIT_BLOCK)
+            self._write_method(literal.get_method())
+        elif literal is nilObject:
+            self.write_char(_LIT_NIL)
+        elif literal is trueObject:
+            self.write_char(_LIT_TRUE)
+        elif literal is falseObject:
+            self.write_char(_LIT_FALSE)
+        else:
+            raise ClassCacheError("literal cannot be stored in the class cache")
+
+
+class _Reader(BinaryReader):
+
+    def __init__(self, data, universe):
+        BinaryReader.__init__(self, data)
+        self._universe = universe
+
+    def _read_symbol(self):
+        return self._universe.symbol_for(self.read_str())
+
+    def _read_symbols(self):
+        return [self._read_symbol() for _ in range(self.read_uint())]
+
+    def read_class(self, mtime, source_hash):
+        if (self.read_raw(len(_MAGIC)) != _MAGIC or
+                self.read_uint() != _VERSION or
+                self.read_uint() != mtime or
+                self.read_uint() != source_hash):
+            return None
+
+        cgenc = ClassGenerationContext(self._universe)
+        cgenc.set_name(self._read_symbol())
+        super_name = self._read_symbol()
+        cgenc.set_super_name(super_name)
+
+        instance_fields = self._read_symbols()
+        class_fields    = self._read_symbols()
+
+        # the field indexes in the bytecodes depend on the fields of the
+        # super class, which might have changed since the class was cached
+        if super_name.get_embedded_string() != "nil":
+            super_class = self._universe.load_class(super_name)
+            if not super_class:
+                return None
+            if not (_starts_with(instance_fields,
+                                 super_class.get_instance_fields()) and
+                    _starts_with(class_fields,
+                                 super_class.get_class(self._universe).get_instance_fields())):
+                return None
+
+        for field in instance_fields:
+            cgenc.add_instance_field(field)
+        for field in class_fields:
+            cgenc.add_class_field(field)
+
+        for _ in range(self.read_uint()):
+            cgenc.add_instance_method(self._read_invokable())
+        for _ in range(self.read_uint()):
+            cgenc.add_class_method(self._read_invokable())
+
+        return cgenc
+
+    def _read_invokable(self):
+        tag = self.read_char()
+        if tag == _PRIMITIVE:
+            signature = self.read_str()
+            return empty_primitive(signature, self._universe)
+        if tag == _METHOD:
+            return self._read_method()
+        raise CorruptData()
+
+    def _read_method(self):
+        signature  = self._read_symbol()
+        num_locals = self.read_uint()
+        max_stack  = self.read_uint()
+        creates_blocks = self.read_uint() != 0
+        num_context_values = self.read_uint()
+        captured_args = [self.read_uint() for _ in range(self.read_uint())]
+        num_send_sites   = self.read_uint()
+        num_field_sites  = self.read_uint()
+        num_global_sites = self.read_uint()
+
+        bytecodes = self.read_raw(self.read_uint())
+        literals  = [self._read_literal() for _ in range(self.read_uint())]
+
+        method = BcMethod(literals, num_locals, max_stack, len(bytecodes),
+                          signature, num_send_sites, num_field_sites,
+                          num_global_sites)
+        method.set_creates_blocks(creates_blocks)
+        method.set_context_layout(num_context_values, captured_args)
+        for i in range(len(bytecodes)):
+            method.set_bytecode(i, ord(bytecodes[i]))
+        return method
+
+    def _read_literal(self):
+        tag = self.read_char()
+        if tag == _LIT_SYMBOL:
+            return self._read_symbol()
+        if tag == _LIT_STRING:
+            return String(self.read_str())
+        if tag == _LIT_INTEGER:
+            return Integer.box(self.read_int())
+        if tag == _LIT_BIGINT:
+            return BigInteger(bigint_from_str(self.read_str()))
+        if tag == _LIT_DOUBLE:
+            return Double(float(self.read_str()))
+        if tag == _LIT_METHOD:
+            return self._read_method()
+        if tag == _LIT_BLOCK:
+            return BcBlock(self._read_method(), None)
+        if tag == _LIT_NIL:
+            return nilObject
+        if tag == _LIT_TRUE:
+            return trueObject
+        if tag == _LIT_FALSE:
+            return falseObject
+        raise CorruptData()
+
+
+def _starts_with(fields, super_fields):
+    num_super_fields = super_fields.get_number_of_indexable_fields()
+    if len(fields) < num_super_fields:
+        return False
+    for i in range(num_super_fields):
+        if fields[i] is not super_fields.get_indexable_field(i):
+            return False
+    return True
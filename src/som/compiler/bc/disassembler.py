@@ -1,5 +1,6 @@
 from som.vm.universe import error_print, error_println, get_current
-from som.interpreter.bc.bytecodes import bytecode_as_str, bytecode_length, Bytecodes
+from som.interpreter.bc.bytecodes import bytecode_as_str, bytecode_length,\
+    bytecode_is_jump, Bytecodes
 
 
 def dump(clazz):
@@ -57,17 +58,18 @@ def dump_method(m, indent):
             error_println("(index: " + str(m.get_bytecode(b + 1)) +
                                    ") field: " + str(m.get_holder().get_instance_field_name(m.get_bytecode(b + 1))))
         elif bytecode == Bytecodes.push_block:
-            error_print("block: (index: " + str(m.get_bytecode(b + 1)) + ") ")
+            error_print("block: (index: " + str(m.get_two_byte_operand(b + 1)) + ") ")
             dump_method(m.get_constant(b), indent + "\t")
         elif bytecode == Bytecodes.push_constant:
             constant = m.get_constant(b)
-            error_println("(index: " + str(m.get_bytecode(b + 1)) +
+            error_println("(index: " + str(m.get_two_byte_operand(b + 1)) +
                                    ") value: (" +
                                    str(constant.get_class(get_current()).get_name()) +
                                    ") " + str(constant))
         elif bytecode == Bytecodes.push_global:
-            error_println("(index: " + str(m.get_bytecode(b + 1)) +
-                                   ") value: " + str(m.get_constant(b)))
+            error_println("(index: " + str(m.get_two_byte_operand(b + 1)) +
+                                   ") value: " + str(m.get_constant(b)) +
+                                   ", site: " + str(m.get_global_site(b)))
         elif bytecode == Bytecodes.pop_local:
             error_println("local: "     + str(m.get_bytecode(b + 1)) +
                                    ", context: " + str(m.get_bytecode(b + 2)))
@@ -78,11 +80,39 @@ def dump_method(m, indent):
             error_println("(index: "  + str(m.get_bytecode(b + 1)) +
                                    ") field: " + str(m.get_holder().get_instance_field_name(m.get_bytecode(b + 1))))
         elif bytecode == Bytecodes.send:
-            error_println("(index: "      + str(m.get_bytecode(b + 1)) +
-                                   ") signature: " + str(m.get_constant(b)))
+            error_println("(index: "      + str(m.get_two_byte_operand(b + 1)) +
+                                   ") signature: " + str(m.get_constant(b)) +
+                                   ", site: " + str(m.get_send_site(b)))
         elif bytecode == Bytecodes.super_send:
-            error_println("(index: "      + str(m.get_bytecode(b + 1)) +
-                                   ") signature: " + str(m.get_constant(b)))
+            error_println("(index: "      + str(m.get_two_byte_operand(b + 1)) +
+                                   ") signature: " + str(m.get_constant(b)) +
+                                   ", site: " + str(m.get_send_site(b)))
+        elif bytecode == Bytecodes.return_field:
+            error_println("(index: " + str(m.get_bytecode(b + 1)) +
+                                   ") field: " + str(m.get_holder().get_instance_field_name(m.get_bytecode(b + 1))))
+        elif bytecode == Bytecodes.add_to_local:
+            error_println("local: " + str(m.get_bytecode(b + 1)) +
+                                   ", context: " + str(m.get_bytecode(b + 2)) +
+                                   ", value: " + str(m.get_constant(b + 2)))
+        elif bytecode == Bytecodes.push_context or bytecode == Bytecodes.pop_context:
+            error_println("index: " + str(m.get_bytecode(b + 1)) +
+                                   ", context: " + str(m.get_bytecode(b + 2)))
+        elif bytecode == Bytecodes.add_to_context:
+            error_println("index: " + str(m.get_bytecode(b + 1)) +
+                                   ", context: " + str(m.get_bytecode(b + 2)) +
+                                   ", value: " + str(m.get_constant(b + 2)))
+        elif bytecode == Bytecodes.add_to_field:
+            error_println("(index: " + str(m.get_bytecode(b + 1)) +
+                                   ") field: " + str(m.get_holder().get_instance_field_name(m.get_bytecode(b + 1))) +
+                                   ", value: " + str(m.get_constant(b + 3)))
+        elif Bytecodes.add <= bytecode <= Bytecodes.value:
+            error_println("site: " + str(m.get_send_site(b)))
+        elif bytecode == Bytecodes.jump_backward:
+            error_println("(offset: " + str(m.get_jump_offset(b)) +
+                                   ") target: " + str(b - m.get_jump_offset(b)))
+        elif bytecode_is_jump(bytecode):
+            error_println("(offset: " + str(m.get_jump_offset(b)) +
+                                   ") target: " + str(b + m.get_jump_offset(b)))
         else:
             error_println("<incorrect bytecode>")
 
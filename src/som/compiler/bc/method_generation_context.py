@@ -1,8 +1,12 @@
 from som.compiler.method_generation_context import MethodGenerationContextBase
 from som.interpreter.bc.bytecodes import bytecode_length, bytecode_stack_effect,\
-    bytecode_stack_effect_depends_on_send, Bytecodes
+    bytecode_stack_effect_depends_on_send, bytecode_temporary_stack_use, \
+    bytecode_is_jump, bytecode_is_send, bytecode_is_field_access, Bytecodes
+from som.vm.globals import nilObject
+from som.vmobjects.integer import Integer
 from som.vmobjects.primitive import empty_primitive
 from som.vmobjects.method_bc import BcMethod
+from som.vmobjects.block_bc import BcBlock
 
 
 class MethodGenerationContext(MethodGenerationContextBase):
@@ -16,6 +20,16 @@ class MethodGenerationContext(MethodGenerationContextBase):
         self._finished    = False
         self._bytecode    = []
 
+        # instructions before the last jump target can not be combined with
+        # the following ones
+        self._last_jump_target = 0
+
+        # the bytecodes replaced by the last combination of a statement's pop,
+        # so that the pop can be removed again, see remove_last_bytecode()
+        self._combined_pop_start     = 0
+        self._combined_pop_index     = 0
+        self._combined_pop_bytecodes = None
+
     def add_argument(self, arg):
         self._arguments.append(arg)
 
@@ -24,9 +38,12 @@ class MethodGenerationContext(MethodGenerationContextBase):
             return empty_primitive(self._signature.get_embedded_string(), self._universe)
 
         num_locals = len(self._locals)
+        num_send_sites, num_field_sites, num_global_sites = \
+            self._number_sites()
 
         meth = BcMethod(list(self._literals), num_locals, self._compute_stack_depth(),
-                        len(self._bytecode), self._signature)
+                        len(self._bytecode), self._signature,
+                        num_send_sites, num_field_sites, num_global_sites)
 
         # copy bytecodes into method
         i = 0
@@ -34,21 +51,65 @@ class MethodGenerationContext(MethodGenerationContextBase):
             meth.set_bytecode(i, bc)
             i += 1
 
+        # the nested blocks are complete once their method is
+        if not self.is_block_method():
+            _convert_closures(meth)
+
         # return the method - the holder field is to be set later on!
         return meth
 
+    def _number_sites(self):
+        """Assign the numbers of the send sites, field access sites and global
+           sites, which index the caches of the method. Returns the number of
+           each."""
+        num_send_sites   = 0
+        num_field_sites  = 0
+        num_global_sites = 0
+        i = 0
+        while i < len(self._bytecode):
+            bc = self._bytecode[i]
+            if bc == Bytecodes.push_global:
+                self._set_two_byte_operand(i + 3, num_global_sites)
+                num_global_sites += 1
+            if bytecode_is_field_access(bc):
+                self._set_two_byte_operand(i + 2, num_field_sites)
+                num_field_sites += 1
+            if bytecode_is_send(bc):
+                self._set_two_byte_operand(i + bytecode_length(bc) - 2,
+                                           num_send_sites)
+                num_send_sites += 1
+            i += bytecode_length(bc)
+        return num_send_sites, num_field_sites, num_global_sites
+
     def _compute_stack_depth(self):
         depth     = 0
         max_depth = 0
         i         = 0
 
+        # stack depth at the targets of forward jumps, code following an
+        # unconditional jump is only reachable via such a jump
+        depth_at_jump_target = {}
+
         while i < len(self._bytecode):
             bc = self._bytecode[i]
 
+            if i in depth_at_jump_target:
+                depth = depth_at_jump_target[i]
+
             if bytecode_stack_effect_depends_on_send(bc):
-                signature = self._literals[self._bytecode[i + 1]]
+                signature = self._literals[self._get_two_byte_operand(i + 1)]
                 depth += bytecode_stack_effect(bc, signature.get_number_of_signature_arguments())
+            elif (bc == Bytecodes.jump_on_true_top_nil or
+                  bc == Bytecodes.jump_on_false_top_nil):
+                # when jumping, the condition is replaced by nil
+                depth_at_jump_target[i + self._get_jump_offset(i)] = depth
+                depth += bytecode_stack_effect(bc)
+            elif bytecode_is_jump(bc) and bc != Bytecodes.jump_backward:
+                depth += bytecode_stack_effect(bc)
+                depth_at_jump_target[i + self._get_jump_offset(i)] = depth
             else:
+                if depth + bytecode_temporary_stack_use(bc) > max_depth:
+                    max_depth = depth + bytecode_temporary_stack_use(bc)
                 depth += bytecode_stack_effect(bc)
 
             i += bytecode_length(bc)
@@ -75,7 +136,109 @@ class MethodGenerationContext(MethodGenerationContextBase):
         self._locals.append(local)
 
     def remove_last_bytecode(self):
-        self._bytecode = self._bytecode[:-1]
+        """Remove the pop of the last statement. When the pop was combined
+           with the preceding bytecodes, these are restored."""
+        if (self._combined_pop_bytecodes is not None and
+                len(self._bytecode) == self._combined_pop_index):
+            self._bytecode = (self._bytecode[:self._combined_pop_start] +
+                              self._combined_pop_bytecodes)
+            self._combined_pop_bytecodes = None
+        else:
+            self._bytecode = self._bytecode[:-1]
+
+    def _last_instructions(self, n):
+        """Return the indexes of the last n instructions, or None, if there
+           are fewer, or any but the first of them is a jump target."""
+        starts = []
+        i = 0
+        while i < len(self._bytecode):
+            starts.append(i)
+            i += bytecode_length(self._bytecode[i])
+
+        if len(starts) < n:
+            return None
+        starts = starts[len(starts) - n:]
+        if self._last_jump_target > starts[0]:
+            return None
+        return starts
+
+    def optimize_dup_pop_pop_sequence(self):
+        """A statement such as `x := expr.` ends in dup, pop_x, pop, which is
+           reduced to pop_x. Increments such as `i := i + 1.` become a single
+           add_to_local or add_to_field. Returns True, if the pop does not
+           need to be emitted."""
+        starts = self._last_instructions(2)
+        if starts is None or self._bytecode[starts[0]] != Bytecodes.dup:
+            return False
+        dup_idx, pop_idx = starts[0], starts[1]
+        pop_bc = self._bytecode[pop_idx]
+        if (pop_bc != Bytecodes.pop_local and pop_bc != Bytecodes.pop_argument
+                and pop_bc != Bytecodes.pop_field):
+            return False
+
+        increment = self._increment_before_dup()
+        if increment is None:
+            self._combined_pop_start = dup_idx
+            combined = self._bytecode[pop_idx:]
+        else:
+            self._combined_pop_start = self._last_instructions(5)[0]
+            combined = increment
+
+        self._combined_pop_bytecodes = self._bytecode[self._combined_pop_start:]
+        self._bytecode = self._bytecode[:self._combined_pop_start] + combined
+        self._combined_pop_index = len(self._bytecode)
+        return True
+
+    def _increment_before_dup(self):
+        """For push_x, push_constant int, add, dup, pop_x, return the
+           bytecodes of the corresponding superinstruction, or None."""
+        starts = self._last_instructions(5)
+        if starts is None:
+            return None
+        push_idx, const_idx, add_idx, _, pop_idx = starts
+        push_bc = self._bytecode[push_idx]
+        pop_bc  = self._bytecode[pop_idx]
+        literal_idx = self._get_two_byte_operand(const_idx + 1)
+
+        if (self._bytecode[const_idx] != Bytecodes.push_constant or
+                self._bytecode[add_idx] != Bytecodes.add or
+                not isinstance(self._literals[literal_idx], Integer)):
+            return None
+
+        if (push_bc == Bytecodes.push_local and pop_bc == Bytecodes.pop_local and
+                self._bytecode[push_idx + 1] == self._bytecode[pop_idx + 1] and
+                self._bytecode[push_idx + 2] == self._bytecode[pop_idx + 2]):
+            return [Bytecodes.add_to_local, self._bytecode[push_idx + 1],
+                    self._bytecode[push_idx + 2],
+                    literal_idx & 0xFF, literal_idx >> 8, 0, 0]
+        if (push_bc == Bytecodes.push_field and pop_bc == Bytecodes.pop_field and
+                self._bytecode[push_idx + 1] == self._bytecode[pop_idx + 1]):
+            return [Bytecodes.add_to_field, self._bytecode[push_idx + 1], 0, 0,
+                    literal_idx & 0xFF, literal_idx >> 8, 0, 0]
+        return None
+
+    def optimize_return_local(self):
+        """In methods, `^self` and `^field` are combined into return_self and
+           return_field. Returns True, if the return_local does not need to be
+           emitted."""
+        if self.is_block_method():
+            return False
+        starts = self._last_instructions(1)
+        if starts is None:
+            return False
+
+        i = starts[0]
+        bc = self._bytecode[i]
+        if (bc == Bytecodes.push_argument and self._bytecode[i + 1] == 0 and
+                self._bytecode[i + 2] == 0):
+            self._bytecode = self._bytecode[:i] + [Bytecodes.return_self]
+            return True
+        if bc == Bytecodes.push_field:
+            self._bytecode = (self._bytecode[:i] +
+                              [Bytecodes.return_field, self._bytecode[i + 1],
+                               0, 0])
+            return True
+        return False
 
     def add_literal_if_absent(self, lit):
         if lit in self._literals:
@@ -87,7 +250,7 @@ class MethodGenerationContext(MethodGenerationContextBase):
     def add_literal(self, lit):
         i = len(self._literals)
 
-        assert i < 128
+        assert i <= 0xFFFF, "literal index does not fit into two bytes"
         self._literals.append(lit)
 
         return i
@@ -99,7 +262,7 @@ class MethodGenerationContext(MethodGenerationContextBase):
     def find_var(self, var, triplet):
         # triplet: index, context, isArgument
         if var in self._locals:
-            triplet[0] = self._locals.index(var) + len(self._arguments)
+            triplet[0] = self._locals.index(var)
             return True
 
         if var in self._arguments:
@@ -119,6 +282,168 @@ class MethodGenerationContext(MethodGenerationContextBase):
     def has_bytecode(self):
         return len(self._bytecode) > 0
 
+    def get_number_of_bytecodes(self):
+        return len(self._bytecode)
+
+    def _get_two_byte_operand(self, index):
+        return self._bytecode[index] + (self._bytecode[index + 1] << 8)
+
+    def _set_two_byte_operand(self, index, value):
+        assert value <= 0xFFFF
+        self._bytecode[index]     = value & 0xFF
+        self._bytecode[index + 1] = value >> 8
+
+    def _get_jump_offset(self, jump_index):
+        return self._get_two_byte_operand(jump_index + 1)
+
+    def patch_jump_offset_to_point_to_next_instruction(self, jump_index):
+        self._last_jump_target = len(self._bytecode)
+        offset = len(self._bytecode) - jump_index
+        assert offset <= 0xFFFF, "jump offset does not fit into two bytes"
+        self._set_two_byte_operand(jump_index + 1, offset)
+
+    def remove_literal_blocks(self, push_block_indexes):
+        """Remove the push_block bytecodes at the given indexes, which need
+           to be the last bytecodes of this method, together with their
+           literals. Returns the list of block methods, or None if any of them
+           is not a literal block without arguments, or has locals that nested
+           blocks capture, in which case nothing is removed."""
+        num_blocks = len(push_block_indexes)
+        first_literal = len(self._literals) - num_blocks
+        expected_index = push_block_indexes[0]
+        for i in range(num_blocks):
+            bc_idx = push_block_indexes[i]
+            if (bc_idx != expected_index or
+                    self._bytecode[bc_idx] != Bytecodes.push_block or
+                    self._get_two_byte_operand(bc_idx + 1) != first_literal + i):
+                return None
+            expected_index = bc_idx + bytecode_length(Bytecodes.push_block)
+
+        if expected_index != len(self._bytecode):
+            return None
+
+        blocks = self._literals[first_literal:]
+        for block in blocks:
+            # only 'self' of the block, i.e., the block object itself
+            if block.get_number_of_arguments() != 1:
+                return None
+            # inlined, the locals would be shared by all closures created
+            # by the nested blocks, for instance in a loop
+            if _has_captured_variables(block, 0):
+                return None
+
+        self._bytecode = self._bytecode[:push_block_indexes[0]]
+        self._literals = self._literals[:first_literal]
+        return blocks
+
+    def inline_block(self, block_method):
+        """Copy the bytecodes of a literal block into this method. The block's
+           locals become locals of this method, the accesses to outer contexts
+           lose one level, and literals are added to this method."""
+        # the locals of the block are not accessible by name anymore,
+        # they are reset to nil, because the block might be executed
+        # repeatedly, for instance in a loop
+        local_map = []
+        for i in range(block_method.get_number_of_locals()):
+            local_idx = len(self._locals)
+            self.add_local("$inlined" + str(local_idx))
+            local_map.append(local_idx)
+
+            self.add_literal_if_absent(nilObject)
+            self._add_literal_bytecode(Bytecodes.push_constant,
+                                       self.find_literal_index(nilObject))
+            self._add_bytecode3(Bytecodes.pop_local, local_idx, 0)
+
+        # bytecodes before the inlined code are not combined with it
+        self._last_jump_target = len(self._bytecode)
+
+        num_bytecodes = block_method.get_number_of_bytecodes()
+        if block_method.get_bytecode(num_bytecodes - 1) == Bytecodes.return_local:
+            # the block's result simply remains on the stack
+            num_bytecodes -= 1
+
+        i = 0
+        while i < num_bytecodes:
+            bc = block_method.get_bytecode(i)
+
+            if (bc == Bytecodes.push_local or bc == Bytecodes.pop_local or
+                    bc == Bytecodes.push_argument or bc == Bytecodes.pop_argument or
+                    bc == Bytecodes.add_to_local):
+                idx = block_method.get_bytecode(i + 1)
+                ctx = block_method.get_bytecode(i + 2)
+                if ctx == 0:
+                    assert (bc == Bytecodes.push_local or bc == Bytecodes.pop_local
+                            or bc == Bytecodes.add_to_local)
+                    idx = local_map[idx]
+                else:
+                    ctx -= 1
+                self._add_bytecode3(bc, idx, ctx)
+                if bc == Bytecodes.add_to_local:
+                    # followed by the constant and the send site
+                    self._add_two_byte_operand(self._add_inlined_literal(
+                        block_method.get_constant(i + 2)))
+                    self._add_two_byte_operand(0)
+            elif (bc == Bytecodes.push_constant or bc == Bytecodes.push_global or
+                  bc == Bytecodes.send or bc == Bytecodes.super_send):
+                literal = block_method.get_constant(i)
+                self._add_literal_bytecode(bc, self._add_inlined_literal(literal))
+                if bc != Bytecodes.push_constant:
+                    # the send site or global site
+                    self._add_two_byte_operand(0)
+            elif bc == Bytecodes.add_to_field:
+                literal = block_method.get_constant(i + 3)
+                self._add_bytecode2(bc, block_method.get_bytecode(i + 1))
+                self._add_two_byte_operand(0)
+                self._add_two_byte_operand(self._add_inlined_literal(literal))
+                self._add_two_byte_operand(0)
+            elif bc == Bytecodes.push_block:
+                nested_block = block_method.get_constant(i)
+                _adapt_after_outer_inlined(nested_block, 1, local_map)
+                self._add_literal_bytecode(bc, self.add_literal(nested_block))
+            elif bc == Bytecodes.return_non_local:
+                if self.is_block_method():
+                    self.add_bytecode(bc)
+                else:
+                    # inlined into the method, so, it is a local return now
+                    self.add_bytecode(Bytecodes.return_local)
+            else:
+                assert (bc != Bytecodes.return_local and bc != Bytecodes.halt and
+                        bc != Bytecodes.return_self and
+                        bc != Bytecodes.return_field)
+                # the remaining bytecodes do not refer to the context or to
+                # literals, jump offsets are relative, and the sites are
+                # numbered when this method is assembled
+                if bytecode_is_jump(bc) and bc != Bytecodes.jump_backward:
+                    jump_target = (len(self._bytecode) +
+                                   block_method.get_jump_offset(i))
+                    if jump_target > self._last_jump_target:
+                        self._last_jump_target = jump_target
+                for j in range(bytecode_length(bc)):
+                    self.add_bytecode(block_method.get_bytecode(i + j))
+
+            i += bytecode_length(bc)
+
+    def _add_inlined_literal(self, literal):
+        self.add_literal_if_absent(literal)
+        return self.find_literal_index(literal)
+
+    def _add_two_byte_operand(self, operand):
+        self.add_bytecode(operand & 0xFF)
+        self.add_bytecode(operand >> 8)
+
+    def _add_literal_bytecode(self, bc, literal_index):
+        self.add_bytecode(bc)
+        self._add_two_byte_operand(literal_index)
+
+    def _add_bytecode2(self, bc, operand):
+        self.add_bytecode(bc)
+        self.add_bytecode(operand)
+
+    def _add_bytecode3(self, bc, operand1, operand2):
+        self.add_bytecode(bc)
+        self.add_bytecode(operand1)
+        self.add_bytecode(operand2)
+
     def find_literal_index(self, lit):
         return self._literals.index(lit)
 
@@ -126,9 +451,225 @@ class MethodGenerationContext(MethodGenerationContextBase):
         return self._outer_genc
 
 
+def _has_captured_variables(block_method, ctx_level):
+    """Whether blocks nested in the block access its arguments or locals,
+       which are ctx_level contexts away from the given block method."""
+    i = 0
+    while i < block_method.get_number_of_bytecodes():
+        bc = block_method.get_bytecode(i)
+
+        if (ctx_level > 0 and
+                (bc == Bytecodes.push_local or bc == Bytecodes.pop_local or
+                 bc == Bytecodes.push_argument or
+                 bc == Bytecodes.pop_argument or
+                 bc == Bytecodes.add_to_local)):
+            if block_method.get_bytecode(i + 2) == ctx_level:
+                return True
+        elif bc == Bytecodes.push_block:
+            if _has_captured_variables(block_method.get_constant(i),
+                                       ctx_level + 1):
+                return True
+
+        i += bytecode_length(bc)
+    return False
+
+
+def _adapt_after_outer_inlined(block_method, inlined_ctx_level, local_map):
+    """A block that was nested in an inlined block now has one context less
+       to walk to reach its outer contexts, and the variables of the inlined
+       block moved into its outer context."""
+    i = 0
+    while i < block_method.get_number_of_bytecodes():
+        bc = block_method.get_bytecode(i)
+
+        if (bc == Bytecodes.push_local or bc == Bytecodes.pop_local or
+                bc == Bytecodes.push_argument or bc == Bytecodes.pop_argument or
+                bc == Bytecodes.add_to_local):
+            ctx = block_method.get_bytecode(i + 2)
+            if ctx == inlined_ctx_level:
+                assert (bc == Bytecodes.push_local or bc == Bytecodes.pop_local
+                        or bc == Bytecodes.add_to_local)
+                idx = block_method.get_bytecode(i + 1)
+                block_method.set_bytecode(i + 1, local_map[idx])
+            elif ctx > inlined_ctx_level:
+                block_method.set_bytecode(i + 2, ctx - 1)
+        elif bc == Bytecodes.push_block:
+            _adapt_after_outer_inlined(block_method.get_constant(i),
+                                       inlined_ctx_level + 1, local_map)
+
+        i += bytecode_length(bc)
+
+
+class _Activation(object):
+    """The method or block of an activation, with the variables of it that
+       nested blocks access. A block is clean when neither it nor its nested
+       blocks access the receiver or variables of outer activations."""
+
+    def __init__(self, method, outer, push_block_index):
+        self.method             = method
+        self.outer              = outer
+        self.push_block_index   = push_block_index
+        self.captured_arguments = []
+        self.captured_locals    = []
+        self.is_clean           = outer is not None
+        if outer is None:
+            self.depth = 0
+        else:
+            self.depth = outer.depth + 1
+
+    def mark_as_not_clean(self, num_levels):
+        """This activation, and the given number of levels of outer
+           activations minus one, access something outside of them"""
+        activation = self
+        for _ in range(num_levels):
+            activation.is_clean = False
+            activation = activation.outer
+
+    def at_level(self, level):
+        activation = self
+        for _ in range(level):
+            activation = activation.outer
+        return activation
+
+    def capture(self, is_argument, index):
+        if is_argument:
+            if index not in self.captured_arguments:
+                self.captured_arguments.append(index)
+        elif index not in self.captured_locals:
+            self.captured_locals.append(index)
+
+    def context_index(self, is_argument, index):
+        """The index of a captured variable in the context, or -1"""
+        if is_argument:
+            if index in self.captured_arguments:
+                return self.captured_arguments.index(index)
+        elif index in self.captured_locals:
+            return (len(self.captured_arguments) +
+                    self.captured_locals.index(index))
+        return -1
+
+
+def _convert_closures(method):
+    """Move the variables that blocks access in their outer methods or blocks
+       into the contexts of those, and access them there, from the blocks as
+       well as from their own method or block. Blocks then only keep these
+       contexts alive, instead of the whole frames. Clean blocks do not need
+       a context at all, and are allocated only once, as literals."""
+    activations = []
+    _collect_activations(method, None, -1, activations)
+
+    for activation in activations:
+        _for_each_variable_access(activation, _capture_outer_variable)
+        _mark_receiver_accesses(activation)
+    for activation in activations:
+        _for_each_variable_access(activation, _access_captured_variable)
+
+    for activation in activations:
+        if activation.is_clean:
+            _push_clean_block(activation)
+    for activation in activations:
+        activation.method.set_context_layout(
+            len(activation.captured_arguments) +
+            len(activation.captured_locals),
+            activation.captured_arguments)
+        activation.method.set_creates_blocks(
+            _contains_push_block(activation.method))
+
+
+def _collect_activations(method, outer, push_block_index, activations):
+    activation = _Activation(method, outer, push_block_index)
+    activations.append(activation)
+
+    i = 0
+    while i < method.get_number_of_bytecodes():
+        bc = method.get_bytecode(i)
+        if bc == Bytecodes.push_block:
+            _collect_activations(method.get_constant(i), activation, i,
+                                 activations)
+        i += bytecode_length(bc)
+
+
+def _mark_receiver_accesses(activation):
+    # field accesses and non-local returns need the receiver or the home
+    # context, and unknown globals are sent to the receiver
+    method = activation.method
+    i = 0
+    while i < method.get_number_of_bytecodes():
+        bc = method.get_bytecode(i)
+        if (bc == Bytecodes.push_field or bc == Bytecodes.pop_field or
+                bc == Bytecodes.add_to_field or bc == Bytecodes.push_global or
+                bc == Bytecodes.return_non_local):
+            activation.mark_as_not_clean(activation.depth)
+        i += bytecode_length(bc)
+
+
+def _push_clean_block(activation):
+    """The block does not need a context, so the same block is pushed as a
+       constant every time"""
+    outer_method = activation.outer.method
+    bc_idx = activation.push_block_index
+    outer_method.set_bytecode(bc_idx, Bytecodes.push_constant)
+    outer_method.set_literal(outer_method.get_two_byte_operand(bc_idx + 1),
+                             BcBlock(activation.method, None))
+
+
+def _contains_push_block(method):
+    i = 0
+    while i < method.get_number_of_bytecodes():
+        bc = method.get_bytecode(i)
+        if bc == Bytecodes.push_block:
+            return True
+        i += bytecode_length(bc)
+    return False
+
+
+def _for_each_variable_access(activation, fn):
+    method = activation.method
+    i = 0
+    while i < method.get_number_of_bytecodes():
+        bc = method.get_bytecode(i)
+        if (bc == Bytecodes.push_local or bc == Bytecodes.pop_local or
+                bc == Bytecodes.add_to_local):
+            fn(activation, i, False)
+        elif bc == Bytecodes.push_argument or bc == Bytecodes.pop_argument:
+            fn(activation, i, True)
+        i += bytecode_length(bc)
+
+
+def _capture_outer_variable(activation, bc_idx, is_argument):
+    method = activation.method
+    ctx = method.get_bytecode(bc_idx + 2)
+    if ctx > 0:
+        activation.at_level(ctx).capture(is_argument,
+                                         method.get_bytecode(bc_idx + 1))
+        activation.mark_as_not_clean(ctx)
+
+
+def _access_captured_variable(activation, bc_idx, is_argument):
+    method = activation.method
+    ctx = method.get_bytecode(bc_idx + 2)
+    context_idx = activation.at_level(ctx).context_index(
+        is_argument, method.get_bytecode(bc_idx + 1))
+    if context_idx == -1:
+        assert ctx == 0
+        return
+
+    bc = method.get_bytecode(bc_idx)
+    if bc == Bytecodes.push_local or bc == Bytecodes.push_argument:
+        method.set_bytecode(bc_idx, Bytecodes.push_context)
+    elif bc == Bytecodes.pop_local or bc == Bytecodes.pop_argument:
+        method.set_bytecode(bc_idx, Bytecodes.pop_context)
+    else:
+        assert bc == Bytecodes.add_to_local
+        method.set_bytecode(bc_idx, Bytecodes.add_to_context)
+    # the level stays the same, it is the number of contexts to walk
+    method.set_bytecode(bc_idx + 1, context_idx)
+
+
 def create_bootstrap_method(universe):
     """ Create a fake bootstrap method to simplify later frame traversal """
     bootstrap_method = BcMethod([], 0, 2, 1, universe.symbol_for("bootstrap"))
+    bootstrap_method.set_creates_blocks(False)
 
     bootstrap_method.set_bytecode(0, Bytecodes.halt)
     bootstrap_method.set_holder(universe.systemClass)
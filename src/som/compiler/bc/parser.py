@@ -1,7 +1,9 @@
-from .bytecode_generator import BytecodeGenerator
+from .bytecode_generator import BytecodeGenerator, is_quick_send
 from .method_generation_context import MethodGenerationContext
 from ..parser import ParserBase
 from ..symbol import Symbol
+from ...interpreter.bc.bytecodes import bytecode_length, Bytecodes
+from ...vm.globals import nilObject, trueObject, falseObject
 from ...vmobjects.integer import Integer
 from ...vmobjects.string import String
 
@@ -106,13 +108,14 @@ class Parser(ParserBase):
         return v
 
     def _evaluation(self, mgenc):
+        receiver_is_block = self._sym == Symbol.NewBlock
         is_super_send = self._primary(mgenc)
 
         if (self._sym_is_identifier()            or
             self._sym == Symbol.Keyword          or
             self._sym == Symbol.OperatorSequence or
             self._sym_in(self._binary_op_syms)):
-            self._messages(mgenc, is_super_send)
+            self._messages(mgenc, is_super_send, receiver_is_block)
         return None
 
     def _primary(self, mgenc):
@@ -144,7 +147,7 @@ class Parser(ParserBase):
 
         return is_super_send
 
-    def _messages(self, mgenc, is_super_send):
+    def _messages(self, mgenc, is_super_send, receiver_is_block):
         if self._sym_is_identifier():
             while self._sym_is_identifier():
                 # only the first message in a sequence can be a super send
@@ -170,7 +173,7 @@ class Parser(ParserBase):
                 self._keyword_message(mgenc, False)
 
         else:
-            self._keyword_message(mgenc, is_super_send)
+            self._keyword_message(mgenc, is_super_send, receiver_is_block)
 
     def _unary_message(self, mgenc, is_super_send):
         msg = self._unary_selector()
@@ -178,14 +181,11 @@ class Parser(ParserBase):
 
         if is_super_send:
             self._bc_gen.emitSUPERSEND(mgenc, msg)
+        elif is_quick_send(msg):
+            self._bc_gen.emitQUICKSEND(mgenc, msg)
         else:
             self._bc_gen.emitSEND(mgenc, msg)
 
-    @staticmethod
-    def _is_quick_send(msg):
-        m = msg.get_embedded_string()
-        return m == "+" or m == "-" or m == "*"
-
     def _binary_message(self, mgenc, is_super_send):
         msg = self._binary_selector()
         mgenc.add_literal_if_absent(msg)
@@ -194,7 +194,7 @@ class Parser(ParserBase):
 
         if is_super_send:
             self._bc_gen.emitSUPERSEND(mgenc, msg)
-        elif self._is_quick_send(msg):
+        elif is_quick_send(msg):
             self._bc_gen.emitQUICKSEND(mgenc, msg)
         else:
             self._bc_gen.emitSEND(mgenc, msg)
@@ -208,23 +208,112 @@ class Parser(ParserBase):
 
         return is_super_send
 
-    def _keyword_message(self, mgenc, is_super_send):
+    def _keyword_message(self, mgenc, is_super_send, receiver_is_block=False):
+        # remember where the arguments start, to be able to inline them
+        arg_indexes = [mgenc.get_number_of_bytecodes()]
         kw = self._keyword()
         self._formula(mgenc)
 
         while self._sym == Symbol.Keyword:
+            arg_indexes.append(mgenc.get_number_of_bytecodes())
             kw += self._keyword()
             self._formula(mgenc)
 
+        if not is_super_send and self._inline_control_structure(
+                mgenc, kw, receiver_is_block, arg_indexes):
+            return
+
         msg = self._universe.symbol_for(kw)
 
         mgenc.add_literal_if_absent(msg)
 
         if is_super_send:
             self._bc_gen.emitSUPERSEND(mgenc, msg)
+        elif is_quick_send(msg):
+            self._bc_gen.emitQUICKSEND(mgenc, msg)
         else:
             self._bc_gen.emitSEND(mgenc, msg)
 
+    def _inline_control_structure(self, mgenc, selector, receiver_is_block,
+                                  arg_indexes):
+        # control structures with literal blocks are compiled to jumps,
+        # and the blocks' code is inlined into the current method
+        if selector == "ifTrue:" or selector == "ifFalse:":
+            blocks = mgenc.remove_literal_blocks(arg_indexes)
+            if blocks is None:
+                return False
+
+            if selector == "ifTrue:":
+                jump = self._bc_gen.emitJUMPONFALSETOPNIL(mgenc)
+            else:
+                jump = self._bc_gen.emitJUMPONTRUETOPNIL(mgenc)
+            mgenc.inline_block(blocks[0])
+            mgenc.patch_jump_offset_to_point_to_next_instruction(jump)
+            return True
+
+        if selector == "ifTrue:ifFalse:" or selector == "ifFalse:ifTrue:":
+            blocks = mgenc.remove_literal_blocks(arg_indexes)
+            if blocks is None:
+                return False
+
+            if selector == "ifTrue:ifFalse:":
+                jump = self._bc_gen.emitJUMPONFALSEPOP(mgenc)
+            else:
+                jump = self._bc_gen.emitJUMPONTRUEPOP(mgenc)
+            mgenc.inline_block(blocks[0])
+            jump_to_end = self._bc_gen.emitJUMP(mgenc)
+            mgenc.patch_jump_offset_to_point_to_next_instruction(jump)
+            mgenc.inline_block(blocks[1])
+            mgenc.patch_jump_offset_to_point_to_next_instruction(jump_to_end)
+            return True
+
+        if selector == "and:" or selector == "or:":
+            blocks = mgenc.remove_literal_blocks(arg_indexes)
+            if blocks is None:
+                return False
+
+            if selector == "and:":
+                jump = self._bc_gen.emitJUMPONFALSEPOP(mgenc)
+                short_circuit_result = falseObject
+            else:
+                jump = self._bc_gen.emitJUMPONTRUEPOP(mgenc)
+                short_circuit_result = trueObject
+            mgenc.inline_block(blocks[0])
+            jump_to_end = self._bc_gen.emitJUMP(mgenc)
+            mgenc.patch_jump_offset_to_point_to_next_instruction(jump)
+            mgenc.add_literal_if_absent(short_circuit_result)
+            self._bc_gen.emitPUSHCONSTANT(mgenc, short_circuit_result)
+            mgenc.patch_jump_offset_to_point_to_next_instruction(jump_to_end)
+            return True
+
+        if ((selector == "whileTrue:" or selector == "whileFalse:") and
+                receiver_is_block):
+            # the receiver block is pushed right before the argument
+            receiver_index = (arg_indexes[0] -
+                              bytecode_length(Bytecodes.push_block))
+            blocks = mgenc.remove_literal_blocks([receiver_index,
+                                                  arg_indexes[0]])
+            if blocks is None:
+                return False
+
+            loop_begin = mgenc.get_number_of_bytecodes()
+            mgenc.inline_block(blocks[0])
+            if selector == "whileTrue:":
+                jump_to_end = self._bc_gen.emitJUMPONFALSEPOP(mgenc)
+            else:
+                jump_to_end = self._bc_gen.emitJUMPONTRUEPOP(mgenc)
+            mgenc.inline_block(blocks[1])
+            self._bc_gen.emitPOP(mgenc)
+            self._bc_gen.emitJUMPBACKWARD(mgenc, loop_begin)
+            mgenc.patch_jump_offset_to_point_to_next_instruction(jump_to_end)
+
+            # loops evaluate to nil
+            mgenc.add_literal_if_absent(nilObject)
+            self._bc_gen.emitPUSHCONSTANT(mgenc, nilObject)
+            return True
+
+        return False
+
     def _formula(self, mgenc):
         is_super_send = self._binary_operand(mgenc)
 
@@ -304,7 +393,7 @@ class Parser(ParserBase):
         i = 1
 
         while self._sym != Symbol.EndTerm:
-            push_idx = Integer(i)
+            push_idx = Integer.box(i)
             mgenc.add_literal_if_absent(push_idx)
             self._bc_gen.emitPUSHCONSTANT(mgenc, push_idx)
 
@@ -313,7 +402,7 @@ class Parser(ParserBase):
             i += 1
 
         mgenc.update_literal(
-            array_size_placeholder, array_size_literal_idx, Integer(i - 1))
+            array_size_placeholder, array_size_literal_idx, Integer.box(i - 1))
         self._expect(Symbol.EndTerm)
 
     def _nested_block(self, mgenc):
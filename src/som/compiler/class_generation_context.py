@@ -17,9 +17,24 @@ class ClassGenerationContext(object):
     def set_name(self, symbol):
         self._name = symbol
 
+    def get_super_name(self):
+        return self._super_name
+
     def set_super_name(self, symbol):
         self._super_name = symbol
 
+    def get_instance_fields(self):
+        return self._instance_fields
+
+    def get_instance_methods(self):
+        return self._instance_methods
+
+    def get_class_fields(self):
+        return self._class_fields
+
+    def get_class_methods(self):
+        return self._class_methods
+
     def set_instance_fields_of_super(self, field_names):
         for i in range(0, field_names.get_number_of_indexable_fields()):
             self._instance_fields.append(field_names.get_indexable_field(i))
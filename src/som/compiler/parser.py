@@ -229,7 +229,7 @@ class ParserBase(object):
             i = string_to_int(self._text)
             if negate_value:
                 i = 0 - i
-            result = Integer(i)
+            result = Integer.box(i)
         except ParseStringOverflowError:
             from som.vmobjects.biginteger import BigInteger
             bigint = bigint_from_str(self._text)
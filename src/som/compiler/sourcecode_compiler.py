@@ -28,15 +28,24 @@ class _SourcecodeCompiler(object):
     def compile(self, path, filename, system_class, universe):
         fname = path + os.sep + filename + ".som"
 
-        try:
-            input_file = open_file_as_stream(fname, "r")
+        class_cache = universe.get_class_cache()
+        cgc = class_cache.load(fname) if class_cache else None
+        if cgc:
+            result = self._assemble(cgc, system_class)
+        else:
             try:
-                self._parser = Parser(input_file, fname, universe)
-                result = self._compile(system_class, universe)
-            finally:
-                input_file.close()
-        except OSError:
-            raise IOError()
+                input_file = open_file_as_stream(fname, "r")
+                try:
+                    self._parser = Parser(input_file, fname, universe)
+                    cgc = self._parse(universe)
+                finally:
+                    input_file.close()
+            except OSError:
+                raise IOError()
+
+            if class_cache:
+                class_cache.store(fname, cgc)
+            result = self._assemble(cgc, system_class)
 
         cname = result.get_name()
         cnameC = cname.get_embedded_string()
@@ -56,14 +65,17 @@ class _SourcecodeCompiler(object):
         return result
 
     def _compile(self, system_class, universe):
-        cgc = ClassGenerationContext(universe)
+        return self._assemble(self._parse(universe), system_class)
 
-        result = system_class
+    def _parse(self, universe):
+        cgc = ClassGenerationContext(universe)
         self._parser.classdef(cgc)
+        return cgc
 
+    @staticmethod
+    def _assemble(cgc, system_class):
         if not system_class:
-            result = cgc.assemble()
-        else:
-            cgc.assemble_system_class(result)
+            return cgc.assemble()
 
-        return result
+        cgc.assemble_system_class(system_class)
+        return system_class
@@ -18,19 +18,30 @@ _EMPTY_LIST = []
 
 
 class Frame(object):
+    """ The first three arguments are kept in fields, so that the common
+        low-arity invocations do not need to allocate an argument list. Only
+        the arguments beyond the third one are kept in `_more_args`. Only
+        frames of methods with non-local returns in their blocks have a
+        marker to tell whether they are still on the stack. """
 
-    _immutable_fields_ = ['_receiver', '_arguments[*]', '_args_for_inner[*]',
+    _immutable_fields_ = ['_receiver', '_more_args[*]', '_args_for_inner[*]',
                           '_temps', '_temps_for_inner', '_on_stack']
     _virtualizable_    = ['_temps[*]']
 
-    def __init__(self, receiver, arguments, arg_mapping, num_local_temps,
-                 num_context_temps):
-        make_sure_not_resized(arguments)
+    def __init__(self, receiver, arg0, arg1, arg2, more_args, arg_mapping,
+                 num_local_temps, num_context_temps, needs_on_stack_marker):
+        make_sure_not_resized(more_args)
         make_sure_not_resized(arg_mapping)
         self = jit.hint(self, access_directly=True, fresh_virtualizable=True)
         self._receiver        = receiver
-        self._arguments       = arguments
-        self._on_stack        = _FrameOnStackMarker()
+        self._arg0            = arg0
+        self._arg1            = arg1
+        self._arg2            = arg2
+        self._more_args       = more_args
+        if needs_on_stack_marker:
+            self._on_stack    = _FrameOnStackMarker()
+        else:
+            self._on_stack    = None
         if num_local_temps == 0:
             self._temps       = _EMPTY_LIST
         else:
@@ -46,17 +57,32 @@ class Frame(object):
     def _collect_shared_args(self, arg_mapping):
         if len(arg_mapping) == 0:
             return _EMPTY_LIST
-        return [self._arguments[i] for i in arg_mapping]
+        return [self.get_argument(i) for i in arg_mapping]
 
     def get_context_values(self):
         return self._receiver, self._args_for_inner, self._temps_for_inner, self._on_stack
 
     def get_argument(self, index):
         jit.promote(index)
-        return self._arguments[index]
+        if index == 0:
+            return self._arg0
+        elif index == 1:
+            return self._arg1
+        elif index == 2:
+            return self._arg2
+        else:
+            return self._more_args[index - 3]
 
     def set_argument(self, index, value):
-        self._arguments[index] = value
+        jit.promote(index)
+        if index == 0:
+            self._arg0 = value
+        elif index == 1:
+            self._arg1 = value
+        elif index == 2:
+            self._arg2 = value
+        else:
+            self._more_args[index - 3] = value
 
     def get_temp(self, index):
         jit.promote(index)
@@ -93,5 +119,6 @@ class Frame(object):
         return self._on_stack
 
     def __str__(self):
-        return "Frame(%s, %s, %s)" % (self._receiver, self._arguments,
-                                      self._temps)
+        return "Frame(%s, %s, %s, %s, %s, %s)" % (
+            self._receiver, self._arg0, self._arg1, self._arg2,
+            self._more_args, self._temps)
@@ -2,7 +2,7 @@ from rlib import jit
 from rlib.debug import make_sure_not_resized
 from rtruffle.node import Node
 
-from .frame import Frame
+from .frame import Frame, _EMPTY_LIST
 
 
 def get_printable_location(invokable):
@@ -13,7 +13,7 @@ jitdriver = jit.JitDriver(
     greens=['self'],
     virtualizables=['frame'],
     get_printable_location=get_printable_location,
-    reds= ['arguments', 'receiver', 'frame'],
+    reds= ['frame'],
     is_recursive=True,
 
     # the next line is a workaround around a likely bug in RPython
@@ -30,12 +30,14 @@ jitdriver = jit.JitDriver(
 class Invokable(Node):
 
     _immutable_fields_ = ['_expr_or_sequence?', '_universe', '_arg_mapping[*]',
-                          '_num_local_temps', '_num_context_temps']
+                          '_num_local_temps', '_num_context_temps',
+                          '_catches_non_local_return',
+                          '_has_polymorphic_dispatch?', '_split_source']
     _child_nodes_      = ['_expr_or_sequence']
 
     def __init__(self, source_section, expr_or_sequence,
                  arg_mapping, number_of_local_temps, number_of_context_temps,
-                 universe):
+                 catches_non_local_return, universe):
         Node.__init__(self, source_section)
         self._expr_or_sequence  = self.adopt_child(expr_or_sequence)
         self._universe          = universe
@@ -43,13 +45,78 @@ class Invokable(Node):
         self._arg_mapping = arg_mapping
         self._num_local_temps   = number_of_local_temps
         self._num_context_temps = number_of_context_temps
+        self._catches_non_local_return = catches_non_local_return
+        self._has_polymorphic_dispatch = False
+        self._split_source = None
+
+    def catches_non_local_return(self):
+        return self._catches_non_local_return
+
+    def has_polymorphic_dispatch(self):
+        return self._has_polymorphic_dispatch
+
+    def mark_polymorphic_dispatch(self):
+        if not self._has_polymorphic_dispatch:
+            self._has_polymorphic_dispatch = True
+
+    def get_split_source(self):
+        return self._split_source
+
+    def create_split_copy(self):
+        """ Copy the tree for a call site, without the specializations of
+            its dispatch chains """
+        invokable = self.deep_copy()
+        invokable._has_polymorphic_dispatch = False
+        if self._split_source is None:
+            invokable._split_source = self
+        else:
+            invokable._split_source = self._split_source
+        return invokable
+
+    def get_expr_or_sequence(self):
+        return self._expr_or_sequence
+
+    def adapt_after_inlining(self, arg_locals, depth):
+        self._expr_or_sequence.adapt_after_inlining(arg_locals, depth)
 
     def invoke(self, receiver, arguments):
         assert arguments is not None
         make_sure_not_resized(arguments)
 
-        frame = Frame(receiver, arguments, self._arg_mapping,
-                      self._num_local_temps, self._num_context_temps)
-        jitdriver.jit_merge_point(self=self, receiver=receiver, arguments=arguments, frame=frame)
+        num_args = len(arguments)
+        if num_args == 0:
+            return self.invoke0(receiver)
+        elif num_args == 1:
+            return self.invoke1(receiver, arguments[0])
+        elif num_args == 2:
+            return self.invoke2(receiver, arguments[0], arguments[1])
+        elif num_args == 3:
+            return self.invoke3(receiver, arguments[0], arguments[1],
+                                arguments[2])
+        return self._execute(self._create_frame(
+            receiver, arguments[0], arguments[1], arguments[2], arguments[3:]))
+
+    def invoke0(self, receiver):
+        return self._execute(self._create_frame(
+            receiver, None, None, None, _EMPTY_LIST))
+
+    def invoke1(self, receiver, arg1):
+        return self._execute(self._create_frame(
+            receiver, arg1, None, None, _EMPTY_LIST))
+
+    def invoke2(self, receiver, arg1, arg2):
+        return self._execute(self._create_frame(
+            receiver, arg1, arg2, None, _EMPTY_LIST))
+
+    def invoke3(self, receiver, arg1, arg2, arg3):
+        return self._execute(self._create_frame(
+            receiver, arg1, arg2, arg3, _EMPTY_LIST))
+
+    def _create_frame(self, receiver, arg1, arg2, arg3, more_args):
+        return Frame(receiver, arg1, arg2, arg3, more_args, self._arg_mapping,
+                     self._num_local_temps, self._num_context_temps,
+                     self._catches_non_local_return)
 
+    def _execute(self, frame):
+        jitdriver.jit_merge_point(self=self, frame=frame)
         return self._expr_or_sequence.execute(frame)
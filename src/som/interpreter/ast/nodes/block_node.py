@@ -3,21 +3,33 @@ from .literal_node import LiteralNode
 
 
 class BlockNode(LiteralNode):
+    """ A block that does not access its outer context. It does not capture
+        anything, so the same block object is returned on every execution """
 
-    _immutable_fields_ = ['_universe']
+    _immutable_fields_ = ['_universe', '_block']
 
     def __init__(self, value, universe, source_section = None):
         LiteralNode.__init__(self, value, source_section)
         self._universe = universe
+        self._block    = AstBlock(value, (None, None, None, None))
 
     def execute(self, frame):
-        return AstBlock(self._value, (None, None, None, None))
+        return self._block
+
+    def adapt_after_inlining(self, arg_locals, depth):
+        self._value.get_invokable().adapt_after_inlining(arg_locals, depth + 1)
 
 
-class BlockNodeWithContext(BlockNode):
+class BlockNodeWithContext(LiteralNode):
+
+    _immutable_fields_ = ['_universe']
 
     def __init__(self, value, universe, source_section = None):
-        BlockNode.__init__(self, value, universe, source_section)
+        LiteralNode.__init__(self, value, source_section)
+        self._universe = universe
 
     def execute(self, frame):
         return AstBlock(self._value, frame.get_context_values())
+
+    def adapt_after_inlining(self, arg_locals, depth):
+        self._value.get_invokable().adapt_after_inlining(arg_locals, depth + 1)
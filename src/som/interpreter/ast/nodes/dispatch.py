@@ -2,11 +2,61 @@ from rlib import jit
 
 from rtruffle.node import Node
 
+from ..invokable import Invokable
+from ....vmobjects.method_ast import AstMethod
+
+
+class SplittingBudget(object):
+    """ The number of nodes that may still be created by splitting methods,
+        i.e., by copying them for call sites. A budget of 0 disables
+        splitting. """
+
+    def __init__(self, budget):
+        self._remaining = budget
+
+    def set_budget(self, budget):
+        self._remaining = budget
+
+    def get_remaining(self):
+        return self._remaining
+
+    def consume(self, num_nodes):
+        if num_nodes > self._remaining:
+            return False
+        self._remaining -= num_nodes
+        return True
+
+
+split_budget = SplittingBudget(10000)
+
+
+def _get_enclosing_invokable(node):
+    while node is not None and not isinstance(node, Invokable):
+        node = node.get_parent()
+    return node
+
+
+def _count_nodes(node, limit):
+    """ Count the nodes of the tree, but stop counting beyond the limit """
+    count = 1
+    for child in node.get_children():
+        if count > limit:
+            break
+        count += _count_nodes(child, limit - count)
+    return count
+
 
 class _AbstractDispatchNode(Node):
+    """ Besides execute_dispatch with an argument list, dispatch nodes have
+        execute_dispatch0/1/2/3 for sends with up to three arguments, which
+        do not need to allocate a list """
 
     INLINE_CACHE_SIZE = 6
 
+    # maximal number of nodes of a method that is split when a send in it
+    # becomes polymorphic, so that its callers get their own copy
+    MAX_SPLIT_METHOD_SIZE = 60
+
     _immutable_fields_ = ['_universe']
 
     def __init__(self, universe):
@@ -38,6 +88,13 @@ class UninitializedDispatchNode(_AbstractDispatchWithLookupNode):
 
         send_node = i_node.get_parent()
 
+        if chain_depth > 0:
+            # the send becomes polymorphic, which makes its method a candidate
+            # for splitting
+            invokable = _get_enclosing_invokable(send_node)
+            if invokable is not None:
+                invokable.mark_polymorphic_dispatch()
+
         if chain_depth < _AbstractDispatchNode.INLINE_CACHE_SIZE:
             rcvr_class = rcvr.get_class(self._universe)
             method = rcvr_class.lookup_invokable(self._selector)
@@ -67,6 +124,19 @@ class UninitializedDispatchNode(_AbstractDispatchWithLookupNode):
     def execute_dispatch(self, rcvr, args):
         return self._specialize(rcvr).execute_dispatch(rcvr, args)
 
+    def execute_dispatch0(self, rcvr):
+        return self._specialize(rcvr).execute_dispatch0(rcvr)
+
+    def execute_dispatch1(self, rcvr, arg1):
+        return self._specialize(rcvr).execute_dispatch1(rcvr, arg1)
+
+    def execute_dispatch2(self, rcvr, arg1, arg2):
+        return self._specialize(rcvr).execute_dispatch2(rcvr, arg1, arg2)
+
+    def execute_dispatch3(self, rcvr, arg1, arg2, arg3):
+        return self._specialize(rcvr).execute_dispatch3(rcvr, arg1, arg2,
+                                                        arg3)
+
 
 class GenericDispatchNode(_AbstractDispatchWithLookupNode):
 
@@ -81,6 +151,38 @@ class GenericDispatchNode(_AbstractDispatchWithLookupNode):
             # Won't use DNU caching here, because it's a megamorphic node
             return send_does_not_understand(rcvr, self._selector, args, self._universe)
 
+    def execute_dispatch0(self, rcvr):
+        method = self._lookup_method(rcvr)
+        if method is not None:
+            return method.invoke0(rcvr)
+        else:
+            return send_does_not_understand(rcvr, self._selector, [],
+                                            self._universe)
+
+    def execute_dispatch1(self, rcvr, arg1):
+        method = self._lookup_method(rcvr)
+        if method is not None:
+            return method.invoke1(rcvr, arg1)
+        else:
+            return send_does_not_understand(rcvr, self._selector, [arg1],
+                                            self._universe)
+
+    def execute_dispatch2(self, rcvr, arg1, arg2):
+        method = self._lookup_method(rcvr)
+        if method is not None:
+            return method.invoke2(rcvr, arg1, arg2)
+        else:
+            return send_does_not_understand(rcvr, self._selector, [arg1, arg2],
+                                            self._universe)
+
+    def execute_dispatch3(self, rcvr, arg1, arg2, arg3):
+        method = self._lookup_method(rcvr)
+        if method is not None:
+            return method.invoke3(rcvr, arg1, arg2, arg3)
+        else:
+            return send_does_not_understand(
+                rcvr, self._selector, [arg1, arg2, arg3], self._universe)
+
 
 class _AbstractCachedDispatchNode(_AbstractDispatchNode):
 
@@ -95,13 +197,91 @@ class _AbstractCachedDispatchNode(_AbstractDispatchNode):
 
 
 class _CachedDispatchObjectCheckNode(_AbstractCachedDispatchNode):
+    """ Once a send in a small cached method becomes polymorphic, the method
+        is split: the node replaces itself by a node with a private,
+        uninitialized copy of the method, which specializes to the receivers
+        and arguments of this call site only """
+
+    _immutable_fields_ = ['_may_split']
+
+    def __init__(self, rcvr_class, method, next_dispatch, universe,
+                 may_split = True):
+        _AbstractCachedDispatchNode.__init__(self, rcvr_class, method,
+                                             next_dispatch, universe)
+        self._may_split = may_split and self._is_small_method(method)
+
+    @staticmethod
+    def _is_small_method(method):
+        if not isinstance(method, AstMethod):
+            return False
+        limit = _AbstractDispatchNode.MAX_SPLIT_METHOD_SIZE
+        return _count_nodes(method.get_invokable(), limit) <= limit
+
+    def _should_split(self):
+        if not self._may_split:
+            return False
+        method = self._cached_method
+        assert isinstance(method, AstMethod)
+        return method.get_invokable().has_polymorphic_dispatch()
+
+    def _split(self):
+        method = self._cached_method
+        assert isinstance(method, AstMethod)
+        callee = method.get_invokable()
+
+        # recursive calls are not split, each copy would split again
+        caller = _get_enclosing_invokable(self)
+        is_recursive = (caller is None or caller is callee or
+                        caller.get_split_source() is callee)
+        if not is_recursive:
+            size = _count_nodes(callee,
+                                _AbstractDispatchNode.MAX_SPLIT_METHOD_SIZE)
+            if split_budget.consume(size):
+                method = method.create_split_copy()
+
+        return self.replace(_CachedDispatchObjectCheckNode(
+            self._expected_class, method, self._next, self._universe, False))
 
     def execute_dispatch(self, rcvr, args):
         if rcvr.get_class(self._universe) == self._expected_class:
+            if self._should_split():
+                return self._split().execute_dispatch(rcvr, args)
             return self._cached_method.invoke(rcvr, args)
         else:
             return self._next.execute_dispatch(rcvr, args)
 
+    def execute_dispatch0(self, rcvr):
+        if rcvr.get_class(self._universe) == self._expected_class:
+            if self._should_split():
+                return self._split().execute_dispatch0(rcvr)
+            return self._cached_method.invoke0(rcvr)
+        else:
+            return self._next.execute_dispatch0(rcvr)
+
+    def execute_dispatch1(self, rcvr, arg1):
+        if rcvr.get_class(self._universe) == self._expected_class:
+            if self._should_split():
+                return self._split().execute_dispatch1(rcvr, arg1)
+            return self._cached_method.invoke1(rcvr, arg1)
+        else:
+            return self._next.execute_dispatch1(rcvr, arg1)
+
+    def execute_dispatch2(self, rcvr, arg1, arg2):
+        if rcvr.get_class(self._universe) == self._expected_class:
+            if self._should_split():
+                return self._split().execute_dispatch2(rcvr, arg1, arg2)
+            return self._cached_method.invoke2(rcvr, arg1, arg2)
+        else:
+            return self._next.execute_dispatch2(rcvr, arg1, arg2)
+
+    def execute_dispatch3(self, rcvr, arg1, arg2, arg3):
+        if rcvr.get_class(self._universe) == self._expected_class:
+            if self._should_split():
+                return self._split().execute_dispatch3(rcvr, arg1, arg2, arg3)
+            return self._cached_method.invoke3(rcvr, arg1, arg2, arg3)
+        else:
+            return self._next.execute_dispatch3(rcvr, arg1, arg2, arg3)
+
 
 class _CachedDnuObjectCheckNode(_AbstractCachedDispatchNode):
 
@@ -114,14 +294,40 @@ class _CachedDnuObjectCheckNode(_AbstractCachedDispatchNode):
             next_dispatch, universe)
         self._selector = selector
 
+    def _invoke_dnu(self, rcvr, args):
+        return self._cached_method.invoke2(
+            rcvr, self._selector, self._universe.new_array_from_list(args))
+
     def execute_dispatch(self, rcvr, args):
         if rcvr.get_class(self._universe) == self._expected_class:
-            return self._cached_method.invoke(
-                rcvr, [self._selector,
-                       self._universe.new_array_from_list(args)])
+            return self._invoke_dnu(rcvr, args)
         else:
             return self._next.execute_dispatch(rcvr, args)
 
+    def execute_dispatch0(self, rcvr):
+        if rcvr.get_class(self._universe) == self._expected_class:
+            return self._invoke_dnu(rcvr, [])
+        else:
+            return self._next.execute_dispatch0(rcvr)
+
+    def execute_dispatch1(self, rcvr, arg1):
+        if rcvr.get_class(self._universe) == self._expected_class:
+            return self._invoke_dnu(rcvr, [arg1])
+        else:
+            return self._next.execute_dispatch1(rcvr, arg1)
+
+    def execute_dispatch2(self, rcvr, arg1, arg2):
+        if rcvr.get_class(self._universe) == self._expected_class:
+            return self._invoke_dnu(rcvr, [arg1, arg2])
+        else:
+            return self._next.execute_dispatch2(rcvr, arg1, arg2)
+
+    def execute_dispatch3(self, rcvr, arg1, arg2, arg3):
+        if rcvr.get_class(self._universe) == self._expected_class:
+            return self._invoke_dnu(rcvr, [arg1, arg2, arg3])
+        else:
+            return self._next.execute_dispatch3(rcvr, arg1, arg2, arg3)
+
 
 class SuperDispatchNode(_AbstractDispatchNode):
 
@@ -136,6 +342,18 @@ class SuperDispatchNode(_AbstractDispatchNode):
     def execute_dispatch(self, rcvr, args):
         return self._cached_method.invoke(rcvr, args)
 
+    def execute_dispatch0(self, rcvr):
+        return self._cached_method.invoke0(rcvr)
+
+    def execute_dispatch1(self, rcvr, arg1):
+        return self._cached_method.invoke1(rcvr, arg1)
+
+    def execute_dispatch2(self, rcvr, arg1, arg2):
+        return self._cached_method.invoke2(rcvr, arg1, arg2)
+
+    def execute_dispatch3(self, rcvr, arg1, arg2, arg3):
+        return self._cached_method.invoke3(rcvr, arg1, arg2, arg3)
+
 
 # @jit.unroll_safe
 def _prepare_dnu_arguments(arguments, selector, universe):
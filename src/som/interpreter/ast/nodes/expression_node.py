@@ -8,3 +8,17 @@ class ExpressionNode(Node):
 
     def is_super_node(self):
         return False
+
+    def adapt_after_inlining(self, arg_locals, depth):
+        """ Adapt the node to the inlining of a block it is nested in, `depth`
+            blocks deep. Accesses to variables outside of the inlined block
+            are one context level closer, and the arguments of the inlined
+            block are replaced by the given locals. """
+        for child in self.get_children():
+            if isinstance(child, ExpressionNode):
+                child.adapt_after_inlining(arg_locals, depth)
+
+    def _replace_after_inlining(self, node):
+        if self._source_section is not None:
+            node.assign_source_section(self._source_section)
+        return self.replace(node)
@@ -11,3 +11,6 @@ class LiteralNode(ExpressionNode):
 
     def execute(self, frame):
         return self._value
+
+    def get_value(self):
+        return self._value
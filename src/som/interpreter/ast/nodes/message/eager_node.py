@@ -0,0 +1,186 @@
+from .generic_node import GenericMessageNode
+
+from .....vm.globals import trueObject, falseObject
+from .....vmobjects.array_strategy import Array
+from .....vmobjects.biginteger import BigInteger
+from .....vmobjects.block_ast import AstBlock
+from .....vmobjects.double import Double
+from .....vmobjects.integer import Integer
+
+
+def _is_number(obj):
+    return (isinstance(obj, Integer) or isinstance(obj, Double) or
+            isinstance(obj, BigInteger))
+
+
+class _EagerUnaryNode(GenericMessageNode):
+    """ A send of a well-known selector, which evaluates the primitive directly
+        when the receiver is of the expected class. Otherwise, it is a normal
+        send. The primitives are assumed not to be redefined. """
+
+    def execute(self, frame):
+        rcvr = self._rcvr_expr.execute(frame)
+        result = self._eager(rcvr)
+        if result is None:
+            return self.execute_evaluated0(frame, rcvr)
+        return result
+
+    def _eager(self, rcvr):
+        """ Return the result, or None if the receiver is not handled """
+        raise NotImplementedError()
+
+
+class _EagerBinaryNode(GenericMessageNode):
+
+    def execute(self, frame):
+        rcvr = self._rcvr_expr.execute(frame)
+        arg  = self._arg_exprs[0].execute(frame)
+        result = self._eager(rcvr, arg)
+        if result is None:
+            return self.execute_evaluated1(frame, rcvr, arg)
+        return result
+
+    def _eager(self, rcvr, arg):
+        raise NotImplementedError()
+
+
+class _EagerTernaryNode(GenericMessageNode):
+
+    def execute(self, frame):
+        rcvr = self._rcvr_expr.execute(frame)
+        arg1 = self._arg_exprs[0].execute(frame)
+        arg2 = self._arg_exprs[1].execute(frame)
+        result = self._eager(rcvr, arg1, arg2)
+        if result is None:
+            return self.execute_evaluated2(frame, rcvr, arg1, arg2)
+        return result
+
+    def _eager(self, rcvr, arg1, arg2):
+        raise NotImplementedError()
+
+
+def _make_arithmetic_node(name, prim_name, with_double):
+    """ Integer, and optionally Double, receivers evaluate the primitive
+        directly, when the argument is a number as well """
+    class _EagerArithmeticNode(_EagerBinaryNode):
+        def _eager(self, rcvr, arg):
+            if isinstance(rcvr, Integer) and _is_number(arg):
+                return getattr(rcvr, prim_name)(arg)
+            if with_double and isinstance(rcvr, Double) and _is_number(arg):
+                return getattr(rcvr, prim_name)(arg)
+            return None
+    _EagerArithmeticNode.__name__ = name
+    return _EagerArithmeticNode
+
+
+EagerAddNode          = _make_arithmetic_node("EagerAddNode", "prim_add", True)
+EagerSubtractNode     = _make_arithmetic_node("EagerSubtractNode",
+                                              "prim_subtract", True)
+EagerMultiplyNode     = _make_arithmetic_node("EagerMultiplyNode",
+                                              "prim_multiply", True)
+EagerIntDivNode       = _make_arithmetic_node("EagerIntDivNode",
+                                              "prim_int_div", False)
+EagerDoubleDivNode    = _make_arithmetic_node("EagerDoubleDivNode",
+                                              "prim_double_div", True)
+EagerModuloNode       = _make_arithmetic_node("EagerModuloNode",
+                                              "prim_modulo", True)
+EagerLessThanNode     = _make_arithmetic_node("EagerLessThanNode",
+                                              "prim_less_than", True)
+EagerLessThanEqualNode = _make_arithmetic_node("EagerLessThanEqualNode",
+                                               "prim_less_than_or_equal", True)
+EagerGreaterThanNode  = _make_arithmetic_node("EagerGreaterThanNode",
+                                              "prim_greater_than", True)
+EagerEqualNode        = _make_arithmetic_node("EagerEqualNode",
+                                              "prim_equals", True)
+EagerUnequalNode      = _make_arithmetic_node("EagerUnequalNode",
+                                              "prim_unequals", True)
+
+
+class EagerGreaterThanEqualNode(_EagerBinaryNode):
+    """ >= is implemented in Smalltalk as `(self < argument) not` """
+
+    def _eager(self, rcvr, arg):
+        if ((isinstance(rcvr, Integer) or isinstance(rcvr, Double)) and
+                _is_number(arg)):
+            if rcvr.prim_less_than(arg) is trueObject:
+                return falseObject
+            else:
+                return trueObject
+        return None
+
+
+class EagerEqualEqualNode(_EagerBinaryNode):
+
+    def _eager(self, rcvr, arg):
+        if isinstance(rcvr, Integer):
+            if isinstance(arg, Integer) or isinstance(arg, BigInteger):
+                return rcvr.prim_equals(arg)
+            return falseObject
+        return None
+
+
+class EagerAtNode(_EagerBinaryNode):
+
+    def _eager(self, rcvr, arg):
+        if isinstance(rcvr, Array) and isinstance(arg, Integer):
+            return rcvr.get_indexable_field(arg.get_embedded_integer() - 1)
+        return None
+
+
+class EagerAtPutNode(_EagerTernaryNode):
+
+    def _eager(self, rcvr, arg1, arg2):
+        if isinstance(rcvr, Array) and isinstance(arg1, Integer):
+            rcvr.set_indexable_field(arg1.get_embedded_integer() - 1, arg2)
+            return arg2
+        return None
+
+
+class EagerValueNode(_EagerUnaryNode):
+
+    def _eager(self, rcvr):
+        if (isinstance(rcvr, AstBlock) and
+                rcvr.get_method().get_number_of_arguments() == 1):
+            return rcvr.get_method().invoke0(rcvr)
+        return None
+
+
+class EagerValueArgNode(_EagerBinaryNode):
+
+    def _eager(self, rcvr, arg):
+        if (isinstance(rcvr, AstBlock) and
+                rcvr.get_method().get_number_of_arguments() == 2):
+            return rcvr.get_method().invoke1(rcvr, arg)
+        return None
+
+
+_eager_nodes = {
+    "+":  EagerAddNode,
+    "-":  EagerSubtractNode,
+    "*":  EagerMultiplyNode,
+    "/":  EagerIntDivNode,
+    "//": EagerDoubleDivNode,
+    "%":  EagerModuloNode,
+    "<":  EagerLessThanNode,
+    "<=": EagerLessThanEqualNode,
+    ">":  EagerGreaterThanNode,
+    ">=": EagerGreaterThanEqualNode,
+    "=":  EagerEqualNode,
+    "==": EagerEqualEqualNode,
+    "~=": EagerUnequalNode,
+    "at:":     EagerAtNode,
+    "at:put:": EagerAtPutNode,
+    "value":   EagerValueNode,
+    "value:":  EagerValueArgNode,
+}
+
+
+def create_eager_node(selector, universe, rcvr_expr, arg_exprs,
+                      source_section = None):
+    """ Return an eager node for sends of the well-known selectors, or None """
+    if rcvr_expr.is_super_node():
+        return None
+    node_class = _eager_nodes.get(selector.get_embedded_string(), None)
+    if node_class is None:
+        return None
+    return node_class(selector, universe, rcvr_expr, arg_exprs, source_section)
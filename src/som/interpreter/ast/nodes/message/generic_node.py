@@ -21,10 +21,37 @@ class GenericMessageNode(AbstractMessageNode):
             dispatch = UninitializedDispatchNode(selector, universe)
         self._dispatch = self.adopt_child(dispatch)
 
+    def deep_copy(self):
+        """ The copy starts with an uninitialized dispatch chain """
+        node = self._copy_node()
+        if not self._rcvr_expr.is_super_node():
+            node._dispatch = node.adopt_child(
+                UninitializedDispatchNode(self._selector, self._universe))
+        return node
+
     def replace_dispatch_list_head(self, node):
         self._dispatch.replace(node)
 
     def execute(self, frame):
+        num_args = len(self._arg_exprs)
+        if num_args == 0:
+            rcvr = self._rcvr_expr.execute(frame)
+            return self.execute_evaluated0(frame, rcvr)
+        elif num_args == 1:
+            rcvr = self._rcvr_expr.execute(frame)
+            arg1 = self._arg_exprs[0].execute(frame)
+            return self.execute_evaluated1(frame, rcvr, arg1)
+        elif num_args == 2:
+            rcvr = self._rcvr_expr.execute(frame)
+            arg1 = self._arg_exprs[0].execute(frame)
+            arg2 = self._arg_exprs[1].execute(frame)
+            return self.execute_evaluated2(frame, rcvr, arg1, arg2)
+        elif num_args == 3:
+            rcvr = self._rcvr_expr.execute(frame)
+            arg1 = self._arg_exprs[0].execute(frame)
+            arg2 = self._arg_exprs[1].execute(frame)
+            arg3 = self._arg_exprs[2].execute(frame)
+            return self.execute_evaluated3(frame, rcvr, arg1, arg2, arg3)
         rcvr, args = self._evaluate_rcvr_and_args(frame)
         return self.execute_evaluated(frame, rcvr, args)
 
@@ -38,6 +65,42 @@ class GenericMessageNode(AbstractMessageNode):
         else:
             return self._dispatch.execute_dispatch(rcvr, args)
 
+    def execute_evaluated0(self, frame, rcvr):
+        if we_are_jitted():
+            method = self._lookup_method(rcvr)
+            if method:
+                return method.invoke0(rcvr)
+            return self._direct_dispatch(rcvr, [])
+        else:
+            return self._dispatch.execute_dispatch0(rcvr)
+
+    def execute_evaluated1(self, frame, rcvr, arg1):
+        if we_are_jitted():
+            method = self._lookup_method(rcvr)
+            if method:
+                return method.invoke1(rcvr, arg1)
+            return self._direct_dispatch(rcvr, [arg1])
+        else:
+            return self._dispatch.execute_dispatch1(rcvr, arg1)
+
+    def execute_evaluated2(self, frame, rcvr, arg1, arg2):
+        if we_are_jitted():
+            method = self._lookup_method(rcvr)
+            if method:
+                return method.invoke2(rcvr, arg1, arg2)
+            return self._direct_dispatch(rcvr, [arg1, arg2])
+        else:
+            return self._dispatch.execute_dispatch2(rcvr, arg1, arg2)
+
+    def execute_evaluated3(self, frame, rcvr, arg1, arg2, arg3):
+        if we_are_jitted():
+            method = self._lookup_method(rcvr)
+            if method:
+                return method.invoke3(rcvr, arg1, arg2, arg3)
+            return self._direct_dispatch(rcvr, [arg1, arg2, arg3])
+        else:
+            return self._dispatch.execute_dispatch3(rcvr, arg1, arg2, arg3)
+
     def _direct_dispatch(self, rcvr, args):
         method = self._lookup_method(rcvr)
         if method:
@@ -31,6 +31,33 @@ class ReturnNonLocalNode(ContextualNode):
         arguments = [block]
         return lookup_and_send(receiver, "escapedBlock:", arguments, universe)
 
+    def adapt_after_inlining(self, arg_locals, depth):
+        ExpressionNode.adapt_after_inlining(self, arg_locals, depth)
+        assert self._context_level > depth
+        if self._context_level == 1:
+            node = ReturnLocalNode(self._expr)
+        else:
+            node = ReturnNonLocalNode(self._context_level - 1, self._expr,
+                                      self._universe)
+        self._replace_after_inlining(node)
+
+
+class ReturnLocalNode(ExpressionNode):
+    """ A return from a block that was inlined into its method. The method is
+        still executing, but the return needs to unwind the enclosing nodes,
+        like a non-local return. """
+
+    _immutable_fields_ = ['_expr?']
+    _child_nodes_      = ['_expr']
+
+    def __init__(self, expr, source_section = None):
+        ExpressionNode.__init__(self, source_section)
+        self._expr = self.adopt_child(expr)
+
+    def execute(self, frame):
+        result = self._expr.execute(frame)
+        raise ReturnException(result, frame.get_on_stack_marker())
+
 
 class CatchNonLocalReturnNode(ExpressionNode):
 
@@ -43,6 +70,7 @@ class CatchNonLocalReturnNode(ExpressionNode):
 
     def execute(self, frame):
         marker = frame.get_on_stack_marker()
+        assert marker is not None
         try:
             return self._method_body.execute(frame)
         except ReturnException as e:
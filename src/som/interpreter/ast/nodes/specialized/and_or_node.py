@@ -0,0 +1,24 @@
+from ..expression_node import ExpressionNode
+
+
+class InlinedAndOrNode(ExpressionNode):
+    """ and: or or: with a literal block, whose body was inlined. The body is
+        only evaluated if the receiver is not the short-circuit result, i.e.,
+        false for and:, and true for or: """
+
+    _immutable_fields_ = ['_rcvr_expr?', '_arg_expr?', '_short_circuit_result']
+    _child_nodes_      = ['_rcvr_expr',  '_arg_expr']
+
+    def __init__(self, rcvr_expr, arg_expr, short_circuit_result,
+                 source_section = None):
+        ExpressionNode.__init__(self, source_section)
+        self._rcvr_expr = self.adopt_child(rcvr_expr)
+        self._arg_expr  = self.adopt_child(arg_expr)
+        self._short_circuit_result = short_circuit_result
+
+    def execute(self, frame):
+        rcvr = self._rcvr_expr.execute(frame)
+        if rcvr is self._short_circuit_result:
+            return rcvr
+        else:
+            return self._arg_expr.execute(frame)
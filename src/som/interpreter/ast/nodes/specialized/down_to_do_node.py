@@ -29,7 +29,7 @@ class IntDownToIntDoNode(AbstractToDoNode):
         bottom = limit.get_embedded_integer()
         while i >= bottom:
             int_driver.jit_merge_point(block_method = block_method)
-            block_method.invoke(body_block, [Integer(i)])
+            block_method.invoke1(body_block, Integer.box(i))
             i -= 1
 
     @staticmethod
@@ -63,7 +63,7 @@ class IntDownToDoubleDoNode(AbstractToDoNode):
         bottom = limit.get_embedded_double()
         while i >= bottom:
             double_driver.jit_merge_point(block_method = block_method)
-            block_method.invoke(body_block, [Integer(i)])
+            block_method.invoke1(body_block, Integer.box(i))
             i -= 1
 
     @staticmethod
@@ -0,0 +1,21 @@
+from ..expression_node import ExpressionNode
+from .....vm.globals import nilObject
+
+
+class InlinedIfNilNode(ExpressionNode):
+    """ ifNil: with a literal block, whose body was inlined """
+
+    _immutable_fields_ = ['_rcvr_expr?', '_body_expr?']
+    _child_nodes_      = ['_rcvr_expr',  '_body_expr']
+
+    def __init__(self, rcvr_expr, body_expr, source_section = None):
+        ExpressionNode.__init__(self, source_section)
+        self._rcvr_expr = self.adopt_child(rcvr_expr)
+        self._body_expr = self.adopt_child(body_expr)
+
+    def execute(self, frame):
+        rcvr = self._rcvr_expr.execute(frame)
+        if rcvr is nilObject:
+            return self._body_expr.execute(frame)
+        else:
+            return rcvr
@@ -29,7 +29,7 @@ class IfTrueIfFalseNode(ExpressionNode):
 
     def _value_of(self, obj):
         if isinstance(obj, AstBlock):
-            return obj.get_method().invoke(obj, [])
+            return obj.get_method().invoke0(obj)
         else:
             return obj
 
@@ -77,7 +77,7 @@ class IfNode(ExpressionNode):
 
     def _value_of(self, obj):
         if isinstance(obj, AstBlock):
-            return obj.get_method().invoke(obj, [])
+            return obj.get_method().invoke0(obj)
         else:
             return obj
 
@@ -105,3 +105,46 @@ class IfNode(ExpressionNode):
             return node.replace(
                 IfNode(node._rcvr_expr, node._arg_exprs[0],
                        falseObject, node._universe, node._source_section))
+
+
+class InlinedIfTrueIfFalseNode(ExpressionNode):
+    """ ifTrue:ifFalse: with literal blocks, whose bodies were inlined """
+
+    _immutable_fields_ = ['_rcvr_expr?', '_true_expr?', '_false_expr?']
+    _child_nodes_      = ['_rcvr_expr',  '_true_expr',  '_false_expr']
+
+    def __init__(self, rcvr_expr, true_expr, false_expr, source_section = None):
+        ExpressionNode.__init__(self, source_section)
+        self._rcvr_expr  = self.adopt_child(rcvr_expr)
+        self._true_expr  = self.adopt_child(true_expr)
+        self._false_expr = self.adopt_child(false_expr)
+
+    def execute(self, frame):
+        rcvr = self._rcvr_expr.execute(frame)
+        if rcvr is trueObject:
+            return self._true_expr.execute(frame)
+        else:
+            assert rcvr is falseObject
+            return self._false_expr.execute(frame)
+
+
+class InlinedIfNode(ExpressionNode):
+    """ ifTrue: or ifFalse: with a literal block, whose body was inlined """
+
+    _immutable_fields_ = ['_rcvr_expr?', '_body_expr?', '_condition']
+    _child_nodes_      = ['_rcvr_expr',  '_body_expr']
+
+    def __init__(self, rcvr_expr, body_expr, condition_obj,
+                 source_section = None):
+        ExpressionNode.__init__(self, source_section)
+        self._rcvr_expr = self.adopt_child(rcvr_expr)
+        self._body_expr = self.adopt_child(body_expr)
+        self._condition = condition_obj
+
+    def execute(self, frame):
+        rcvr = self._rcvr_expr.execute(frame)
+        if rcvr is self._condition:
+            return self._body_expr.execute(frame)
+        else:
+            assert (rcvr is falseObject or rcvr is trueObject)
+            return nilObject
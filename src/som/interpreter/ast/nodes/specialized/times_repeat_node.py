@@ -0,0 +1,54 @@
+from rlib import jit
+
+from ..dispatch import lookup_and_send
+from ..expression_node import ExpressionNode
+
+from .....vm.globals import trueObject
+from .....vmobjects.integer import Integer
+
+
+def get_printable_location(node):
+    return "inlined #timesRepeat:"
+
+
+driver = jit.JitDriver(
+    greens=['node'],
+    reds='auto',
+    is_recursive=True,
+    get_printable_location=get_printable_location)
+
+
+class InlinedTimesRepeatNode(ExpressionNode):
+    """ timesRepeat: with a literal block, whose body was inlined """
+
+    _immutable_fields_ = ['_rcvr_expr?', '_body_expr?', '_universe']
+    _child_nodes_      = ['_rcvr_expr',  '_body_expr']
+
+    def __init__(self, rcvr_expr, body_expr, universe, source_section = None):
+        ExpressionNode.__init__(self, source_section)
+        self._rcvr_expr = self.adopt_child(rcvr_expr)
+        self._body_expr = self.adopt_child(body_expr)
+        self._universe  = universe
+
+    def execute(self, frame):
+        rcvr = self._rcvr_expr.execute(frame)
+        if isinstance(rcvr, Integer):
+            self._int_loop(frame, rcvr.get_embedded_integer())
+        else:
+            self._generic_loop(frame, rcvr)
+        return rcvr
+
+    def _int_loop(self, frame, count):
+        i = 1
+        while i <= count:
+            driver.jit_merge_point(node = self)
+            self._body_expr.execute(frame)
+            i += 1
+
+    def _generic_loop(self, frame, count):
+        # the same as Integer>>#timesRepeat:, but with sends
+        one = Integer.box(1)
+        i   = one
+        while lookup_and_send(i, "<=", [count], self._universe) is trueObject:
+            self._body_expr.execute(frame)
+            i = lookup_and_send(i, "+", [one], self._universe)
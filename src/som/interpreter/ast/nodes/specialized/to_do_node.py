@@ -1,7 +1,9 @@
 from rlib import jit
 
+from ..dispatch import lookup_and_send
 from ..expression_node import ExpressionNode
 
+from .....vm.globals import trueObject
 from .....vmobjects.block_ast import AstBlock
 from .....vmobjects.double import Double
 from .....vmobjects.integer import Integer
@@ -56,7 +58,7 @@ class IntToIntDoNode(AbstractToDoNode):
         top = limit.get_embedded_integer()
         while i <= top:
             int_driver.jit_merge_point(block_method = block_method)
-            block_method.invoke(body_block, [Integer(i)])
+            block_method.invoke1(body_block, Integer.box(i))
             i += 1
 
     @staticmethod
@@ -90,7 +92,7 @@ class IntToDoubleDoNode(AbstractToDoNode):
         top = limit.get_embedded_double()
         while i <= top:
             double_driver.jit_merge_point(block_method = block_method)
-            block_method.invoke(body_block, [Integer(i)])
+            block_method.invoke1(body_block, Integer.box(i))
             i += 1
 
     @staticmethod
@@ -105,3 +107,86 @@ class IntToDoubleDoNode(AbstractToDoNode):
             IntToDoubleDoNode(node._rcvr_expr, node._arg_exprs[0],
                               node._arg_exprs[1], node._universe,
                               node._source_section))
+
+
+def get_printable_location_inlined(node):
+    return "inlined #to:do:"
+
+
+inlined_int_driver = jit.JitDriver(
+    greens=['node'],
+    reds='auto',
+    is_recursive=True,
+    get_printable_location=get_printable_location_inlined)
+
+
+inlined_double_driver = jit.JitDriver(
+    greens=['node'],
+    reds='auto',
+    is_recursive=True,
+    get_printable_location=get_printable_location_inlined)
+
+
+class InlinedToDoNode(ExpressionNode):
+    """ to:do: with a literal block, whose body was inlined. The block's
+        argument became a local of the enclosing method or block. """
+
+    _immutable_fields_ = ['_rcvr_expr?', '_limit_expr?', '_body_expr?',
+                          '_index_var', '_index_write?', '_universe']
+    _child_nodes_      = ['_rcvr_expr', '_limit_expr', '_body_expr',
+                          '_index_write']
+
+    def __init__(self, rcvr_expr, limit_expr, body_expr, index_var, universe,
+                 source_section = None):
+        ExpressionNode.__init__(self, source_section)
+        self._rcvr_expr   = self.adopt_child(rcvr_expr)
+        self._limit_expr  = self.adopt_child(limit_expr)
+        self._body_expr   = self.adopt_child(body_expr)
+        self._index_var   = index_var
+        self._index_write = None
+        self._universe    = universe
+
+    def _get_index_write(self):
+        # the slot of the index is only known once the method is assembled
+        if self._index_write is None:
+            self._index_write = self.adopt_child(
+                self._index_var.get_initialized_write_node(0, None, None))
+        return self._index_write
+
+    def execute(self, frame):
+        rcvr  = self._rcvr_expr.execute(frame)
+        limit = self._limit_expr.execute(frame)
+        if isinstance(rcvr, Integer) and isinstance(limit, Integer):
+            self._int_loop(frame, rcvr.get_embedded_integer(),
+                           limit.get_embedded_integer())
+        elif isinstance(rcvr, Integer) and isinstance(limit, Double):
+            self._double_loop(frame, rcvr.get_embedded_integer(),
+                              limit.get_embedded_double())
+        else:
+            self._generic_loop(frame, rcvr, limit)
+        return rcvr
+
+    def _int_loop(self, frame, i, top):
+        index_write = self._get_index_write()
+        while i <= top:
+            inlined_int_driver.jit_merge_point(node = self)
+            index_write._do_write(frame, Integer.box(i))
+            self._body_expr.execute(frame)
+            i += 1
+
+    def _double_loop(self, frame, i, top):
+        index_write = self._get_index_write()
+        while i <= top:
+            inlined_double_driver.jit_merge_point(node = self)
+            index_write._do_write(frame, Integer.box(i))
+            self._body_expr.execute(frame)
+            i += 1
+
+    def _generic_loop(self, frame, i, limit):
+        # the same as Integer>>#to:do:, but with sends
+        index_write = self._get_index_write()
+        one = Integer.box(1)
+        while lookup_and_send(i, "<=", [limit], self._universe) is trueObject:
+            index_write._do_write(frame, i)
+            self._body_expr.execute(frame)
+            i = lookup_and_send(i, "+", [one], self._universe)
@@ -87,10 +87,10 @@ class WhileMessageNode(AbstractWhileMessageNode):
             if rcvr_block is body_block:
                 rcvr_block = body_block
 
-            condition_value = condition_method.invoke(rcvr_block, [])
+            condition_value = condition_method.invoke0(rcvr_block)
             if condition_value is not self._predicate_bool:
                 break
-            body_method.invoke(body_block, [])
+            body_method.invoke0(body_block)
 
     @staticmethod
     def can_specialize(selector, rcvr, args, node):
@@ -112,3 +112,37 @@ class WhileMessageNode(AbstractWhileMessageNode):
                 WhileMessageNode(node._rcvr_expr, node._arg_exprs[0],
                                  falseObject, node._universe,
                                  node._source_section))
+
+
+def get_printable_location_inlined_while(node):
+    return "inlined while"
+
+
+inlined_while_driver = jit.JitDriver(
+    greens=['node'], reds='auto',
+    is_recursive=True,
+    get_printable_location = get_printable_location_inlined_while)
+
+
+class InlinedWhileNode(ExpressionNode):
+    """ whileTrue: or whileFalse: with literal blocks as receiver and
+        argument, whose bodies were inlined """
+
+    _immutable_fields_ = ['_condition_expr?', '_body_expr?', '_predicate_bool']
+    _child_nodes_      = ['_condition_expr',  '_body_expr']
+
+    def __init__(self, condition_expr, body_expr, predicate_bool_obj,
+                 source_section = None):
+        ExpressionNode.__init__(self, source_section)
+        self._condition_expr = self.adopt_child(condition_expr)
+        self._body_expr      = self.adopt_child(body_expr)
+        self._predicate_bool = predicate_bool_obj
+
+    def execute(self, frame):
+        while True:
+            inlined_while_driver.jit_merge_point(node = self)
+            condition_value = self._condition_expr.execute(frame)
+            if condition_value is not self._predicate_bool:
+                break
+            self._body_expr.execute(frame)
+        return nilObject
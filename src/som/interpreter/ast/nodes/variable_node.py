@@ -21,16 +21,22 @@ class UninitializedReadNode(ExpressionNode):
         return self.replace(self._var.get_initialized_read_node(
             self._context_level, self._source_section))
 
+    def adapt_after_inlining(self, arg_locals, depth):
+        if self._context_level > depth:
+            self._replace_after_inlining(
+                self._var.get_inlined_read_node(self._context_level))
+
 
 class UninitializedWriteNode(ExpressionNode):
 
-    _immutable_fields_ = ['_var', '_context_level', '_value_expr']
+    _immutable_fields_ = ['_var', '_context_level', '_value_expr?']
+    _child_nodes_      = ['_value_expr']
 
     def __init__(self, var, context_level, value_expr, source_section):
         ExpressionNode.__init__(self, source_section)
         self._var           = var
         self._context_level = context_level
-        self._value_expr    = value_expr
+        self._value_expr    = self.adopt_child(value_expr)
 
     def execute(self, frame):
         return self._specialize().execute(frame)
@@ -39,6 +45,12 @@ class UninitializedWriteNode(ExpressionNode):
         return self.replace(self._var.get_initialized_write_node(
             self._context_level, self._value_expr, self._source_section))
 
+    def adapt_after_inlining(self, arg_locals, depth):
+        ExpressionNode.adapt_after_inlining(self, arg_locals, depth)
+        if self._context_level > depth:
+            self._replace_after_inlining(self._var.get_inlined_write_node(
+                self._context_level, self._value_expr))
+
 
 class _NonLocalVariableNode(ContextualNode):
 
@@ -79,6 +91,15 @@ class NonLocalSelfReadNode(ContextualNode):
     def execute(self, frame):
         return self.determine_outer_self(frame)
 
+    def adapt_after_inlining(self, arg_locals, depth):
+        # self is always outside of the inlined block
+        assert self._context_level > depth
+        if self._context_level == 1:
+            node = LocalSelfReadNode(None)
+        else:
+            node = NonLocalSelfReadNode(self._context_level - 1, None)
+        self._replace_after_inlining(node)
+
 
 class NonLocalSuperReadNode(NonLocalSelfReadNode):
 
@@ -104,6 +125,18 @@ class NonLocalSuperReadNode(NonLocalSelfReadNode):
     def get_super_class(self):
         return self._get_lexical_super_class()
 
+    def adapt_after_inlining(self, arg_locals, depth):
+        assert self._context_level > depth
+        if self._context_level == 1:
+            node = LocalSuperReadNode(self._super_class_name,
+                                      self._on_class_side, self._universe,
+                                      None)
+        else:
+            node = NonLocalSuperReadNode(self._context_level - 1,
+                                         self._super_class_name,
+                                         self._on_class_side, self._universe)
+        self._replace_after_inlining(node)
+
 
 class NonLocalTempWriteNode(_NonLocalVariableNode):
 
@@ -155,6 +188,12 @@ class LocalArgumentReadNode(_LocalVariableNode):
     def execute(self, frame):
         return frame.get_argument(self._frame_idx)
 
+    def adapt_after_inlining(self, arg_locals, depth):
+        # arguments of nested blocks are not affected
+        if depth == 0:
+            self._replace_after_inlining(
+                arg_locals[self._frame_idx].get_read_node(0))
+
 
 class LocalUnsharedTempReadNode(_LocalVariableNode):
 
@@ -216,6 +255,12 @@ class LocalArgumentWriteNode(_LocalVariableNode):
         frame.set_argument(self._frame_idx, val)
         return val
 
+    def adapt_after_inlining(self, arg_locals, depth):
+        ExpressionNode.adapt_after_inlining(self, arg_locals, depth)
+        if depth == 0:
+            self._replace_after_inlining(
+                arg_locals[self._frame_idx].get_write_node(0, self._expr))
+
 
 class _LocalVariableWriteNode(_LocalVariableNode):
 
@@ -3,7 +3,12 @@ from rlib import jit
 
 class Bytecodes(object):
 
-    # Bytecodes used by the Simple Object Machine (SOM)
+    # Bytecodes used by the Simple Object Machine (SOM). Operands that index
+    # the literals or the caches of a method take two bytes, low byte first.
+    # Sends, field accesses and global reads have the number of their send
+    # site, field access site or global site as last operand, which the
+    # compiler assigns, and which indexes the corresponding caches of the
+    # method.
     halt             =  0
     dup              =  1
     push_local       =  2
@@ -25,29 +30,92 @@ class Bytecodes(object):
     add              = 16
     multiply         = 17
     subtract         = 18
-
-    _num_bytecodes   = 19
+    less_than        = 19
+    greater_than     = 20
+    less_than_equal  = 21
+    equal            = 22
+    equal_equal      = 23
+    double_div       = 24
+    int_div          = 25
+    modulo           = 26
+    at               = 27
+    at_put           = 28
+    value            = 29
+
+    # jumps, generated when inlining control structures with literal blocks.
+    # The two operand bytes hold the jump offset relative to the jump
+    # bytecode itself (low byte first).
+    jump                  = 30
+    jump_on_true_top_nil  = 31
+    jump_on_false_top_nil = 32
+    jump_on_true_pop      = 33
+    jump_on_false_pop     = 34
+    jump_backward         = 35
+
+    # superinstructions, combining frequent sequences of bytecodes
+    return_self      = 36  # push_argument 0 0, return_local
+    return_field     = 37  # push_field, return_local
+    add_to_local     = 38  # push_local, push_constant, add, pop_local
+    add_to_field     = 39  # push_field, push_constant, add, pop_field.
+                           # The operands are the field index, the field
+                           # access site, the constant, and the send site
+
+    # variables captured by blocks, which live in the context of their
+    # activation. The operands are the index in the context, and the
+    # number of contexts to walk outwards, starting at the frame's own.
+    push_context     = 40
+    pop_context      = 41
+    add_to_context   = 42  # push_context, push_constant, add, pop_context
+
+    _num_bytecodes   = 43
 
     _bytecode_length = [ 1, # halt
                          1,  # dup
                          3,  # push_local
                          3,  # push_argument
-                         2,  # push_field
-                         2,  # push_block
-                         2,  # push_constant
-                         2,  # push_global
+                         4,  # push_field
+                         3,  # push_block
+                         3,  # push_constant
+                         5,  # push_global
                          1,  # pop
                          3,  # pop_local
                          3,  # pop_argument
-                         2,  # pop_field
-                         2,  # send
-                         2,  # super_send
+                         4,  # pop_field
+                         5,  # send
+                         5,  # super_send
                          1,  # return_local
                          1,  # return_non_local
 
-                         1,  # add
-                         1,  # multiply
-                         1,  # subtract
+                         3,  # add
+                         3,  # multiply
+                         3,  # subtract
+                         3,  # less_than
+                         3,  # greater_than
+                         3,  # less_than_equal
+                         3,  # equal
+                         3,  # equal_equal
+                         3,  # double_div
+                         3,  # int_div
+                         3,  # modulo
+                         3,  # at
+                         3,  # at_put
+                         3,  # value
+
+                         3,  # jump
+                         3,  # jump_on_true_top_nil
+                         3,  # jump_on_false_top_nil
+                         3,  # jump_on_true_pop
+                         3,  # jump_on_false_pop
+                         3,  # jump_backward
+
+                         1,  # return_self
+                         4,  # return_field
+                         7,  # add_to_local
+                         8,  # add_to_field
+
+                         3,  # push_context
+                         3,  # pop_context
+                         7,  # add_to_context
                          ]
 
     _stack_effect_depends_on_message = -1000 # chose a unresonable number to be recognizable
@@ -71,8 +139,37 @@ class Bytecodes(object):
                               -1,                               # add
                               -1,                               # multiply
                               -1,                               # subtract
+                              -1,                               # less_than
+                              -1,                               # greater_than
+                              -1,                               # less_than_equal
+                              -1,                               # equal
+                              -1,                               # equal_equal
+                              -1,                               # double_div
+                              -1,                               # int_div
+                              -1,                               # modulo
+                              -1,                               # at
+                              -2,                               # at_put
+                               0,                               # value
+                               0,                               # jump
+                              -1,                               # jump_on_true_top_nil
+                              -1,                               # jump_on_false_top_nil
+                              -1,                               # jump_on_true_pop
+                              -1,                               # jump_on_false_pop
+                               0,                               # jump_backward
+                               0,                               # return_self
+                               0,                               # return_field
+                               0,                               # add_to_local
+                               0,                               # add_to_field
+                               1,                               # push_context
+                              -1,                               # pop_context
+                               0,                               # add_to_context
                               ]
 
+    # stack elements that are used temporarily by superinstructions, on top
+    # of their stack effect
+    _bytecode_temporary_stack_use = { add_to_local: 2, add_to_field: 2,
+                                      add_to_context: 2 }
+
 @jit.elidable
 def bytecode_length(bytecode):
     assert 0 <= bytecode < len(Bytecodes._bytecode_length)
@@ -93,6 +190,36 @@ def bytecode_stack_effect_depends_on_send(bytecode):
     return Bytecodes._bytecode_stack_effect[bytecode] == Bytecodes._stack_effect_depends_on_message
 
 
+def bytecode_temporary_stack_use(bytecode):
+    return Bytecodes._bytecode_temporary_stack_use.get(bytecode, 0)
+
+
+def bytecode_is_send(bytecode):
+    """Sends have the number of their send site as last operand"""
+    return (bytecode == Bytecodes.send or bytecode == Bytecodes.super_send or
+            Bytecodes.add <= bytecode <= Bytecodes.value or
+            bytecode == Bytecodes.add_to_local or
+            bytecode == Bytecodes.add_to_field or
+            bytecode == Bytecodes.add_to_context)
+
+
+def bytecode_is_field_access(bytecode):
+    """Field accesses have the number of their field access site as operand,
+       following the field index"""
+    return (bytecode == Bytecodes.push_field or
+            bytecode == Bytecodes.pop_field or
+            bytecode == Bytecodes.return_field or
+            bytecode == Bytecodes.add_to_field)
+
+
+def bytecode_is_jump(bytecode):
+    return Bytecodes.jump <= bytecode <= Bytecodes.jump_backward
+
+
+def bytecode_is_conditional_jump(bytecode):
+    return Bytecodes.jump_on_true_top_nil <= bytecode <= Bytecodes.jump_on_false_pop
+
+
 @jit.elidable
 def bytecode_as_str(bytecode):
     assert 0 <= bytecode < len(_bytecode_names)
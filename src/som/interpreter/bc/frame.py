@@ -1,34 +1,123 @@
 from rlib import jit
+from rlib.debug import make_sure_not_resized
 
 from som.vm.globals import nilObject
 
 
+class Context(object):
+    """ The variables of an activation that are captured by blocks. Blocks
+        refer to the context of the activation that created them, instead of
+        the whole frame. The contexts of nested activations are chained, and
+        the outermost one belongs to the method activation, the home of
+        non-local returns. """
+
+    _immutable_fields_ = ["_outer", "_receiver", "_values", "_home"]
+
+    def __init__(self, outer, receiver, num_values):
+        self._outer    = outer
+        self._receiver = receiver
+        self._values   = [nilObject] * num_values
+        self._on_stack = True
+        if outer is None:
+            self._home = self
+        else:
+            self._home = outer.get_home()
+        make_sure_not_resized(self._values)
+
+    def get_outer(self):
+        return self._outer
+
+    def get_receiver(self):
+        return self._receiver
+
+    def get_home(self):
+        return self._home
+
+    def get_value(self, index):
+        return self._values[index]
+
+    def set_value(self, index, value):
+        self._values[index] = value
+
+    def is_on_stack(self):
+        return self._on_stack
+
+    def mark_as_no_longer_on_stack(self):
+        self._on_stack = False
+
+
 # Frame layout:
 #
 # +-----------------+
-# | Arguments       | 0
+# | Arguments       | _arguments
 # +-----------------+
-# | Local Variables | <-- localOffset
+# | Local Variables | _locals
 # +-----------------+
-# | Stack           | <-- stackPointer
+# | Stack           | _stack, the top is at _stack_pointer
 # | ...             |
 # +-----------------+
 #
+# The three areas have a fixed size, determined by the method. The frame is
+# virtualizable, so that compiled code keeps the arguments, locals and the
+# operand stack in registers, and only writes them back when the frame
+# escapes.
+#
+# Variables captured by blocks are not in the frame, but in its inner
+# context, which only exists for methods creating blocks. The context of a
+# block's frame is the inner context of the activation that created the
+# block. Block frames keep the receiver and the home context of their
+# context, so that field accesses and non-local returns do not go through
+# the context.
+#
 class Frame(object):
 
-    _immutable_fields_ = ["_method", "_context", "_stack"]
+    _immutable_fields_ = ["_method", "_context", "_home_context", "_receiver",
+                          "_arguments", "_locals", "_stack"]
+    _virtualizable_    = ["_arguments[*]", "_locals[*]", "_stack[*]",
+                          "_stack_pointer", "_inner_context"]
 
-    def __init__(self, num_elements, method, context, previous_frame):
+    def __init__(self, method, context, previous_frame):
+        self = jit.hint(self, access_directly=True, fresh_virtualizable=True)
         self._method         = method
         self._context        = context
-        self._stack          = [nilObject] * num_elements
-        self._stack_pointer  = method.get_initial_stack_pointer()
+        if context is None:
+            self._home_context = None
+            self._receiver     = None
+        else:
+            self._home_context = context.get_home()
+            self._receiver     = context.get_receiver()
+        self._arguments      = [nilObject] * method.get_number_of_arguments()
+        self._locals         = [nilObject] * method.get_number_of_locals()
+        self._stack          = [None] * method.get_number_of_stack_elements()
+        self._stack_pointer  = -1
         self._previous_frame = previous_frame
+        self._inner_context  = None
+        make_sure_not_resized(self._arguments)
+        make_sure_not_resized(self._locals)
+        make_sure_not_resized(self._stack)
 
     def get_previous_frame(self):
         return self._previous_frame
 
-    def clear_previous_frame(self):
+    def set_previous_frame(self, previous_frame):
+        self._previous_frame = previous_frame
+
+    def mark_as_no_longer_on_stack(self):
+        self._previous_frame = None
+        if self._inner_context is not None:
+            self._inner_context.mark_as_no_longer_on_stack()
+
+    @jit.unroll_safe
+    def clear(self):
+        """ Reset the frame to its initial state, so that it can be used for
+            another activation of its method """
+        for i in range(len(self._arguments)):
+            self._arguments[i] = nilObject
+        for i in range(len(self._locals)):
+            self._locals[i] = nilObject
+        for i in range(len(self._stack)):
+            self._stack[i] = None
+        self._stack_pointer  = -1
         self._previous_frame = None
 
     def has_previous_frame(self):
@@ -40,31 +129,36 @@ class Frame(object):
     def get_context(self):
         return self._context
 
-    def has_context(self):
-        return self._context is not None
+    def get_inner_context(self):
+        return self._inner_context
 
-    @jit.unroll_safe
-    def _get_context(self, level):
-        """ Get the context frame at the given level """
-        frame = self
-
-        # Iterate through the context chain until the given level is reached
-        for _ in range(level, 0, -1):
-            frame = frame.get_context()
+    def get_self(self):
+        if self._receiver is None:
+            return self._arguments[0]
+        return self._receiver
 
-        # Return the found context
-        return frame
+    def get_home_context(self):
+        """ The context of the method activation a block was created in """
+        return self._home_context
 
     @jit.unroll_safe
-    def get_outer_context(self):
-        """ Compute the outer context of this frame """
-        frame = self
+    def _get_context(self, level):
+        """ Get the context at the given level, where 0 is the inner context
+            of this frame, and 1 the context of the block """
+        if level == 0:
+            return self._inner_context
 
-        while frame.has_context():
-            frame = frame.get_context()
+        context = self._context
+        for _ in range(level - 1, 0, -1):
+            context = context.get_outer()
+        return context
 
-        # Return the outer context
-        return frame
+    def get_context_value(self, index, level):
+        return self._get_context(level).get_value(index)
+
+    def set_context_value(self, index, level, value):
+        assert value is not None
+        self._get_context(level).set_value(index, value)
 
     def top(self):
         stack_pointer = jit.promote(self._stack_pointer)
@@ -97,50 +191,36 @@ class Frame(object):
     def reset_stack_pointer(self):
         """ Set the stack pointer to its initial value thereby clearing
             the stack """
-        # arguments are stored in front of local variables
-        self._stack_pointer = self._method.get_initial_stack_pointer()
+        self._stack_pointer = -1
 
     def get_stack_element(self, index):
         # Get the stack element with the given index
         # (an index of zero yields the top element)
-        result = self._stack[self._stack_pointer - index]
+        stack_pointer = jit.promote(self._stack_pointer) - index
+        assert 0 <= stack_pointer < len(self._stack)
+        result = self._stack[stack_pointer]
         assert result is not None
         return result
 
     def set_stack_element(self, index, value):
         # Set the stack element with the given index to the given value
         # (an index of zero yields the top element)
-        self._stack[self._stack_pointer - index] = value
-
-    def _get_local(self, index):
-        return self._stack[index]
-
-    def _set_local(self, index, value):
-        self._stack[index] = value
+        stack_pointer = jit.promote(self._stack_pointer) - index
+        assert 0 <= stack_pointer < len(self._stack)
+        self._stack[stack_pointer] = value
 
-    def get_local(self, index, context_level):
-        # Get the local with the given index in the given context
-        return self._get_context(context_level)._get_local(index)
+    def get_local(self, index):
+        return self._locals[index]
 
-    def set_local(self, index, context_level, value):
-        # Set the local with the given index in the given context to the given
-        # value
+    def set_local(self, index, value):
         assert value is not None
-        self._get_context(context_level)._set_local(index, value)
-
-    def get_argument(self, index, context_level):
-        # Get the context
-        context = self._get_context(context_level)
+        self._locals[index] = value
 
-        # Get the argument with the given index
-        return context._stack[index]
+    def get_argument(self, index):
+        return self._arguments[index]
 
-    def set_argument(self, index, context_level, value):
-        # Get the context
-        context = self._get_context(context_level)
-
-        # Set the argument with the given index to the given value
-        context._stack[index] = value
+    def set_argument(self, index, value):
+        self._arguments[index] = value
 
     @jit.unroll_safe
     def copy_arguments_from(self, frame, num_args):
@@ -149,7 +229,20 @@ class Frame(object):
         # - copy them into the argument area of the current frame
         assert num_args == self._method.get_number_of_arguments()
         for i in range(0, num_args):
-            self._stack[i] = frame.get_stack_element(num_args - 1 - i)
+            self._arguments[i] = frame.get_stack_element(num_args - 1 - i)
+
+        if self._method.creates_blocks():
+            self._inner_context = self._create_inner_context()
+
+    @jit.unroll_safe
+    def _create_inner_context(self):
+        context = Context(self._context, self.get_self(),
+                          self._method.get_number_of_context_values())
+        # captured arguments are the first values of the context
+        captured_args = self._method.get_captured_arguments()
+        for i in range(len(captured_args)):
+            context.set_value(i, self._arguments[captured_args[i]])
+        return context
 
     @jit.unroll_safe
     def pop_old_arguments_and_push_result(self, method, result):
@@ -171,7 +264,7 @@ class Frame(object):
 
 
 def create_frame(previous_frame, method, context):
-    return Frame(method.get_number_of_frame_elements(), method, context, previous_frame)
+    return Frame(method, context, previous_frame)
 
 
 def create_bootstrap_frame(bootstrap_method, receiver, arguments = None):
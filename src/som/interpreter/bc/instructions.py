@@ -0,0 +1,81 @@
+from som.interpreter.bc.bytecodes import bytecode_length, bytecode_is_jump, \
+    bytecode_is_send, bytecode_is_field_access, Bytecodes
+
+
+class Instruction(object):
+    """ A decoded bytecode with its operands. The literal is resolved, jump
+        targets are indexes of instructions, and the sites index the caches of
+        the method. Operands the bytecode does not have are -1 or None. """
+
+    _immutable_fields_ = ["bytecode", "bytecode_index", "index", "level",
+                          "literal", "send_site", "field_site", "global_site",
+                          "target"]
+
+    def __init__(self, bytecode, bytecode_index, index, level, literal,
+                 send_site, field_site, global_site, target):
+        self.bytecode       = bytecode
+        self.bytecode_index = bytecode_index
+        self.index          = index
+        self.level          = level
+        self.literal        = literal
+        self.send_site      = send_site
+        self.field_site     = field_site
+        self.global_site    = global_site
+        self.target         = target
+
+
+def decode_instructions(method):
+    """ Decode the bytecodes of the method, once they are complete """
+    instruction_indexes = {}
+    bytecode_indexes = []
+    i = 0
+    while i < method.get_number_of_bytecodes():
+        instruction_indexes[i] = len(bytecode_indexes)
+        bytecode_indexes.append(i)
+        i += bytecode_length(method.get_bytecode(i))
+
+    return [_decode(method, i, instruction_indexes) for i in bytecode_indexes]
+
+
+def _decode(method, i, instruction_indexes):
+    bc = method.get_bytecode(i)
+    index   = -1
+    level   = -1
+    literal = None
+    send_site   = -1
+    field_site  = -1
+    global_site = -1
+    target      = -1
+
+    if (bc == Bytecodes.push_local or bc == Bytecodes.push_argument or
+            bc == Bytecodes.pop_local or bc == Bytecodes.pop_argument or
+            bc == Bytecodes.push_context or bc == Bytecodes.pop_context):
+        index = method.get_bytecode(i + 1)
+        level = method.get_bytecode(i + 2)
+    elif (bc == Bytecodes.add_to_local or bc == Bytecodes.add_to_context):
+        index   = method.get_bytecode(i + 1)
+        level   = method.get_bytecode(i + 2)
+        literal = method.get_constant(i + 2)
+    elif bc == Bytecodes.add_to_field:
+        index   = method.get_bytecode(i + 1)
+        literal = method.get_constant(i + 3)
+    elif bytecode_is_field_access(bc):
+        index = method.get_bytecode(i + 1)
+    elif (bc == Bytecodes.push_block or bc == Bytecodes.push_constant or
+          bc == Bytecodes.push_global or bc == Bytecodes.send or
+          bc == Bytecodes.super_send):
+        literal = method.get_constant(i)
+    elif bc == Bytecodes.jump_backward:
+        target = instruction_indexes[i - method.get_jump_offset(i)]
+    elif bytecode_is_jump(bc):
+        target = instruction_indexes[i + method.get_jump_offset(i)]
+
+    if bytecode_is_send(bc):
+        send_site = method.get_send_site(i)
+    if bytecode_is_field_access(bc):
+        field_site = method.get_field_site(i)
+    if bc == Bytecodes.push_global:
+        global_site = method.get_global_site(i)
+
+    return Instruction(bc, i, index, level, literal, send_site, field_site,
+                       global_site, target)
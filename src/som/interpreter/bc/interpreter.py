@@ -1,115 +1,269 @@
-from som.interpreter.bc.bytecodes import bytecode_length, Bytecodes
+from som.interpreter.bc.bytecodes import Bytecodes
 from som.interpreter.control_flow import ReturnException
-from som.vmobjects.block_bc import BcBlock
+from som.interpreter.objectstorage.layout_transitions import \
+    UninitializedStorageLocationException, GeneralizeStorageLocationException
+from som.vm.globals import nilObject, trueObject, falseObject
+from som.vmobjects.array_strategy import Array
+from som.vmobjects.biginteger import BigInteger
+from som.vmobjects.block_bc import BcBlock, block_evaluate
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
 
 from rlib import jit
 
 
+class _InlineCacheEntry(object):
+    """ Entries of the polymorphic inline cache of a send site form a chain.
+        They are only valid for the version of the receiver class they were
+        created for. An entry without receiver class marks the send site as
+        megamorphic. """
+
+    _immutable_fields_ = ["receiver_class", "invokable", "next_entry",
+                          "version", "chain_length"]
+
+    def __init__(self, receiver_class, invokable, next_entry, version):
+        self.receiver_class = receiver_class
+        self.invokable      = invokable
+        self.next_entry     = next_entry
+        self.version        = version
+        if next_entry is None:
+            self.chain_length = 1
+        else:
+            self.chain_length = next_entry.chain_length + 1
+
+    def is_megamorphic(self):
+        return self.receiver_class is None
+
+
+def _without_class(first_entry, receiver_class):
+    """ The chain of inline cache entries without the one for the class """
+    entries = []
+    entry = first_entry
+    while entry is not None:
+        if entry.receiver_class is not receiver_class:
+            entries.append(entry)
+        entry = entry.next_entry
+
+    new_entry = None
+    for i in range(len(entries) - 1, -1, -1):
+        new_entry = _InlineCacheEntry(entries[i].receiver_class,
+                                      entries[i].invokable, new_entry,
+                                      entries[i].version)
+    return new_entry
+
+
+class _FieldCacheEntry(object):
+    """ Entries of the field cache of a push_field or pop_field bytecode form
+        a chain, which maps the layouts of the receivers seen to the storage
+        location of the field. An entry without layout marks the bytecode
+        as megamorphic. """
+
+    _immutable_fields_ = ["layout", "location", "next_entry", "chain_length"]
+
+    def __init__(self, layout, location, next_entry):
+        self.layout     = layout
+        self.location   = location
+        self.next_entry = next_entry
+        if next_entry is None:
+            self.chain_length = 1
+        else:
+            self.chain_length = next_entry.chain_length + 1
+
+    def is_megamorphic(self):
+        return self.layout is None
+
+
+def _is_number(obj):
+    return (isinstance(obj, Integer) or isinstance(obj, Double) or
+            isinstance(obj, BigInteger))
+
+
+def _make_arithmetic_quick_send(prim_name, selector_field, with_double=True):
+    """ Integer, and optionally Double, receivers evaluate the primitive
+        directly, when the argument is a number as well """
+    def _do_quick_send(self, instruction, frame, method):
+        right = frame.top()
+        left  = frame.get_stack_element(1)
+        if isinstance(left, Integer) and _is_number(right):
+            frame.pop()
+            frame.set_top(getattr(left, prim_name)(right))
+        elif with_double and isinstance(left, Double) and _is_number(right):
+            frame.pop()
+            frame.set_top(getattr(left, prim_name)(right))
+        else:
+            self._quick_send(method, frame, getattr(self, selector_field),
+                             left, instruction)
+    return _do_quick_send
+
+
 class Interpreter(object):
 
-    _immutable_fields_ = ["_universe", "_add_symbol"]
+    # number of receiver classes cached per send site, before the send site
+    # is considered megamorphic and relies on the universe's lookup cache
+    INLINE_CACHE_SIZE = 6
+
+    # number of object layouts cached per field access, before the field
+    # access is considered megamorphic and looks up the location each time
+    FIELD_CACHE_SIZE = 6
+
+    _immutable_fields_ = ["_universe", "_add_symbol", "_multiply_symbol",
+                          "_subtract_symbol", "_less_than_symbol",
+                          "_greater_than_symbol", "_less_than_equal_symbol",
+                          "_equal_symbol", "_equal_equal_symbol",
+                          "_double_div_symbol", "_int_div_symbol",
+                          "_modulo_symbol",
+                          "_at_symbol", "_at_put_symbol", "_value_symbol"]
 
     def __init__(self, universe):
         self._universe   = universe
         self._add_symbol      = None
         self._multiply_symbol = None
         self._subtract_symbol = None
+        self._less_than_symbol       = None
+        self._greater_than_symbol    = None
+        self._less_than_equal_symbol = None
+        self._equal_symbol           = None
+        self._equal_equal_symbol     = None
+        self._double_div_symbol      = None
+        self._int_div_symbol         = None
+        self._modulo_symbol          = None
+        self._at_symbol              = None
+        self._at_put_symbol          = None
+        self._value_symbol           = None
 
     def initialize_known_quick_sends(self):
         self._add_symbol      = self._universe.symbol_for("+")
         self._multiply_symbol = self._universe.symbol_for("*")
         self._subtract_symbol = self._universe.symbol_for("-")
+        self._less_than_symbol       = self._universe.symbol_for("<")
+        self._greater_than_symbol    = self._universe.symbol_for(">")
+        self._less_than_equal_symbol = self._universe.symbol_for("<=")
+        self._equal_symbol           = self._universe.symbol_for("=")
+        self._equal_equal_symbol     = self._universe.symbol_for("==")
+        self._double_div_symbol      = self._universe.symbol_for("//")
+        self._int_div_symbol         = self._universe.symbol_for("/")
+        self._modulo_symbol          = self._universe.symbol_for("%")
+        self._at_symbol              = self._universe.symbol_for("at:")
+        self._at_put_symbol          = self._universe.symbol_for("at:put:")
+        self._value_symbol           = self._universe.symbol_for("value")
 
     def get_universe(self):
         return self._universe
 
-    @staticmethod
-    def _do_dup(frame):
+    # The handlers of the bytecodes that do not return or jump. They are
+    # dispatched through _HANDLERS, and get the decoded instruction.
+
+    def _do_dup(self, instruction, frame, method):
         # Handle the dup bytecode
         frame.push(frame.top())
 
-    @staticmethod
-    def _do_push_local(bytecode_index, frame, method):
+    def _do_push_local(self, instruction, frame, method):
         # Handle the push local bytecode
-        frame.push(
-            frame.get_local(
-                method.get_bytecode(bytecode_index + 1),
-                method.get_bytecode(bytecode_index + 2)))
+        frame.push(frame.get_local(instruction.index))
 
-    @staticmethod
-    def _do_push_argument(bytecode_index, frame, method):
+    def _do_push_argument(self, instruction, frame, method):
         # Handle the push argument bytecode
-        frame.push(
-            frame.get_argument(method.get_bytecode(bytecode_index + 1),
-                               method.get_bytecode(bytecode_index + 2)))
+        frame.push(frame.get_argument(instruction.index))
 
-    def _do_push_field(self, bytecode_index, frame, method):
+    def _do_push_context(self, instruction, frame, method):
+        # Handle the push context bytecode
+        frame.push(frame.get_context_value(instruction.index,
+                                           instruction.level))
+
+    def _do_push_field(self, instruction, frame, method):
         # Handle the push field bytecode
-        field_index = method.get_bytecode(bytecode_index + 1)
+        frame.push(self._read_field(instruction, frame, method))
+
+    def _read_field(self, instruction, frame, method):
+        field_index = instruction.index
+        self_obj = self.get_self(frame)
 
-        # Push the field with the computed index onto the stack
-        frame.push(self.get_self(frame).get_field(field_index))
+        location = self._lookup_field_location(method, instruction.field_site,
+                                               self_obj, field_index)
+        if location is None:
+            return self_obj.get_field(field_index)
+        return location.read_location(self_obj)
 
-    def _do_push_block(self, bytecode_index, frame, method):
+    def _do_push_block(self, instruction, frame, method):
         # Handle the push block bytecode
-        block_method = method.get_constant(bytecode_index)
+        block_method = instruction.literal
 
-        # Push a new block with the current frame as context onto the
+        # Push a new block with the current frame's inner context onto the
         # stack
-        frame.push(BcBlock(block_method, frame))
+        frame.push(BcBlock(block_method, frame.get_inner_context()))
 
-    @staticmethod
-    def _do_push_constant(bytecode_index, frame, method):
+    def _do_push_constant(self, instruction, frame, method):
         # Handle the push constant bytecode
-        frame.push(method.get_constant(bytecode_index))
-
-    def _do_push_global(self, bytecode_index, frame, method):
-        # Handle the push global bytecode
-        global_name = method.get_constant(bytecode_index)
-
-        # Get the global from the universe
-        glob = self._universe.get_global(global_name)
-
-        if glob:
-            # Push the global onto the stack
-            frame.push(glob)
-        else:
-            # Send 'unknownGlobal:' to self
-            self._send_unknown_global(self.get_self(frame), frame, global_name)
-
-    @staticmethod
-    def _do_pop(frame):
+        frame.push(instruction.literal)
+
+    def _do_push_global(self, instruction, frame, method):
+        # Handle the push global bytecode. The association of a global does
+        # not change, so it is looked up once per global site
+        assoc = method.get_global_cache(instruction.global_site)
+        if assoc is None:
+            global_name = instruction.literal
+            if not self._universe.has_global(global_name):
+                # Send 'unknownGlobal:' to self
+                self._send_unknown_global(self.get_self(frame), frame,
+                                          global_name)
+                return
+            assoc = self._universe.get_globals_association(global_name)
+            method.set_global_cache(instruction.global_site, assoc)
+
+        # Push the global onto the stack
+        frame.push(assoc.get_value())
+
+    def _do_pop(self, instruction, frame, method):
         # Handle the pop bytecode
         frame.pop()
 
-    @staticmethod
-    def _do_pop_local(bytecode_index, frame, method):
+    def _do_pop_local(self, instruction, frame, method):
         # Handle the pop local bytecode
-        frame.set_local(method.get_bytecode(bytecode_index + 1),
-                        method.get_bytecode(bytecode_index + 2),
-                        frame.pop())
+        frame.set_local(instruction.index, frame.pop())
 
-    @staticmethod
-    def _do_pop_argument(bytecode_index, frame, method):
+    def _do_pop_argument(self, instruction, frame, method):
         # Handle the pop argument bytecode
-        frame.set_argument(method.get_bytecode(bytecode_index + 1),
-                           method.get_bytecode(bytecode_index + 2),
-                           frame.pop())
-
-    def _do_pop_field(self, bytecode_index, frame, method):
-        # Handle the pop field bytecode
-        field_index = method.get_bytecode(bytecode_index + 1)
+        frame.set_argument(instruction.index, frame.pop())
 
-        # Set the field with the computed index to the value popped from the stack
-        self.get_self(frame).set_field(field_index, frame.pop())
+    def _do_pop_context(self, instruction, frame, method):
+        # Handle the pop context bytecode
+        frame.set_context_value(instruction.index, instruction.level,
+                                frame.pop())
 
-    def _do_super_send(self, bytecode_index, frame, method):
+    def _do_pop_field(self, instruction, frame, method):
+        # Handle the pop field bytecode
+        self._write_field(instruction, frame, method, frame.pop())
+
+    def _write_field(self, instruction, frame, method, value):
+        field_index = instruction.index
+        self_obj = self.get_self(frame)
+
+        location = self._lookup_field_location(method, instruction.field_site,
+                                               self_obj, field_index)
+        if location is None:
+            self_obj.set_field(field_index, value)
+            return
+
+        # when the value does not fit the location, set_field changes the
+        # layout, and the next execution of the bytecode caches the new one
+        try:
+            location.write_location(self_obj, value)
+        except UninitializedStorageLocationException:
+            self_obj.set_field(field_index, value)
+        except GeneralizeStorageLocationException:
+            self_obj.set_field(field_index, value)
+
+    def _do_super_send(self, instruction, frame, method):
         # Handle the super send bytecode
-        signature = method.get_constant(bytecode_index)
+        signature = instruction.literal
 
         # Send the message
-        # Lookup the invokable with the given signature
-        invokable = method.get_holder().get_super_class().lookup_invokable(signature)
+        # Lookup the invokable with the given signature. The super class is
+        # the same for every execution, so the inline cache of the send site
+        # only ever holds one entry, and is invalidated like the others
+        invokable = self._lookup_with_inline_cache(
+            method, instruction.send_site, signature,
+            method.get_holder().get_super_class())
 
         if invokable:
             # Invoke the invokable in the current frame
@@ -123,26 +277,22 @@ class Interpreter(object):
 
             self._send_does_not_understand(receiver, frame, signature)
 
-    @staticmethod
-    def _do_return_local(frame):
-        return frame.top()
-
     @jit.unroll_safe
-    def _do_return_non_local(self, frame):
+    def _return_non_local(self, frame):
         # get result from stack
         result = frame.top()
 
         # Compute the context for the non-local return
-        context = frame.get_outer_context()
+        context = frame.get_home_context()
 
         # Make sure the block context is still on the stack
-        if not context.has_previous_frame():
+        if not context.is_on_stack():
             # Try to recover by sending 'escapedBlock:' to the sending object
             # this can get a bit nasty when using nested blocks. In this case
             # the "sender" will be the surrounding block and not the object
             # that actually sent the 'value' message.
-            block  = frame.get_argument(0, 0)
-            sender = frame.get_previous_frame().get_outer_context().get_argument(0, 0)
+            block  = frame.get_argument(0)
+            sender = frame.get_previous_frame().get_self()
 
             # ... and execute the escapedBlock message instead
             self._send_escaped_block(sender, frame, block)
@@ -150,21 +300,106 @@ class Interpreter(object):
 
         raise ReturnException(result, context)
 
-    def _do_add(self, bytecode_index, frame, method):
-        rcvr  = frame.get_stack_element(1)
-        rcvr.quick_add(method, frame, self, bytecode_index)
-
-    def _do_multiply(self, bytecode_index, frame, method):
-        rcvr  = frame.get_stack_element(1)
-        rcvr.quick_multiply(method, frame, self, bytecode_index)
+    # The quick sends evaluate well known operations directly for the
+    # receivers and arguments they are commonly used with, and otherwise
+    # send the message
+    _do_add             = _make_arithmetic_quick_send("prim_add", "_add_symbol")
+    _do_multiply        = _make_arithmetic_quick_send("prim_multiply",
+                                                      "_multiply_symbol")
+    _do_subtract        = _make_arithmetic_quick_send("prim_subtract",
+                                                      "_subtract_symbol")
+    _do_less_than       = _make_arithmetic_quick_send("prim_less_than",
+                                                      "_less_than_symbol")
+    _do_greater_than    = _make_arithmetic_quick_send("prim_greater_than",
+                                                      "_greater_than_symbol")
+    _do_less_than_equal = _make_arithmetic_quick_send(
+        "prim_less_than_or_equal", "_less_than_equal_symbol")
+    _do_equal           = _make_arithmetic_quick_send("prim_equals",
+                                                      "_equal_symbol")
+    _do_double_div      = _make_arithmetic_quick_send("prim_double_div",
+                                                      "_double_div_symbol")
+    _do_int_div         = _make_arithmetic_quick_send("prim_int_div",
+                                                      "_int_div_symbol", False)
+    _do_modulo          = _make_arithmetic_quick_send("prim_modulo",
+                                                      "_modulo_symbol")
+
+    def _do_equal_equal(self, instruction, frame, method):
+        right = frame.top()
+        left  = frame.get_stack_element(1)
+        if isinstance(left, Integer):
+            frame.pop()
+            if isinstance(right, Integer) or isinstance(right, BigInteger):
+                frame.set_top(left.prim_equals(right))
+            else:
+                frame.set_top(falseObject)
+        else:
+            self._quick_send(method, frame, self._equal_equal_symbol, left,
+                             instruction)
 
-    def _do_subtract(self, bytecode_index, frame, method):
+    def _do_at(self, instruction, frame, method):
+        index = frame.top()
         rcvr  = frame.get_stack_element(1)
-        rcvr.quick_subtract(method, frame, self, bytecode_index)
-
-    def _do_send(self, bytecode_index, frame, method):
+        if isinstance(rcvr, Array) and isinstance(index, Integer):
+            frame.pop()
+            frame.set_top(rcvr.get_indexable_field(
+                index.get_embedded_integer() - 1))
+        else:
+            self._quick_send(method, frame, self._at_symbol, rcvr,
+                             instruction)
+
+    def _do_at_put(self, instruction, frame, method):
+        value = frame.top()
+        index = frame.get_stack_element(1)
+        rcvr  = frame.get_stack_element(2)
+        if isinstance(rcvr, Array) and isinstance(index, Integer):
+            # like the primitive, this evaluates to the receiver
+            frame.pop()
+            frame.pop()
+            rcvr.set_indexable_field(index.get_embedded_integer() - 1, value)
+        else:
+            self._quick_send(method, frame, self._at_put_symbol, rcvr,
+                             instruction)
+
+    def _do_value(self, instruction, frame, method):
+        rcvr = frame.top()
+        if (isinstance(rcvr, BcBlock) and
+                rcvr.get_method().get_number_of_arguments() == 1):
+            block_evaluate(rcvr, self, frame)
+        else:
+            self._quick_send(method, frame, self._value_symbol, rcvr,
+                             instruction)
+
+    def _quick_send(self, method, frame, selector, receiver, instruction):
+        self._send(method, frame, selector,
+                   receiver.get_class(self._universe), instruction.send_site)
+
+    def _do_add_to_local(self, instruction, frame, method):
+        # the operands are the local's index and context, the constant, and
+        # the send site
+        self._do_push_local(instruction, frame, method)
+        frame.push(instruction.literal)
+        self._do_add(instruction, frame, method)
+        self._do_pop_local(instruction, frame, method)
+
+    def _do_add_to_context(self, instruction, frame, method):
+        # the operands are the index and level of the context, the constant,
+        # and the send site
+        self._do_push_context(instruction, frame, method)
+        frame.push(instruction.literal)
+        self._do_add(instruction, frame, method)
+        self._do_pop_context(instruction, frame, method)
+
+    def _do_add_to_field(self, instruction, frame, method):
+        # the operands are the field index, the field access site, the
+        # constant, and the send site
+        frame.push(self._read_field(instruction, frame, method))
+        frame.push(instruction.literal)
+        self._do_add(instruction, frame, method)
+        self._write_field(instruction, frame, method, frame.pop())
+
+    def _do_send(self, instruction, frame, method):
         # Handle the send bytecode
-        signature = method.get_constant(bytecode_index)
+        signature = instruction.literal
 
         # Get the number of arguments from the signature
         num_args = signature.get_number_of_signature_arguments()
@@ -174,98 +409,150 @@ class Interpreter(object):
 
         # Send the message
         self._send(method, frame, signature, receiver.get_class(self._universe),
-                   bytecode_index)
+                   instruction.send_site)
 
     @jit.unroll_safe
     def interpret(self, method, frame):
-        current_bc_idx = 0
+        current_idx = 0
         while True:
-            # since methods cannot contain loops (all loops are done via primitives)
-            # profiling only needs to be done on pc = 0
-            if current_bc_idx == 0:
+            # loops are either done via primitives, which evaluate blocks from
+            # pc = 0, or via backward jumps, which enter the jit themselves
+            if current_idx == 0:
                 jitdriver.can_enter_jit(
-                    bytecode_index=current_bc_idx, interp=self, method=method, frame=frame)
+                    instruction_index=current_idx, interp=self, method=method, frame=frame)
             jitdriver.jit_merge_point(
-                bytecode_index=current_bc_idx, interp=self, method=method, frame=frame)
-
-            bytecode = method.get_bytecode(current_bc_idx)
+                instruction_index=current_idx, interp=self, method=method, frame=frame)
 
-            # Get the length of the current bytecode
-            bc_length = bytecode_length(bytecode)
+            instruction = method.get_instruction(current_idx)
+            bytecode = instruction.bytecode
 
-            # Compute the next bytecode index
-            next_bc_idx = current_bc_idx + bc_length
-
-            # Handle the current bytecode
-            if   bytecode == Bytecodes.halt:                            # BC: 0
+            # the bytecodes that return or jump are handled here, all others
+            # are dispatched through the handler table
+            next_idx = current_idx + 1
+            if bytecode == Bytecodes.halt:
+                return frame.top()
+            elif bytecode == Bytecodes.return_local:
                 return frame.top()
-            elif bytecode == Bytecodes.dup:                             # BC: 1
-                self._do_dup(frame)
-            elif bytecode == Bytecodes.push_local:                      # BC: 2
-                self._do_push_local(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.push_argument:                   # BC: 3
-                self._do_push_argument(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.push_field:                      # BC: 4
-                self._do_push_field(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.push_block:                      # BC: 5
-                self._do_push_block(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.push_constant:                   # BC: 6
-                self._do_push_constant(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.push_global:                     # BC: 7
-                self._do_push_global(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.pop:                             # BC: 8
-                self._do_pop(frame)
-            elif bytecode == Bytecodes.pop_local:                       # BC: 9
-                self._do_pop_local(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.pop_argument:                    # BC:10
-                self._do_pop_argument(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.pop_field:                       # BC:11
-                self._do_pop_field(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.send:                            # BC:12
-                self._do_send(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.super_send:                      # BC:13
-                self._do_super_send(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.return_local:                    # BC:14
-                return self._do_return_local(frame)
-            elif bytecode == Bytecodes.return_non_local:                # BC:15
-                return self._do_return_non_local(frame)
-            elif bytecode == Bytecodes.add:
-                self._do_add(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.multiply:
-                self._do_multiply(current_bc_idx, frame, method)
-            elif bytecode == Bytecodes.subtract:
-                self._do_subtract(current_bc_idx, frame, method)
-
-            current_bc_idx = next_bc_idx
+            elif bytecode == Bytecodes.return_non_local:
+                return self._return_non_local(frame)
+            elif bytecode == Bytecodes.return_self:
+                return frame.get_argument(0)
+            elif bytecode == Bytecodes.return_field:
+                return self._read_field(instruction, frame, method)
+            elif bytecode == Bytecodes.jump:
+                next_idx = instruction.target
+            elif bytecode == Bytecodes.jump_on_true_top_nil:
+                if frame.top() is trueObject:
+                    next_idx = instruction.target
+                    frame.set_top(nilObject)
+                else:
+                    frame.pop()
+            elif bytecode == Bytecodes.jump_on_false_top_nil:
+                if frame.top() is falseObject:
+                    next_idx = instruction.target
+                    frame.set_top(nilObject)
+                else:
+                    frame.pop()
+            elif bytecode == Bytecodes.jump_on_true_pop:
+                if frame.pop() is trueObject:
+                    next_idx = instruction.target
+            elif bytecode == Bytecodes.jump_on_false_pop:
+                if frame.pop() is falseObject:
+                    next_idx = instruction.target
+            elif bytecode == Bytecodes.jump_backward:
+                next_idx = instruction.target
+                jitdriver.can_enter_jit(
+                    instruction_index=next_idx, interp=self, method=method, frame=frame)
+            else:
+                _get_handler(bytecode)(self, instruction, frame, method)
+
+            current_idx = next_idx
 
     @staticmethod
     def get_self(frame):
         # Get the self object from the interpreter
-        return frame.get_outer_context().get_argument(0, 0)
-
-    def _send(self, m, frame, selector, receiver_class, bytecode_index):
-        # selector.inc_send_count()
+        return frame.get_self()
 
-        # First try the inline cache
-        cached_class = m.get_inline_cache_class(bytecode_index)
-        if cached_class == receiver_class:
-            invokable = m.get_inline_cache_invokable(bytecode_index)
-        else:
-            if not cached_class:
-                # Lookup the invokable with the given signature
-                invokable = receiver_class.lookup_invokable(selector)
-                m.set_inline_cache(bytecode_index, receiver_class, invokable)
-            else:
-                # the bytecode index after the send is used by the selector constant,
-                # and can be used safely as another cache item
-                cached_class = m.get_inline_cache_class(bytecode_index + 1)
-                if cached_class == receiver_class:
-                    invokable = m.get_inline_cache_invokable(bytecode_index + 1)
-                else:
-                    invokable = receiver_class.lookup_invokable(selector)
-                    if not cached_class:
-                        m.set_inline_cache(bytecode_index + 1, receiver_class, invokable)
+    @jit.unroll_safe
+    def _lookup_with_inline_cache(self, m, send_site, selector,
+                                  receiver_class):
+        version = receiver_class.get_version()
+        first_entry = m.get_inline_cache(send_site)
+
+        entry = first_entry
+        while entry is not None:
+            if entry.is_megamorphic():
+                return receiver_class.lookup_invokable(selector)
+            if entry.receiver_class is receiver_class:
+                if entry.version == version:
+                    return entry.invokable
+                # a method of the class or a superclass changed
+                first_entry = _without_class(first_entry, receiver_class)
+                break
+            entry = entry.next_entry
+
+        if (first_entry is not None and
+                first_entry.chain_length >= self.INLINE_CACHE_SIZE):
+            # too many different receiver classes, the send site is megamorphic
+            m.set_inline_cache(send_site,
+                               _InlineCacheEntry(None, None, None, 0))
+            return receiver_class.lookup_invokable(selector)
+
+        invokable = receiver_class.lookup_invokable(selector)
+        m.set_inline_cache(send_site, _InlineCacheEntry(
+            receiver_class, invokable, first_entry, version))
+        return invokable
 
+    @jit.unroll_safe
+    def _lookup_field_location(self, m, field_site, obj, field_index):
+        layout = obj.get_object_layout()
+        first_entry = m.get_field_cache(field_site)
+
+        entry = first_entry
+        while entry is not None:
+            if entry.is_megamorphic():
+                return None
+            if entry.layout is layout:
+                return entry.location
+            entry = entry.next_entry
+
+        return self._add_field_cache_entry(m, field_site, obj, field_index,
+                                           first_entry)
+
+    @jit.dont_look_inside
+    def _add_field_cache_entry(self, m, field_site, obj, field_index,
+                               first_entry):
+        # objects with an outdated layout are brought up to date, and entries
+        # for outdated layouts of the same class are replaced
+        obj.update_layout_to_match_class()
+        layout = obj.get_object_layout()
+
+        entries = []
+        entry = first_entry
+        while entry is not None:
+            if entry.layout is layout:
+                return entry.location
+            if not entry.layout.is_for_same_class(obj.get_class(self._universe)):
+                entries.append(entry)
+            entry = entry.next_entry
+
+        if len(entries) >= self.FIELD_CACHE_SIZE:
+            m.set_field_cache(field_site, _FieldCacheEntry(None, None, None))
+            return None
+
+        new_entry = None
+        for i in range(len(entries) - 1, -1, -1):
+            new_entry = _FieldCacheEntry(entries[i].layout, entries[i].location,
+                                         new_entry)
+
+        location = layout.get_storage_location(field_index)
+        m.set_field_cache(field_site,
+                          _FieldCacheEntry(layout, location, new_entry))
+        return location
+
+    def _send(self, m, frame, selector, receiver_class, send_site):
+        invokable = self._lookup_with_inline_cache(m, send_site, selector,
+                                                   receiver_class)
         if invokable:
             invokable.invoke(frame, self)
         else:
@@ -309,21 +596,48 @@ class Interpreter(object):
         invokable.invoke(frame, self)
 
 
-def get_printable_location(bytecode_index, interp, method):
+def _make_handler(name):
+    def handler(interp, instruction, frame, method):
+        getattr(interp, name)(instruction, frame, method)
+    handler.__name__ = "handler" + name
+    return handler
+
+
+def _make_handler_table():
+    "NOT_RPYTHON"
+    """The handlers of the bytecodes, indexed by bytecode. Bytecodes that
+       return or jump are handled by Interpreter.interpret() itself."""
+    handlers = [None] * Bytecodes._num_bytecodes
+    for name, value in Bytecodes.__dict__.items():
+        if (isinstance(value, int) and name[0] != "_" and
+                hasattr(Interpreter, "_do_" + name)):
+            handlers[value] = _make_handler("_do_" + name)
+    return handlers
+_HANDLERS = _make_handler_table()
+
+
+@jit.elidable
+def _get_handler(bytecode):
+    handler = _HANDLERS[bytecode]
+    assert handler is not None
+    return handler
+
+
+def get_printable_location(instruction_index, interp, method):
     from som.vmobjects.method_bc import BcMethod
     from som.interpreter.bc.bytecodes import bytecode_as_str
     assert isinstance(method, BcMethod)
-    bc = method.get_bytecode(bytecode_index)
-    return "%s @ %d in %s" % (bytecode_as_str(bc),
-                              bytecode_index,
+    instruction = method.get_instruction(instruction_index)
+    return "%s @ %d in %s" % (bytecode_as_str(instruction.bytecode),
+                              instruction.bytecode_index,
                               method.merge_point_string())
 
 
 jitdriver = jit.JitDriver(
     name='Interpreter',
-    greens=['bytecode_index', 'interp', 'method'],
+    greens=['instruction_index', 'interp', 'method'],
     reds=['frame'],
-    # virtualizables=['frame'],
+    virtualizables=['frame'],
     get_printable_location=get_printable_location,
     # the next line is a workaround around a likely bug in RPython
     # for some reason, the inlining heuristics default to "never inline" when
@@ -333,7 +647,7 @@ jitdriver = jit.JitDriver(
     # the next line says that calls involving this jitdriver should always be
     # inlined once (which means that things like Integer>>< will be inlined
     # into a while loop again, when enabling this drivers).
-    should_unroll_one_iteration = lambda bytecode_index, inter, method: True)
+    should_unroll_one_iteration = lambda instruction_index, inter, method: True)
 
 
 def jitpolicy(driver):
@@ -164,7 +164,7 @@ def _make_long_direct_storage_location(field_idx):
             # assert isinstance(obj, ObjectWithLayout)
 
             if self.is_set(obj):
-                return Integer(getattr(obj, "_primField" + str(field_idx)))
+                return Integer.box(getattr(obj, "_primField" + str(field_idx)))
             else:
                 return nilObject
 
@@ -194,7 +194,7 @@ class LongArrayStorageLocation(_AbstractPrimitiveArrayStorageLocation):
 
     def read_location(self, obj):
         if self.is_set(obj):
-            return Integer(obj._primFields[self._ext_idx])
+            return Integer.box(obj._primFields[self._ext_idx])
         else:
             return nilObject
 
@@ -9,7 +9,7 @@ def _at(rcvr, i):
 
 def _length(rcvr):
     from som.vmobjects.integer import Integer
-    return Integer(rcvr.get_number_of_indexable_fields())
+    return Integer.box(rcvr.get_number_of_indexable_fields())
 
 
 def _copy(rcvr):
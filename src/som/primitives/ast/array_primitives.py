@@ -33,7 +33,7 @@ def _do_indexes(ivkbl, rcvr, args):
     length = rcvr.get_number_of_indexable_fields()
     while i <= length:  # the i is propagated to Smalltalk, so, start with 1
         do_index_driver.jit_merge_point(block_method = block_method)
-        block_method.invoke(block, [Integer(i)])
+        block_method.invoke1(block, Integer.box(i))
         i += 1
 
 
@@ -54,7 +54,7 @@ def _do(ivkbl, rcvr, args):
     length = rcvr.get_number_of_indexable_fields()
     while i < length:  # the array itself is zero indexed
         do_driver.jit_merge_point(block_method = block_method)
-        block_method.invoke(block, [rcvr.get_indexable_field(i)])
+        block_method.invoke1(block, rcvr.get_indexable_field(i))
         i += 1
 
 
@@ -0,0 +1,66 @@
+from som.primitives.hash_map_primitives import HashMapPrimitivesBase as _Base
+from som.vm.globals import trueObject, falseObject
+from som.vmobjects.hash_map import HashMap, KeyComparator
+from som.vmobjects.primitive import Primitive
+
+
+class _AstKeyComparator(KeyComparator):
+
+    def __init__(self, universe):
+        self._universe = universe
+
+    def _send(self, rcvr, selector, args):
+        invokable = rcvr.get_class(self._universe).lookup_invokable(
+            self._universe.symbol_for(selector))
+        return invokable.invoke(rcvr, args)
+
+    def hashcode(self, key):
+        return self._send(key, "hashcode", [])
+
+    def equals(self, key, other):
+        return self._send(key, "=", [other]) is trueObject
+
+
+def _at(ivkbl, rcvr, args):
+    assert isinstance(rcvr, HashMap)
+    return rcvr.get(args[0], _AstKeyComparator(ivkbl.get_universe()))
+
+
+def _at_put(ivkbl, rcvr, args):
+    assert isinstance(rcvr, HashMap)
+    value = args[1]
+    rcvr.put(args[0], value, _AstKeyComparator(ivkbl.get_universe()))
+    return value
+
+
+def _remove_key(ivkbl, rcvr, args):
+    assert isinstance(rcvr, HashMap)
+    return rcvr.remove(args[0], _AstKeyComparator(ivkbl.get_universe()))
+
+
+def _includes_key(ivkbl, rcvr, args):
+    assert isinstance(rcvr, HashMap)
+    if rcvr.contains_key(args[0], _AstKeyComparator(ivkbl.get_universe())):
+        return trueObject
+    return falseObject
+
+
+def _keys_do(ivkbl, rcvr, args):
+    assert isinstance(rcvr, HashMap)
+    block = args[0]
+    block_method = block.get_method()
+
+    for key in rcvr.get_keys():
+        block_method.invoke1(block, key)
+    return rcvr
+
+
+class HashMapPrimitives(_Base):
+
+    def install_primitives(self):
+        _Base.install_primitives(self)
+        self._install_instance_primitive(Primitive("at:",          self._universe, _at))
+        self._install_instance_primitive(Primitive("at:put:",      self._universe, _at_put))
+        self._install_instance_primitive(Primitive("removeKey:",   self._universe, _remove_key))
+        self._install_instance_primitive(Primitive("includesKey:", self._universe, _includes_key))
+        self._install_instance_primitive(Primitive("keysDo:",      self._universe, _keys_do))
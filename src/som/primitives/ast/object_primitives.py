@@ -14,19 +14,19 @@ def _object_size(rcvr):
     elif isinstance(rcvr, Array):
         size = rcvr.get_number_of_indexable_fields()
 
-    return Integer(size)
+    return Integer.box(size)
 
 
 def _perform(ivkbl, rcvr, args):
     selector = args[0]
 
     invokable = rcvr.get_class(ivkbl.get_universe()).lookup_invokable(selector)
-    return invokable.invoke(rcvr, [])
+    return invokable.invoke0(rcvr)
 
 
 def _perform_in_superclass(rcvr, selector, clazz):
     invokable = clazz.lookup_invokable(selector)
-    return invokable.invoke(rcvr, [])
+    return invokable.invoke0(rcvr)
 
 
 def _perform_with_arguments(ivkbl, rcvr, arguments):
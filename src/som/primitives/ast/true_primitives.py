@@ -4,7 +4,7 @@ from som.primitives.true_primitives import TruePrimitivesBase as _Base
 def _and(ivkbl, rcvr, args):
     block = args[0]
     block_method = block.get_method()
-    return block_method.invoke(block, [])
+    return block_method.invoke0(block)
 
 
 TruePrimitives = _Base
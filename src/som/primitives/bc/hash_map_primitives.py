@@ -0,0 +1,88 @@
+from som.primitives.hash_map_primitives import HashMapPrimitivesBase as _Base
+from som.vm.globals import trueObject, falseObject
+from som.vmobjects.block_bc import block_evaluate
+from som.vmobjects.hash_map import HashMap, KeyComparator
+from som.vmobjects.primitive import Primitive
+
+
+class _BcKeyComparator(KeyComparator):
+    """ Sends hashcode and = using the stack of the primitive's frame,
+        after the primitive popped its arguments """
+
+    def __init__(self, frame, interpreter):
+        self._frame       = frame
+        self._interpreter = interpreter
+
+    def _send(self, rcvr, selector):
+        universe = self._interpreter.get_universe()
+        invokable = rcvr.get_class(universe).lookup_invokable(
+            universe.symbol_for(selector))
+        invokable.invoke(self._frame, self._interpreter)
+        return self._frame.pop()
+
+    def hashcode(self, key):
+        self._frame.push(key)
+        return self._send(key, "hashcode")
+
+    def equals(self, key, other):
+        self._frame.push(key)
+        self._frame.push(other)
+        return self._send(key, "=") is trueObject
+
+
+def _at(ivkbl, frame, interpreter):
+    key  = frame.pop()
+    rcvr = frame.pop()
+    assert isinstance(rcvr, HashMap)
+    frame.push(rcvr.get(key, _BcKeyComparator(frame, interpreter)))
+
+
+def _at_put(ivkbl, frame, interpreter):
+    value = frame.pop()
+    key   = frame.pop()
+    rcvr  = frame.pop()
+    assert isinstance(rcvr, HashMap)
+    rcvr.put(key, value, _BcKeyComparator(frame, interpreter))
+    frame.push(value)
+
+
+def _remove_key(ivkbl, frame, interpreter):
+    key  = frame.pop()
+    rcvr = frame.pop()
+    assert isinstance(rcvr, HashMap)
+    frame.push(rcvr.remove(key, _BcKeyComparator(frame, interpreter)))
+
+
+def _includes_key(ivkbl, frame, interpreter):
+    key  = frame.pop()
+    rcvr = frame.pop()
+    assert isinstance(rcvr, HashMap)
+    if rcvr.contains_key(key, _BcKeyComparator(frame, interpreter)):
+        frame.push(trueObject)
+    else:
+        frame.push(falseObject)
+
+
+def _keys_do(ivkbl, frame, interpreter):
+    block = frame.pop()
+    rcvr  = frame.pop()
+    assert isinstance(rcvr, HashMap)
+
+    for key in rcvr.get_keys():
+        frame.push(block)
+        frame.push(key)
+        block_evaluate(block, interpreter, frame)
+        frame.pop()
+
+    frame.push(rcvr)
+
+
+class HashMapPrimitives(_Base):
+
+    def install_primitives(self):
+        _Base.install_primitives(self)
+        self._install_instance_primitive(Primitive("at:",          self._universe, _at))
+        self._install_instance_primitive(Primitive("at:put:",      self._universe, _at_put))
+        self._install_instance_primitive(Primitive("removeKey:",   self._universe, _remove_key))
+        self._install_instance_primitive(Primitive("includesKey:", self._universe, _includes_key))
+        self._install_instance_primitive(Primitive("keysDo:",      self._universe, _keys_do))
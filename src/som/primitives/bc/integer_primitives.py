@@ -41,7 +41,7 @@ def _to_do_int(i, by_increment, top, frame, context, interpreter, block_method):
 
         b = BcBlock(block_method, context)
         frame.push(b)
-        frame.push(Integer(i))
+        frame.push(Integer.box(i))
         block_evaluate(b, interpreter, frame)
         frame.pop()
         i += by_increment
@@ -56,7 +56,7 @@ def _to_do_double(i, by_increment, top, frame, context, interpreter, block_metho
 
         b = BcBlock(block_method, context)
         frame.push(b)
-        frame.push(Integer(i))
+        frame.push(Integer.box(i))
         block_evaluate(b, interpreter, frame)
         frame.pop()
         i += by_increment
@@ -1,20 +1,20 @@
 from som.primitives.object_primitives import ObjectPrimitivesBase as _Base
 
-from som.vmobjects.object    import Object
+from som.vmobjects.object_with_layout import ObjectWithLayout
 from som.vmobjects.primitive import Primitive, UnaryPrimitive
-from som.vmobjects.array     import Array
+from som.vmobjects.array_strategy import Array
 
 
 def _object_size(rcvr):
     from som.vmobjects.integer import Integer
     size = 0
 
-    if isinstance(rcvr, Object):
+    if isinstance(rcvr, ObjectWithLayout):
         size = rcvr.get_number_of_fields()
     elif isinstance(rcvr, Array):
         size = rcvr.get_number_of_indexable_fields()
 
-    return Integer(size)
+    return Integer.box(size)
 
 
 def _perform(ivkbl, frame, interpreter):
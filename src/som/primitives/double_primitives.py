@@ -59,12 +59,12 @@ def _greater_than(left, right):
 def _round(rcvr):
     from som.vmobjects.integer import Integer
     int_value = int(round_double(rcvr.get_embedded_double(), 0))
-    return Integer(int_value)
+    return Integer.box(int_value)
 
 
 def _as_integer(rcvr):
     from som.vmobjects.integer import Integer
-    return Integer(int(rcvr.get_embedded_double()))
+    return Integer.box(int(rcvr.get_embedded_double()))
 
 
 def _cos(rcvr):
@@ -0,0 +1,21 @@
+from som.primitives.primitives import Primitives
+from som.vmobjects.hash_map import HashMap
+from som.vmobjects.integer import Integer
+from som.vmobjects.primitive import UnaryPrimitive
+
+
+def _new(rcvr):
+    return HashMap(rcvr)
+
+
+def _size(rcvr):
+    assert isinstance(rcvr, HashMap)
+    return Integer.box(rcvr.get_number_of_entries())
+
+
+class HashMapPrimitivesBase(Primitives):
+
+    def install_primitives(self):
+        self._install_instance_primitive(UnaryPrimitive("size", self._universe, _size))
+
+        self._install_class_primitive(UnaryPrimitive("new", self._universe, _new))
@@ -3,7 +3,7 @@ from rlib.llop import as_32_bit_unsigned_value, unsigned_right_shift
 
 from som.primitives.primitives import Primitives
 from som.vm.globals import nilObject, falseObject
-from som.vmobjects.array import Array
+from som.vmobjects.array_strategy import Array
 from som.vmobjects.biginteger import BigInteger
 from som.vmobjects.double      import Double
 from som.vmobjects.integer     import Integer
@@ -23,14 +23,14 @@ def _as_32_bit_signed_value(rcvr):
 
 def _as_32_bit_unsigned_value(rcvr):
     val = as_32_bit_unsigned_value(rcvr.get_embedded_integer())
-    return Integer(val)
+    return Integer.box(val)
 
 
 def _sqrt(rcvr):
     assert isinstance(rcvr, Integer)
     res = math.sqrt(rcvr.get_embedded_integer())
     if res == float(int(res)):
-        return Integer(int(res))
+        return Integer.box(int(res))
     else:
         return Double(res)
 
@@ -107,7 +107,7 @@ def _left_shift(left, right):
         if not (left_val == 0 or 0 <= right_val < LONG_BIT):
             raise OverflowError
         result = ovfcheck(left_val << right_val)
-        return Integer(result)
+        return Integer.box(result)
     except OverflowError:
         from som.vmobjects.biginteger import BigInteger
         return BigInteger(
@@ -120,13 +120,13 @@ def _unsigned_right_shift(left, right):
     left_val = left.get_embedded_integer()
     right_val = right.get_embedded_integer()
 
-    return Integer(unsigned_right_shift(left_val, right_val))
+    return Integer.box(unsigned_right_shift(left_val, right_val))
 
 
 def _bit_xor(left, right):
     assert isinstance(right, Integer)
     result = left.get_embedded_integer() ^ right.get_embedded_integer()
-    return Integer(result)
+    return Integer.box(result)
 
 
 def _abs(rcvr):
@@ -140,7 +140,8 @@ def _max(left, right):
 def _to(rcvr, arg):
     assert isinstance(rcvr, Integer)
     assert isinstance(arg, Integer)
-    return Array.from_integers(range(rcvr.get_embedded_integer(), arg.get_embedded_integer() + 1))
+    return Array.from_integers(list(range(rcvr.get_embedded_integer(),
+                                           arg.get_embedded_integer() + 1)))
 
 
 def _from_string(rcvr, param):
@@ -148,7 +149,7 @@ def _from_string(rcvr, param):
         return nilObject
 
     int_value = int(param.get_embedded_string())
-    return Integer(int_value)
+    return Integer.box(int_value)
 
 
 class IntegerPrimitivesBase(Primitives):
@@ -14,7 +14,7 @@ def _equals(op1, op2):
 
 def _hashcode(rcvr):
     from som.vmobjects.integer import Integer
-    return Integer(compute_identity_hash(rcvr))
+    return Integer.box(compute_identity_hash(rcvr))
 
 
 def _inst_var_at(rcvr, idx):
@@ -18,7 +18,7 @@ def _as_symbol(rcvr):
 
 
 def _length(rcvr):
-    return Integer(len(rcvr.get_embedded_string()))
+    return Integer.box(len(rcvr.get_embedded_string()))
 
 
 def _equals(op1, op2):
@@ -47,7 +47,7 @@ def _substring(rcvr, start, end):
 
 def _hashcode(rcvr):
     from som.vmobjects.integer import Integer
-    return Integer(compute_hash(rcvr.get_embedded_string()))
+    return Integer.box(compute_hash(rcvr.get_embedded_string()))
 
 
 def _is_whitespace(self):
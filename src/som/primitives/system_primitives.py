@@ -47,13 +47,13 @@ def _print_newline(rcvr):
 def _time(rcvr):
     from som.vmobjects.integer import Integer
     since_start = time.time() - get_current().start_time
-    return Integer(int(since_start * 1000))
+    return Integer.box(int(since_start * 1000))
 
 
 def _ticks(rcvr):
     from som.vmobjects.integer import Integer
     since_start = time.time() - get_current().start_time
-    return Integer(int(since_start * 1000000))
+    return Integer.box(int(since_start * 1000000))
 
 
 @jit.dont_look_inside
@@ -0,0 +1,124 @@
+"""
+Helpers to write and read the binary files of the VM, i.e., the class cache
+and heap images.
+"""
+import os
+
+from rlib.string_stream import encode_to_bytes, decode_from_bytes
+
+
+class CorruptData(Exception):
+    pass
+
+
+class BinaryWriter(object):
+
+    def __init__(self):
+        self._parts = []
+
+    def get_data(self):
+        return "".join(self._parts)
+
+    def write_char(self, char):
+        self._parts.append(char)
+
+    def write_uint(self, value):
+        # variable length encoding, 7 bits per byte
+        assert value >= 0
+        while value >= 0x80:
+            self._parts.append(chr((value & 0x7F) | 0x80))
+            value >>= 7
+        self._parts.append(chr(value))
+
+    def write_int(self, value):
+        if value < 0:
+            self.write_char("-")
+            self.write_uint(-value)
+        else:
+            self.write_char("+")
+            self.write_uint(value)
+
+    def write_raw(self, string):
+        self._parts.append(string)
+
+    def write_str(self, string):
+        self.write_uint(len(string))
+        self._parts.append(string)
+
+
+class BinaryReader(object):
+
+    def __init__(self, data):
+        self._data = data
+        self._pos  = 0
+
+    def read_char(self):
+        if self._pos >= len(self._data):
+            raise CorruptData()
+        char = self._data[self._pos]
+        self._pos += 1
+        return char
+
+    def read_uint(self):
+        value = 0
+        shift = 0
+        while True:
+            byte = ord(self.read_char())
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+            if shift > 63:
+                raise CorruptData()
+
+    def read_int(self):
+        sign = self.read_char()
+        value = self.read_uint()
+        if sign == "-":
+            return -value
+        return value
+
+    def read_raw(self, length):
+        start = self._pos
+        end = start + length
+        if end > len(self._data):
+            raise CorruptData()
+        self._pos = end
+        return self._data[start:end]
+
+    def read_str(self):
+        return self.read_raw(self.read_uint())
+
+
+def string_hash(string):
+    """ FNV-1a, as the hash needs to be stable across VM runs """
+    h = 0x811c9dc5
+    for c in string:
+        h = ((h ^ ord(c)) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def read_file(file_name):
+    fd = os.open(file_name, os.O_RDONLY, 0o777)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return decode_from_bytes(b"".join(chunks))
+
+
+def write_file(file_name, data):
+    """ Write to a temporary file first, so that concurrently started VMs
+        never see a partially written file """
+    tmp_file = file_name + ".tmp" + str(os.getpid())
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, encode_to_bytes(data))
+    finally:
+        os.close(fd)
+    os.rename(tmp_file, file_name)
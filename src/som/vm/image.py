@@ -0,0 +1,494 @@
+"""
+A heap image is a snapshot of a bootstrapped universe, i.e., of its symbols,
+globals, classes with their methods, and the objects reachable from them.
+Booting from an image avoids parsing and assembling the system classes.
+
+Primitives are not stored, but reinstalled when the image is loaded.
+"""
+from som.vm.binary_data import (BinaryReader, BinaryWriter, CorruptData,
+                                read_file, write_file)
+from som.vm.globals import nilObject, trueObject, falseObject
+from som.vmobjects.array_strategy import Array
+from som.vmobjects.biginteger import BigInteger
+from som.vmobjects.block_bc import BcBlock, block_evaluation_primitive
+from som.vmobjects.clazz import Class
+from som.vmobjects.double import Double
+from som.vmobjects.hash_map import HashMap
+from som.vmobjects.integer import Integer
+from som.vmobjects.method_bc import BcMethod
+from som.vmobjects.object_with_layout import ObjectWithLayout
+from som.vmobjects.object_without_fields import ObjectWithoutFields
+from som.vmobjects.primitive import AbstractPrimitive, empty_primitive
+from som.vmobjects.string import String
+from som.vmobjects.symbol import Symbol
+
+from rlib.arithmetic import bigint_from_str, bigint_to_str, float_to_str
+
+
+# needs to be changed whenever the format or the bytecode set changes
+_MAGIC   = "SOMi"
+_VERSION = 10
+
+# objects without references to other objects
+_SYMBOL  = "y"
+_STRING  = "s"
+_INTEGER = "i"
+_BIGINT  = "b"
+_DOUBLE  = "d"
+
+# objects with references, allocated first and filled in afterwards
+_NIL       = "n"
+_TRUE      = "t"
+_FALSE     = "f"
+_CLASS     = "c"
+_OBJECT    = "o"
+_OBJECT_WITHOUT_FIELDS = "w"
+_ARRAY     = "a"
+_METHOD    = "m"
+_BLOCK     = "k"
+_PRIMITIVE = "p"
+
+
+class ImageError(Exception):
+
+    def __init__(self, message):
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+def write_image(universe, file_name):
+    writer = _ImageWriter(universe)
+    writer.write_image()
+    try:
+        write_file(file_name, writer.get_data())
+    except OSError:
+        raise ImageError("Could not write image file " + file_name)
+
+
+def read_image(universe, file_name):
+    """ Initialize the universe from the image and return the system
+        object """
+    try:
+        data = read_file(file_name)
+    except OSError:
+        raise ImageError("Could not read image file " + file_name)
+
+    try:
+        return _ImageReader(data, universe).read_image()
+    except CorruptData:
+        raise ImageError("Image file " + file_name + " is corrupt")
+
+
+def _is_value(obj):
+    return (isinstance(obj, String) or isinstance(obj, Integer) or
+            isinstance(obj, BigInteger) or isinstance(obj, Double))
+
+
+def _roots(universe):
+    return [universe.objectClass, universe.classClass,
+            universe.metaclassClass, universe.nilClass,
+            universe.integerClass, universe.arrayClass,
+            universe.methodClass, universe.symbolClass,
+            universe.primitiveClass, universe.systemClass,
+            universe.blockClass, universe.stringClass,
+            universe.doubleClass]
+
+
+class _ImageWriter(BinaryWriter):
+
+    def __init__(self, universe):
+        BinaryWriter.__init__(self)
+        self._universe   = universe
+        self._indexes    = {}
+        self._values     = []
+        self._composites = []
+        self._worklist   = []
+        self._references = {}
+
+    def _add(self, obj):
+        if obj in self._indexes:
+            return
+        self._indexes[obj] = -1
+        if _is_value(obj):
+            self._values.append(obj)
+        else:
+            self._composites.append(obj)
+            self._worklist.append(obj)
+
+    def _collect(self):
+        u = self._universe
+        for symbol in u.get_symbols():
+            self._add(symbol)
+        for obj in _roots(u):
+            self._add(obj)
+        for obj in u.blockClasses:
+            self._add(obj)
+        for name, value in u.get_globals():
+            self._add(name)
+            self._add(value)
+        self._add(nilObject)
+        self._add(trueObject)
+        self._add(falseObject)
+
+        # references are determined only once, because unboxed fields and
+        # array elements are boxed anew on every read
+        while self._worklist:
+            obj = self._worklist.pop()
+            references = self._references_of(obj)
+            self._references[obj] = references
+            for referenced in references:
+                self._add(referenced)
+
+        # values are read first, so that the allocation of the other
+        # objects can refer to them
+        i = 0
+        for obj in self._values:
+            self._indexes[obj] = i
+            i += 1
+        for obj in self._composites:
+            self._indexes[obj] = i
+            i += 1
+
+    def _references_of(self, obj):
+        u = self._universe
+        if isinstance(obj, Class):
+            return ([obj.get_class(u)] + _fields_of(obj) +
+                    [obj.get_name(), obj.get_super_class(),
+                     obj.get_instance_fields(), obj.get_instance_invokables()])
+        if isinstance(obj, ObjectWithLayout):
+            return [obj.get_class(u)] + _fields_of(obj)
+        if isinstance(obj, ObjectWithoutFields) and not isinstance(obj, HashMap):
+            return [obj.get_class(u)]
+        if isinstance(obj, Array):
+            return obj.as_argument_array()
+        if isinstance(obj, BcMethod):
+            return ([obj.get_signature()] +
+                    [obj.get_literal(i)
+                     for i in range(obj.get_number_of_literals())])
+        if isinstance(obj, AbstractPrimitive):
+            return [obj.get_signature()]
+        if isinstance(obj, BcBlock) and obj.get_context() is None:
+            # the preallocated block of a clean block
+            return [obj.get_method()]
+        raise ImageError("Objects of class " +
+                         obj.get_class(u).get_name().get_embedded_string() +
+                         " cannot be stored in an image")
+
+    def _write_ref(self, obj):
+        self.write_uint(self._indexes[obj])
+
+    def _write_refs(self, objs):
+        self.write_uint(len(objs))
+        for obj in objs:
+            self._write_ref(obj)
+
+    def write_image(self):
+        self._collect()
+
+        self.write_raw(_MAGIC)
+        self.write_uint(_VERSION)
+
+        self.write_uint(len(self._values))
+        for obj in self._values:
+            self._write_value(obj)
+
+        self.write_uint(len(self._composites))
+        for obj in self._composites:
+            self._write_allocation(obj)
+        for obj in self._composites:
+            self._write_content(obj)
+
+        u = self._universe
+        self._write_refs(_roots(u))
+        self._write_refs(u.blockClasses)
+
+        globals_ = u.get_globals()
+        self.write_uint(len(globals_))
+        for name, value in globals_:
+            self._write_ref(name)
+            self._write_ref(value)
+
+    def _write_value(self, obj):
+        if isinstance(obj, Symbol):
+            self.write_char(_SYMBOL)
+            self.write_str(obj.get_embedded_string())
+        elif isinstance(obj, String):
+            self.write_char(_STRING)
+            self.write_str(obj.get_embedded_string())
+        elif isinstance(obj, Integer):
+            self.write_char(_INTEGER)
+            self.write_int(obj.get_embedded_integer())
+        elif isinstance(obj, BigInteger):
+            self.write_char(_BIGINT)
+            self.write_str(bigint_to_str(obj.get_embedded_biginteger()))
+        else:
+            assert isinstance(obj, Double)
+            self.write_char(_DOUBLE)
+            self.write_str(float_to_str(obj.get_embedded_double()))
+
+    def _write_allocation(self, obj):
+        if obj is nilObject:
+            self.write_char(_NIL)
+        elif obj is trueObject:
+            self.write_char(_TRUE)
+        elif obj is falseObject:
+            self.write_char(_FALSE)
+        elif isinstance(obj, Class):
+            self.write_char(_CLASS)
+            self.write_uint(obj.get_number_of_fields())
+        elif isinstance(obj, ObjectWithLayout):
+            self.write_char(_OBJECT)
+            self.write_uint(obj.get_number_of_fields())
+        elif isinstance(obj, ObjectWithoutFields):
+            self.write_char(_OBJECT_WITHOUT_FIELDS)
+        elif isinstance(obj, Array):
+            self.write_char(_ARRAY)
+            self.write_uint(obj.get_number_of_indexable_fields())
+        elif isinstance(obj, BcMethod):
+            self.write_char(_METHOD)
+            self._write_ref(obj.get_signature())
+            self.write_uint(obj.get_number_of_locals())
+            self.write_uint(obj.get_maximum_number_of_stack_elements())
+            self.write_uint(1 if obj.creates_blocks() else 0)
+            self.write_uint(obj.get_number_of_context_values())
+            captured_args = obj.get_captured_arguments()
+            self.write_uint(len(captured_args))
+            for arg_idx in captured_args:
+                self.write_uint(arg_idx)
+            self.write_uint(obj.get_number_of_send_sites())
+            self.write_uint(obj.get_number_of_field_sites())
+            self.write_uint(obj.get_number_of_global_sites())
+            num_bytecodes = obj.get_number_of_bytecodes()
+            self.write_uint(num_bytecodes)
+            for i in range(num_bytecodes):
+                self.write_char(chr(obj.get_bytecode(i)))
+            self.write_uint(obj.get_number_of_literals())
+        elif isinstance(obj, BcBlock):
+            self.write_char(_BLOCK)
+        else:
+            assert isinstance(obj, AbstractPrimitive)
+            self.write_char(_PRIMITIVE)
+            self._write_ref(obj.get_signature())
+
+    def _write_content(self, obj):
+        for referenced in self._references[obj]:
+            self._write_ref(referenced)
+
+
+def _fields_of(obj):
+    return [obj.get_field(i) for i in range(obj.get_number_of_fields())]
+
+
+class _ImageReader(BinaryReader):
+
+    def __init__(self, data, universe):
+        BinaryReader.__init__(self, data)
+        self._universe = universe
+        self._objects  = []
+
+        # literal lists of the methods, filled in after allocation
+        self._literals = []
+        self._next_literals = 0
+        self._objects_with_fields = []
+        self._field_values = []
+
+    def _read_ref(self):
+        index = self.read_uint()
+        if index >= len(self._objects):
+            raise CorruptData()
+        return self._objects[index]
+
+    def _read_symbol_ref(self):
+        symbol = self._read_ref()
+        if not isinstance(symbol, Symbol):
+            raise CorruptData()
+        return symbol
+
+    def _read_class_ref(self):
+        clazz = self._read_ref()
+        if not isinstance(clazz, Class):
+            raise CorruptData()
+        return clazz
+
+    def _read_array_ref(self):
+        array = self._read_ref()
+        if not isinstance(array, Array):
+            raise CorruptData()
+        return array
+
+    def read_image(self):
+        if self.read_raw(len(_MAGIC)) != _MAGIC:
+            raise CorruptData()
+        if self.read_uint() != _VERSION:
+            raise ImageError("Image was written by an incompatible VM version")
+
+        for _ in range(self.read_uint()):
+            self._objects.append(self._read_value())
+
+        first_composite = len(self._objects)
+        for _ in range(self.read_uint()):
+            self._objects.append(self._read_allocation())
+
+        classes = []
+        invokables = []
+        for i in range(first_composite, len(self._objects)):
+            obj = self._objects[i]
+            self._read_content(obj)
+            if isinstance(obj, Class):
+                classes.append(obj)
+                invokables.append(self._read_array_ref())
+
+        # invokables are installed once all arrays are complete
+        for i in range(len(classes)):
+            classes[i].set_instance_invokables(invokables[i])
+
+        # fields are set once all classes know the layout of their instances
+        for i in range(len(self._objects_with_fields)):
+            self._set_fields(self._objects_with_fields[i],
+                             self._field_values[i])
+
+        self._read_universe()
+        self._install_primitives(classes)
+
+        return self._universe.get_global(self._universe.symbol_for("system"))
+
+    def _read_value(self):
+        tag = self.read_char()
+        if tag == _SYMBOL:
+            return self._universe.symbol_for(self.read_str())
+        if tag == _STRING:
+            return String(self.read_str())
+        if tag == _INTEGER:
+            return Integer.box(self.read_int())
+        if tag == _BIGINT:
+            return BigInteger(bigint_from_str(self.read_str()))
+        if tag == _DOUBLE:
+            return Double(float(self.read_str()))
+        raise CorruptData()
+
+    def _read_allocation(self):
+        tag = self.read_char()
+        if tag == _NIL:
+            return nilObject
+        if tag == _TRUE:
+            return trueObject
+        if tag == _FALSE:
+            return falseObject
+        if tag == _CLASS:
+            return Class(self._universe, self.read_uint(), None)
+        if tag == _OBJECT:
+            return ObjectWithLayout(None, self.read_uint())
+        if tag == _OBJECT_WITHOUT_FIELDS:
+            return ObjectWithoutFields(None)
+        if tag == _ARRAY:
+            return Array.from_size(self.read_uint())
+        if tag == _METHOD:
+            signature  = self._read_symbol_ref()
+            num_locals = self.read_uint()
+            max_stack  = self.read_uint()
+            creates_blocks = self.read_uint() != 0
+            num_context_values = self.read_uint()
+            captured_args = [self.read_uint() for _ in range(self.read_uint())]
+            num_send_sites   = self.read_uint()
+            num_field_sites  = self.read_uint()
+            num_global_sites = self.read_uint()
+            bytecodes  = self.read_str()
+            literals   = [nilObject] * self.read_uint()
+            method = BcMethod(literals, num_locals, max_stack, len(bytecodes),
+                              signature, num_send_sites, num_field_sites,
+                              num_global_sites)
+            method.set_creates_blocks(creates_blocks)
+            method.set_context_layout(num_context_values, captured_args)
+            for i in range(len(bytecodes)):
+                method.set_bytecode(i, ord(bytecodes[i]))
+            self._literals.append(literals)
+            return method
+        if tag == _BLOCK:
+            return BcBlock(None, None)
+        if tag == _PRIMITIVE:
+            signature = self._read_symbol_ref()
+            return empty_primitive(signature.get_embedded_string(),
+                                   self._universe)
+        raise CorruptData()
+
+    def _read_content(self, obj):
+        if isinstance(obj, Class):
+            obj.set_class(self._read_class_ref())
+            self._read_fields(obj)
+            obj.set_name(self._read_symbol_ref())
+            obj.set_super_class(self._read_ref())
+            obj.set_instance_fields(self._read_array_ref())
+        elif isinstance(obj, ObjectWithLayout):
+            obj.set_class(self._read_class_ref())
+            self._read_fields(obj)
+        elif isinstance(obj, ObjectWithoutFields):
+            obj.set_class(self._read_class_ref())
+        elif isinstance(obj, Array):
+            for i in range(obj.get_number_of_indexable_fields()):
+                obj.set_indexable_field(i, self._read_ref())
+        elif isinstance(obj, BcMethod):
+            self._read_symbol_ref()
+            literals = self._literals[self._next_literals]
+            self._next_literals += 1
+            for i in range(len(literals)):
+                literals[i] = self._read_ref()
+        elif isinstance(obj, BcBlock):
+            method = self._read_ref()
+            if not isinstance(method, BcMethod):
+                raise CorruptData()
+            obj.set_method(method)
+        else:
+            assert isinstance(obj, AbstractPrimitive)
+            self._read_symbol_ref()
+
+    def _read_fields(self, obj):
+        self._objects_with_fields.append(obj)
+        self._field_values.append([self._read_ref()
+                                   for _ in range(obj.get_number_of_fields())])
+
+    @staticmethod
+    def _set_fields(obj, values):
+        layout = obj.get_class(None).get_layout_for_instances()
+        if layout is None or layout.get_number_of_fields() != len(values):
+            raise CorruptData()
+        obj.update_layout_to_match_class()
+        for i in range(len(values)):
+            obj.set_field(i, values[i])
+
+    def _read_universe(self):
+        u = self._universe
+        if self.read_uint() != len(_roots(u)):
+            raise CorruptData()
+        u.objectClass    = self._read_class_ref()
+        u.classClass     = self._read_class_ref()
+        u.metaclassClass = self._read_class_ref()
+        u.nilClass       = self._read_class_ref()
+        u.integerClass   = self._read_class_ref()
+        u.arrayClass     = self._read_class_ref()
+        u.methodClass    = self._read_class_ref()
+        u.symbolClass    = self._read_class_ref()
+        u.primitiveClass = self._read_class_ref()
+        u.systemClass    = self._read_class_ref()
+        u.blockClass     = self._read_class_ref()
+        u.stringClass    = self._read_class_ref()
+        u.doubleClass    = self._read_class_ref()
+
+        u.blockClasses = [self._read_class_ref()
+                          for _ in range(self.read_uint())]
+
+        for _ in range(self.read_uint()):
+            name = self._read_symbol_ref()
+            u.set_global(name, self._read_ref())
+
+    def _install_primitives(self, classes):
+        u = self._universe
+        for clazz in classes:
+            if (clazz.get_class(u) is not u.metaclassClass and
+                    clazz.has_primitives()):
+                clazz.load_primitives(False)
+
+        for i in range(1, len(u.blockClasses)):
+            u.blockClasses[i].add_instance_primitive(
+                block_evaluation_primitive(i, u), False)
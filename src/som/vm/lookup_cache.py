@@ -0,0 +1,42 @@
+from rlib.objectmodel import compute_identity_hash
+
+
+class LookupCache(object):
+    """ A VM-wide cache mapping (class, selector) to the invokable found by
+        the method lookup. It has a fixed number of entries, which are
+        evicted by later lookups mapping to the same entry. Entries are only
+        valid for the version of the class they were stored for. """
+
+    # number of entries, needs to be a power of 2
+    DEFAULT_SIZE = 4096
+
+    _immutable_fields_ = ["_classes", "_selectors", "_invokables",
+                          "_versions", "_mask"]
+
+    def __init__(self, size=DEFAULT_SIZE):
+        assert size > 0 and (size & (size - 1)) == 0
+        self._classes    = [None] * size
+        self._selectors  = [None] * size
+        self._invokables = [None] * size
+        self._versions   = [0] * size
+        self._mask       = size - 1
+
+    def _index(self, clazz, selector):
+        return ((compute_identity_hash(clazz) ^ compute_identity_hash(selector))
+                & self._mask)
+
+    def lookup(self, clazz, selector):
+        """ Return the cached invokable, or None on a cache miss """
+        index = self._index(clazz, selector)
+        if (self._classes[index] is clazz and
+                self._selectors[index] is selector and
+                self._versions[index] == clazz.get_version()):
+            return self._invokables[index]
+        return None
+
+    def store(self, clazz, selector, invokable):
+        index = self._index(clazz, selector)
+        self._classes[index]    = clazz
+        self._selectors[index]  = selector
+        self._invokables[index] = invokable
+        self._versions[index]   = clazz.get_version()
@@ -52,7 +52,7 @@ class _Shell(object):
 class AstShell(_Shell):
 
     def _exec(self, shell_object, shell_method, it):
-        return shell_method.invoke(shell_object, [it])
+        return shell_method.invoke1(shell_object, it)
 
 
 class BcShell(_Shell):
@@ -1,3 +1,4 @@
+from rlib.arithmetic import string_to_int, ParseStringOverflowError
 from rlib.debug import make_sure_not_resized
 from rlib import jit
 from rlib.string_stream import encode_to_bytes
@@ -10,22 +11,25 @@ from som.interpreter.bc.frame import create_bootstrap_frame
 from som.interp_type import is_ast_interpreter
 
 if is_ast_interpreter():
-    from som.vmobjects.object_with_layout import ObjectWithLayout as Object
-    from som.vmobjects.array_strategy     import Array
     from som.vmobjects.block_ast          import block_evaluation_primitive
     from som.vm.shell                     import AstShell
+    from som.interpreter.ast.nodes.dispatch import split_budget
 else:
-    from som.vmobjects.object   import Object
-    from som.vmobjects.array    import Array
     from som.vmobjects.block_bc import block_evaluation_primitive
     from som.vm.shell           import BcShell
+    from som.compiler.bc.class_cache import ClassCache
+    from som.vm.image import ImageError, read_image, write_image
 
+from som.vmobjects.array_strategy import Array
+from som.vmobjects.integer       import boxing_statistics
+from som.vmobjects.object_with_layout import ObjectWithLayout as Object
 from som.vmobjects.clazz         import Class
 from som.vmobjects.object_without_fields import ObjectWithoutFields
 from som.vmobjects.symbol        import Symbol
 from som.vmobjects.string        import String
 
 from som.vm.globals import nilObject, trueObject, falseObject
+from som.vm.lookup_cache import LookupCache
 
 import som.compiler.sourcecode_compiler as sourcecode_compiler
 
@@ -74,11 +78,14 @@ class Universe(object):
             "doubleClass",
             "_symbol_table",
             "_globals",
+            "_lookup_cache",
             "_object_system_initialized"]
 
     def __init__(self, avoid_exit = False):
         self._symbol_table   = {}
         self._globals        = {}
+        self._lookup_cache   = LookupCache()
+        self._class_cache    = None
 
         self.objectClass    = None
         self.classClass     = None
@@ -99,16 +106,28 @@ class Universe(object):
         self._last_exit_code = 0
         self._avoid_exit     = avoid_exit
         self._dump_bytecodes = False
+        self._precompile     = False
+        self._image_to_load  = None
+        self._image_to_save  = None
         self.classpath       = None
         self.start_time      = time.time()  # a float of the time in seconds
         self._object_system_initialized = False
 
     def exit(self, error_code):
+        if boxing_statistics.is_enabled():
+            self._print_boxing_statistics()
         if self._avoid_exit:
             self._last_exit_code = error_code
         else:
             raise Exit(error_code)
 
+    @staticmethod
+    def _print_boxing_statistics():
+        error_println("Integer boxing: " + str(boxing_statistics.hits) +
+                      " cache hits, " + str(boxing_statistics.misses) +
+                      " misses, hit rate " +
+                      str(int(boxing_statistics.hit_rate() * 100)) + "%")
+
     def last_exit_code(self):
         return self._last_exit_code
 
@@ -131,7 +150,15 @@ class Universe(object):
         arguments = self.handle_arguments(arguments)
 
         # Initialize the known universe
-        system_object = self._initialize_object_system()
+        if self._image_to_load is not None:
+            system_object = self._load_image(self._image_to_load)
+        else:
+            system_object = self._initialize_object_system()
+
+        if self._precompile:
+            return self._precompile_classpath()
+        if self._image_to_save is not None:
+            return self._save_image(self._image_to_save, arguments)
 
         # Start the shell if no filename is given
         if len(arguments) == 0:
@@ -147,14 +174,52 @@ class Universe(object):
 
         i = 0
         while i < len(arguments):
-            if arguments[i] == "-cp":
+            if is_ast_interpreter() and arguments[i] in [
+                    "-cpc", "-cache", "-nocache", "-image", "-saveimage"]:
+                error_println("Option " + arguments[i] + " is only supported"
+                              + " by the bytecode interpreter.")
+                self._print_usage_and_exit()
+            elif arguments[i] == "-cp":
+                if i + 1 >= len(arguments):
+                    self._print_usage_and_exit()
+                self.setup_classpath(arguments[i + 1])
+                i += 1    # skip class path
+                got_classpath = True
+            elif arguments[i] == "-cpc":
                 if i + 1 >= len(arguments):
                     self._print_usage_and_exit()
                 self.setup_classpath(arguments[i + 1])
                 i += 1    # skip class path
                 got_classpath = True
+                self._precompile = True
+            elif arguments[i] == "-cache":
+                if i + 1 >= len(arguments):
+                    self._print_usage_and_exit()
+                if self._class_cache:
+                    self._class_cache.set_cache_dir(arguments[i + 1])
+                i += 1    # skip cache directory
+            elif arguments[i] == "-image":
+                if i + 1 >= len(arguments):
+                    self._print_usage_and_exit()
+                self._image_to_load = arguments[i + 1]
+                i += 1    # skip image file
+            elif arguments[i] == "-saveimage":
+                if i + 1 >= len(arguments):
+                    self._print_usage_and_exit()
+                self._image_to_save = arguments[i + 1]
+                i += 1    # skip image file
+            elif arguments[i] == "-nocache":
+                if self._class_cache:
+                    self._class_cache.disable()
             elif arguments[i] == "-d":
                 self._dump_bytecodes = True
+            elif arguments[i] == "-boxstats":
+                boxing_statistics.enable()
+            elif arguments[i] == "-splitbudget" and is_ast_interpreter():
+                if i + 1 >= len(arguments):
+                    self._print_usage_and_exit()
+                split_budget.set_budget(self._parse_split_budget(arguments[i + 1]))
+                i += 1    # skip budget
             elif arguments[i] in ["-h", "--help", "-?"]:
                 self._print_usage_and_exit()
             else:
@@ -178,6 +243,46 @@ class Universe(object):
 
         return remaining_args
 
+    def _parse_split_budget(self, value):
+        if value.isdigit():
+            try:
+                return string_to_int(value)
+            except ParseStringOverflowError:
+                pass
+        self._print_usage_and_exit()
+        return split_budget.get_remaining()
+
+    def _precompile_classpath(self):
+        """ Load all classes on the class path, which stores them in the
+            class cache """
+        if self._class_cache is None or not self._class_cache.is_enabled():
+            error_println("-cpc needs a cache directory, given with -cache.")
+            self.exit(1)
+            return None
+        for cp_entry in self.classpath:
+            try:
+                file_names = os.listdir(cp_entry)
+            except OSError:
+                continue
+            for file_name in file_names:
+                _, class_name, ext = path_split(file_name)
+                if ext == "som":
+                    self.load_class(self.symbol_for(class_name))
+        return None
+
+    def _load_image(self, file_name):
+        error_println("Images are only supported by the bytecode interpreter.")
+        self.exit(1)
+        return None
+
+    def _save_image(self, file_name, class_names):
+        error_println("Images are only supported by the bytecode interpreter.")
+        self.exit(1)
+        return None
+
+    def get_class_cache(self):
+        return self._class_cache
+
     def setup_classpath(self, cp):
         self.classpath = cp.split(os.pathsep)
 
@@ -198,7 +303,27 @@ class Universe(object):
         std_println("where options include:                                   ")
         std_println("    -cp <directories separated by " + os.pathsep     + ">")
         std_println("        set search path for application classes")
+        if not is_ast_interpreter():
+            std_println("    -cpc <directories separated by " + os.pathsep + ">")
+            std_println("        set search path and precompile all classes in it")
+            std_println("    -cache <directory>")
+            std_println("        store precompiled classes in the given directory,")
+            std_println("        without it, classes are not cached")
+            std_println("    -nocache")
+            std_println("        neither use nor store precompiled classes")
+            std_println("    -image <file>")
+            std_println("        start from the given image instead of loading the")
+            std_println("        system classes")
+            std_println("    -saveimage <file>")
+            std_println("        load the classes given as arguments and save the")
+            std_println("        resulting image to the given file")
         std_println("    -d  enable disassembling")
+        std_println("    -boxstats")
+        std_println("        print the hit rate of the small integer cache on exit")
+        if is_ast_interpreter():
+            std_println("    -splitbudget <nodes>")
+            std_println("        number of AST nodes that may be created by copying")
+            std_println("        methods for their call sites, 0 disables splitting")
         std_println("    -h  print this help")
 
         # Exit
@@ -276,6 +401,7 @@ class Universe(object):
         self.set_global(self.symbol_for("Block"),  self.blockClass)
 
         self.set_global(self.symbol_for("Nil"),    self.nilClass)
+        self.set_global(self.symbol_for("HashMap"), self._load_hash_map_class())
 
         self.set_global( trueClassName,  trueClass)
         self.set_global(falseClassName, falseClass)
@@ -300,6 +426,9 @@ class Universe(object):
         result = self._new_symbol(string)
         return result
 
+    def get_symbols(self):
+        return self._symbol_table.values()
+
     @staticmethod
     def new_array_with_length(length):
         return Array.from_size(length)
@@ -404,6 +533,14 @@ class Universe(object):
             self._globals[name] = assoc
         return assoc
 
+    def get_globals(self):
+        """ Return a list of name, value pairs of all globals """
+        return [(name, assoc.get_value())
+                for name, assoc in self._globals.items()]
+
+    def get_lookup_cache(self):
+        return self._lookup_cache
+
     def _get_block_class(self, number_of_arguments):
         return self.blockClasses[number_of_arguments]
 
@@ -437,6 +574,29 @@ class Universe(object):
         self.set_global(name, result)
         return result
 
+    def _load_hash_map_class(self):
+        """ HashMap is implemented by the VM. Without a HashMap.som on the
+            class path, the class only has the primitive methods. """
+        name = self.symbol_for("HashMap")
+        result = self._load_class(name, None)
+        if result is not None:
+            self._load_primitives(result, True)
+            return result
+
+        result_class = self.new_class(self.metaclassClass)
+        result_class.set_instance_fields(self.new_array_with_length(0))
+        result_class.set_instance_invokables(self.new_array_with_length(0))
+        result_class.set_name(self.symbol_for("HashMap class"))
+        result_class.set_super_class(self.objectClass.get_class(self))
+
+        result = self.new_class(result_class)
+        result.set_name(name)
+        result.set_super_class(self.objectClass)
+        result.set_instance_fields(self.new_array_with_length(0))
+        result.set_instance_invokables(self.new_array_with_length(0))
+        result.load_primitives(False)
+        return result
+
     @staticmethod
     def _load_primitives(clazz, is_system_class):
         if not clazz: return
@@ -493,10 +653,10 @@ class _ASTUniverse(Universe):
         return shell.start()
 
     def _start_execution(self, system_object, initialize, arguments_array):
-        return initialize.invoke(system_object, [arguments_array])
+        return initialize.invoke1(system_object, arguments_array)
 
     def _start_method_execution(self, clazz, invokable):
-        return invokable.invoke(clazz, [])
+        return invokable.invoke0(clazz)
 
 
 class _BCUniverse(Universe):
@@ -504,6 +664,7 @@ class _BCUniverse(Universe):
     def __init__(self, avoid_exit = False):
         self._interpreter = Interpreter(self)
         Universe.__init__(self, avoid_exit)
+        self._class_cache = ClassCache(self)
 
     def get_interpreter(self):
         return self._interpreter
@@ -531,6 +692,31 @@ class _BCUniverse(Universe):
         self._interpreter.initialize_known_quick_sends()
         return system_object
 
+    def _load_image(self, file_name):
+        try:
+            system_object = read_image(self, file_name)
+        except ImageError as e:
+            error_println(str(e))
+            self.exit(1)
+            return None
+
+        self._interpreter.initialize_known_quick_sends()
+        self._object_system_initialized = True
+        return system_object
+
+    def _save_image(self, file_name, class_names):
+        for class_name in class_names:
+            if self.load_class(self.symbol_for(class_name)) is None:
+                error_println("Class " + class_name + " could not be loaded.")
+                self.exit(1)
+                return None
+        try:
+            write_image(self, file_name)
+        except ImageError as e:
+            error_println(str(e))
+            self.exit(1)
+        return None
+
 
 def create_universe(avoid_exit = False):
     if is_ast_interpreter():
@@ -54,6 +54,12 @@ put_all_bool_driver = JitDriver(greens=['block_method'], reds='auto',
 
 class _ArrayStrategy(object):
 
+    def _transition_to_object_array(self, array, idx, value):
+        new_store = self.as_arguments_array(array._storage)
+        new_store[idx] = value
+        array._storage = _ObjectStrategy.new_storage_with_values(new_store)
+        array._strategy = _obj_strategy
+
     @staticmethod
     def _set_all_with_value(array, value, size):
         if value is nilObject:
@@ -91,7 +97,7 @@ class _ArrayStrategy(object):
 
         # we do the first iteration separately to determine our strategy
         assert i < size
-        first = block_method.invoke(block, [])
+        first = block_method.invoke0(block)
         if first is nilObject:
             _ArrayStrategy._set_remaining_with_block_as_nil(array, block, size,
                                                             1)
@@ -123,7 +129,7 @@ class _ArrayStrategy(object):
         block_method = block.get_method()
         while next_i < size:
             put_all_nil_driver.jit_merge_point(block_method = block_method)
-            result = block_method.invoke(block, [])
+            result = block_method.invoke0(block)
             if result is not nilObject:
                 # ok, fall back, let's go straight to obj strategy
                 # todo: perhaps, partially empty would be better?
@@ -143,14 +149,14 @@ class _ArrayStrategy(object):
         block_method = block.get_method()
         while next_i < size:
             put_all_long_driver.jit_merge_point(block_method = block_method)
-            result = block_method.invoke(block, [])
+            result = block_method.invoke0(block)
             if isinstance(result, Integer):
                 storage[next_i] = result.get_embedded_integer()
             else:
                 # something else, so, let's go to the object strategy
                 new_storage = [None] * size
                 for i in range(0, next_i + 1):
-                    new_storage[i] = Integer(storage[i])
+                    new_storage[i] = Integer.box(storage[i])
                 _ArrayStrategy._set_remaining_with_block_as_obj(array, block,
                                                                 size,
                                                                 next_i + 1,
@@ -165,7 +171,7 @@ class _ArrayStrategy(object):
         block_method = block.get_method()
         while next_i < size:
             put_all_double_driver.jit_merge_point(block_method = block_method)
-            result = block_method.invoke(block, [])
+            result = block_method.invoke0(block)
             if isinstance(result, Double):
                 storage[next_i] = result.get_embedded_double()
             else:
@@ -187,7 +193,7 @@ class _ArrayStrategy(object):
         block_method = block.get_method()
         while next_i < size:
             put_all_bool_driver.jit_merge_point(block_method = block_method)
-            result = block_method.invoke(block, [])
+            result = block_method.invoke0(block)
             if result is trueObject or result is falseObject:
                 storage[next_i] = result is trueObject
             else:
@@ -211,7 +217,7 @@ class _ArrayStrategy(object):
 
         while next_i < size:
             put_all_obj_driver.jit_merge_point(block_method = block_method)
-            storage[next_i] = block_method.invoke(block, [])
+            storage[next_i] = block_method.invoke0(block)
             next_i += 1
 
         array._strategy = _obj_strategy
@@ -293,7 +299,7 @@ class _LongStrategy(_ArrayStrategy):
         store = self._unerase(storage)
         assert isinstance(store, list)
         assert isinstance(store[idx], int_type)
-        return Integer(store[idx])
+        return Integer.box(store[idx])
 
     def set_idx(self, array, idx, value):
         assert isinstance(array, Array)
@@ -303,16 +309,6 @@ class _LongStrategy(_ArrayStrategy):
         else:
             self._transition_to_object_array(array, idx, value)
 
-    def _transition_to_object_array(self, array, idx, value):
-        store = self._unerase(array._storage)
-        new_store = [None] * len(store)
-        for i, v in enumerate(store):
-            new_store[i] = Integer(v)
-
-        new_store[idx] = value
-        array._storage = _ObjectStrategy.new_storage_with_values(new_store)
-        array._strategy = _obj_strategy
-
     def set_all(self, array, value):
         assert isinstance(array, Array)
 
@@ -332,7 +328,7 @@ class _LongStrategy(_ArrayStrategy):
 
     def as_arguments_array(self, storage):
         store = self._unerase(storage)
-        return [Integer(v) for v in store]
+        return [Integer.box(v) for v in store]
 
     def get_size(self, storage):
         return len(self._unerase(storage))
@@ -383,9 +379,11 @@ class _DoubleStrategy(_ArrayStrategy):
 
     def set_idx(self, array, idx, value):
         assert isinstance(array, Array)
-        assert isinstance(value, Double)
-        store = self._unerase(array._storage)
-        store[idx] = value.get_embedded_double()
+        if isinstance(value, Double):
+            store = self._unerase(array._storage)
+            store[idx] = value.get_embedded_double()
+        else:
+            self._transition_to_object_array(array, idx, value)
 
     def set_all(self, array, value):
         assert isinstance(array, Array)
@@ -459,9 +457,11 @@ class _BoolStrategy(_ArrayStrategy):
 
     def set_idx(self, array, idx, value):
         assert isinstance(array, Array)
-        assert value is trueObject or value is falseObject
-        store = self._unerase(array._storage)
-        store[idx] = value is trueObject
+        if value is trueObject or value is falseObject:
+            store = self._unerase(array._storage)
+            store[idx] = value is trueObject
+        else:
+            self._transition_to_object_array(array, idx, value)
 
     def set_all(self, array, value):
         assert isinstance(array, Array)
@@ -531,7 +531,7 @@ class _EmptyStrategy(_ArrayStrategy):
 
     def _erase(self, anInt):
         assert isinstance(anInt, int)
-        return self.__erase(Integer(anInt))
+        return self.__erase(Integer.box(anInt))
 
     def _unerase(self, storage):
         return self.__unerase(storage).get_embedded_integer()
@@ -100,7 +100,7 @@ class BigInteger(AbstractObject):
 
     def prim_as_32_bit_signed_value(self):
         from .integer import Integer
-        return Integer(self._embedded_biginteger.digit(0))
+        return Integer.box(self._embedded_biginteger.digit(0))
 
     def prim_max(self, right):
         if isinstance(right, BigInteger):
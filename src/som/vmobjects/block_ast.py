@@ -76,6 +76,22 @@ class AstBlock(AbstractObject):
                                universe, invoke)
             self._number_of_arguments = num_args
 
+        def invoke0(self, rcvr):
+            assert isinstance(rcvr, AstBlock)
+            return rcvr.get_method().invoke0(rcvr)
+
+        def invoke1(self, rcvr, arg1):
+            assert isinstance(rcvr, AstBlock)
+            return rcvr.get_method().invoke1(rcvr, arg1)
+
+        def invoke2(self, rcvr, arg1, arg2):
+            assert isinstance(rcvr, AstBlock)
+            return rcvr.get_method().invoke2(rcvr, arg1, arg2)
+
+        def invoke3(self, rcvr, arg1, arg2, arg3):
+            assert isinstance(rcvr, AstBlock)
+            return rcvr.get_method().invoke3(rcvr, arg1, arg2, arg3)
+
         @staticmethod
         def _compute_signature_string(num_args):
             # Compute the signature string
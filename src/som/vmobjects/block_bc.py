@@ -17,6 +17,10 @@ class BcBlock(AbstractObject):
     def get_method(self):
         return jit.promote(self._method)
 
+    def set_method(self, method):
+        # only used while reading an image
+        self._method = method
+
     def get_context(self):
         return self._context
 
@@ -58,7 +62,7 @@ def block_evaluate(block, interpreter, frame):
 
     result = interpreter.interpret(method, new_frame)
     frame.pop_old_arguments_and_push_result(method, result)
-    new_frame.clear_previous_frame()
+    new_frame.mark_as_no_longer_on_stack()
 
 
 def _invoke(ivkbl, frame, interpreter):
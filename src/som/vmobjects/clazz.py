@@ -1,24 +1,20 @@
 from rlib import jit
-from som.interp_type import is_ast_interpreter
 from som.vm.globals import nilObject
 
-if is_ast_interpreter():
-    from som.vmobjects.object_with_layout import ObjectWithLayout as Object
-    from som.vmobjects.array_strategy import Array
-    from som.interpreter.objectstorage.object_layout import ObjectLayout
-else:
-    from som.vmobjects.object import Object
-    from som.vmobjects.array import Array
+from som.vmobjects.array_strategy import Array
+from som.vmobjects.object_with_layout import ObjectWithLayout as Object
+from som.interpreter.objectstorage.object_layout import ObjectLayout
 
 
-class _Class(Object):
+class Class(Object):
 
     _immutable_fields_ = ["_super_class"
                           "_name",
                           "_instance_fields"
                           "_instance_invokables",
-                          "_invokables_table",
-                          "_universe"]
+                          "_universe",
+                          "_layout_for_instances?",
+                          "_version?"]
 
     def __init__(self, universe, number_of_fields=Object.NUMBER_OF_OBJECT_FIELDS, obj_class=None):
         Object.__init__(self, obj_class, number_of_fields)
@@ -26,18 +22,37 @@ class _Class(Object):
         self._name        = None
         self._instance_fields = None
         self._instance_invokables = None
-        self._invokables_table = {}
+        self._invokables_index = {}
+        self._subclasses = []
+        self._version  = 0
         self._universe = universe
+        if number_of_fields >= 0:
+            self._layout_for_instances = ObjectLayout(number_of_fields, self)
+            self._number_of_layouts = 1
+        else:
+            self._layout_for_instances = None
+            self._number_of_layouts = 0
 
     def get_super_class(self):
         return self._super_class
 
     def set_super_class(self, value):
+        if self.has_super_class():
+            self._super_class._subclasses.remove(self)
         self._super_class = value
+        if self.has_super_class():
+            value._subclasses.append(self)
 
     def has_super_class(self):
         return self._super_class is not nilObject
 
+    def is_subclass_of(self, clazz):
+        if self is clazz:
+            return True
+        if self.has_super_class():
+            return self.get_super_class().is_subclass_of(clazz)
+        return False
+
     def get_name(self):
         return self._name
 
@@ -50,18 +65,49 @@ class _Class(Object):
     def set_instance_fields(self, value):
         assert isinstance(value, Array)
         self._instance_fields = value
+        if (self._layout_for_instances is None or
+                value.get_number_of_indexable_fields() !=
+                self._layout_for_instances.get_number_of_fields()):
+            self._layout_for_instances = ObjectLayout(
+                value.get_number_of_indexable_fields(), self)
+            self._number_of_layouts = 1
+
+    def get_layout_for_instances(self):
+        return self._layout_for_instances
+
+    def get_number_of_layouts(self):
+        """ The number of layouts the instances of the class had so far """
+        return self._number_of_layouts
+
+    def update_instance_layout_with_initialized_field(self, field_idx,
+                                                      spec_type):
+        updated = self._layout_for_instances.with_initialized_field(field_idx,
+                                                                    spec_type)
+        if updated is not self._layout_for_instances:
+            self._layout_for_instances = updated
+            self._number_of_layouts += 1
+        return self._layout_for_instances
+
+    def update_instance_layout_with_generalized_field(self, field_idx):
+        updated = self._layout_for_instances.with_generalized_field(field_idx)
+        if updated is not self._layout_for_instances:
+            self._layout_for_instances = updated
+            self._number_of_layouts += 1
+        return self._layout_for_instances
 
     def get_instance_invokables(self):
         return self._instance_invokables
 
     def set_instance_invokables(self, value):
         self._instance_invokables = value
+        self._invokables_index = {}
 
         # Make sure this class is the holder of all invokables in the array
         for i in range(0, self.get_number_of_instance_invokables()):
             invokable = self.get_instance_invokable(i)
             assert invokable is not None
             invokable.set_holder(self)
+            self._invokables_index[invokable.get_signature()] = invokable
 
     def get_number_of_instance_invokables(self):
         """ Return the number of instance invokables in this class """
@@ -74,32 +120,46 @@ class _Class(Object):
     def set_instance_invokable(self, index, value):
         # Set this class as the holder of the given invokable
         value.set_holder(self)
+
+        old_signature = self.get_instance_invokable(index).get_signature()
+        del self._invokables_index[old_signature]
+        self._invokables_index[value.get_signature()] = value
+
         self.get_instance_invokables().set_indexable_field(index, value)
 
-    @jit.elidable_promote("all")
     def lookup_invokable(self, signature):
-        # Lookup invokable and return if found
-        invokable = self._invokables_table.get(signature, None)
-        if invokable:
-            return invokable
+        clazz = jit.promote(self)
+        return clazz._lookup_invokable_in_version(signature, clazz._version)
 
-        # Lookup invokable with given signature in array of instance invokables
-        for i in range(0, self.get_number_of_instance_invokables()):
-            invokable = self.get_instance_invokable(i)
-            # Return the invokable if the signature matches
-            if invokable.get_signature() == signature:
-                self._invokables_table[signature] = invokable
-                return invokable
+    @jit.elidable_promote("all")
+    def _lookup_invokable_in_version(self, signature, _version):
+        """ The version is bumped when the lookup result may have changed,
+            so that compiled code does not keep a stale invokable """
+        lookup_cache = self._universe.get_lookup_cache()
+        invokable = lookup_cache.lookup(self, signature)
+        if invokable is None:
+            invokable = self._lookup_invokable_in_hierarchy(signature)
+            if invokable is not None:
+                lookup_cache.store(self, signature, invokable)
+        return invokable
+
+    def _lookup_invokable_in_hierarchy(self, signature):
+        invokable = self._invokables_index.get(signature, None)
 
         # Traverse the super class chain by calling lookup on the super class
-        if self.has_super_class():
-            invokable = self.get_super_class().lookup_invokable(signature)
-            if invokable:
-                self._invokables_table[signature] = invokable
-                return invokable
+        if invokable is None and self.has_super_class():
+            return self.get_super_class()._lookup_invokable_in_hierarchy(signature)
+        return invokable
 
-        # Invokable not found
-        return None
+    def get_version(self):
+        """ The version changes whenever the lookup of a method in this
+            class may have a different result """
+        return self._version
+
+    def _invalidate_lookups(self):
+        self._version += 1
+        for subclass in self._subclasses:
+            subclass._invalidate_lookups()
 
     def lookup_field_index(self, field_name):
         # Lookup field with given name in array of instance fields
@@ -114,6 +174,9 @@ class _Class(Object):
         return -1
 
     def add_instance_invokable(self, value):
+        # Lookups of the signature in this class and its subclasses change
+        self._invalidate_lookups()
+
         # Add the given invokable to the array of instance invokables
         for i in range(0, self.get_number_of_instance_invokables()):
             # Get the next invokable in the instance invokable array
@@ -169,46 +232,3 @@ class _Class(Object):
 
     def __str__(self):
         return "Class(" + self.get_name().get_embedded_string() + ")"
-
-
-class _ClassWithLayout(_Class):
-    _immutable_fields_ = ["_layout_for_instances?"]
-
-    def __init__(self, universe, number_of_fields=Object.NUMBER_OF_OBJECT_FIELDS, obj_class=None):
-        _Class.__init__(self, universe, number_of_fields, obj_class)
-        if number_of_fields >= 0:
-            self._layout_for_instances = ObjectLayout(number_of_fields, self)
-        else:
-            self._layout_for_instances = None
-
-    def set_instance_fields(self, value):
-        assert isinstance(value, Array)
-        self._instance_fields = value
-        if (self._layout_for_instances is None or
-                value.get_number_of_indexable_fields() !=
-                self._layout_for_instances.get_number_of_fields()):
-            self._layout_for_instances = ObjectLayout(
-                value.get_number_of_indexable_fields(), self)
-
-    def get_layout_for_instances(self):
-        return self._layout_for_instances
-
-    def update_instance_layout_with_initialized_field(self, field_idx,
-                                                      spec_type):
-        updated = self._layout_for_instances.with_initialized_field(field_idx,
-                                                                    spec_type)
-        if updated is not self._layout_for_instances:
-            self._layout_for_instances = updated
-        return self._layout_for_instances
-
-    def update_instance_layout_with_generalized_field(self, field_idx):
-        updated = self._layout_for_instances.with_generalized_field(field_idx)
-        if updated is not self._layout_for_instances:
-            self._layout_for_instances = updated
-        return self._layout_for_instances
-
-
-if is_ast_interpreter():
-    Class = _ClassWithLayout
-else:
-    Class = _Class
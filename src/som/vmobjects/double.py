@@ -23,21 +23,6 @@ class Double(AbstractObject):
     def get_class(self, universe):
         return universe.doubleClass
 
-    def quick_add(self, from_method, frame, interpreter, bytecode_index):
-        right = frame.pop()
-        frame.pop()
-        frame.push(self.prim_add(right))
-
-    def quick_multiply(self, from_method, frame, interpreter, bytecode_index):
-        right = frame.pop()
-        frame.pop()
-        frame.push(self.prim_multiply(right))
-
-    def quick_subtract(self, from_method, frame, interpreter, bytecode_index):
-        right = frame.pop()
-        frame.pop()
-        frame.push(self.prim_subtract(right))
-
     @staticmethod
     def _get_float(obj):
         from .integer import Integer
@@ -77,7 +62,7 @@ class Double(AbstractObject):
     def prim_int_div(self, right):
         from .integer import Integer
         r = self._get_float(right)
-        return Integer(int(self._embedded_double / r))
+        return Integer.box(int(self._embedded_double / r))
 
     def prim_modulo(self, right):
         r = self._get_float(right)
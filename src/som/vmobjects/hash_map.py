@@ -0,0 +1,373 @@
+from rlib.arithmetic import bigint_hash
+from rlib.erased import new_erasing_pair
+from rlib.objectmodel import compute_hash
+
+from som.vm.globals import nilObject
+from som.vmobjects.biginteger import BigInteger
+from som.vmobjects.integer import Integer
+from som.vmobjects.object_without_fields import ObjectWithoutFields
+from som.vmobjects.string import String
+from som.vmobjects.symbol import Symbol
+
+
+class KeyComparator(object):
+    """ Sends hashcode and = to keys the hash map cannot compare itself.
+        The interpreters provide the subclasses doing the actual sends. """
+
+    def hashcode(self, key):
+        raise NotImplementedError()
+
+    def equals(self, key, other):
+        raise NotImplementedError()
+
+
+def _is_native_key(key):
+    return isinstance(key, Integer) or isinstance(key, String)
+
+
+def _hash_of(key, comparator):
+    if isinstance(key, Integer):
+        return key.get_embedded_integer()
+    if isinstance(key, String):
+        return compute_hash(key.get_embedded_string())
+
+    hashcode = comparator.hashcode(key)
+    if isinstance(hashcode, Integer):
+        return hashcode.get_embedded_integer()
+    if isinstance(hashcode, BigInteger):
+        return bigint_hash(hashcode.get_embedded_biginteger())
+    # equal keys need to end up in the same bucket, and a hashcode that is
+    # not a number cannot be hashed by value
+    return 0
+
+
+def _keys_equal(key, other, comparator):
+    if key is other:
+        return True
+    if not (_is_native_key(key) and _is_native_key(other)):
+        return comparator.equals(key, other)
+
+    if isinstance(key, Integer) and isinstance(other, Integer):
+        return key.get_embedded_integer() == other.get_embedded_integer()
+    if isinstance(key, Symbol) or isinstance(other, Symbol):
+        # symbols are unique, and not equal to strings
+        return False
+    if isinstance(key, String) and isinstance(other, String):
+        return key.get_embedded_string() == other.get_embedded_string()
+    return False
+
+
+class HashMap(ObjectWithoutFields):
+    """ A hash table, which starts out with a strategy that stores integer
+        or string keys unboxed in a native dict, and falls back to a
+        strategy that sends hashcode and = for other keys. """
+
+    def __init__(self, obj_class):
+        ObjectWithoutFields.__init__(self, obj_class)
+        self._strategy = _empty_strategy
+        self._storage  = _empty_strategy.new_storage()
+
+    def get_number_of_entries(self):
+        return self._strategy.get_size(self._storage)
+
+    def get(self, key, comparator):
+        """ Return the value for the key, or nil """
+        return self._strategy.get(self._storage, key, comparator)
+
+    def put(self, key, value, comparator):
+        self._strategy.put(self, key, value, comparator)
+
+    def remove(self, key, comparator):
+        """ Remove the key and return its value, or nil """
+        return self._strategy.remove(self._storage, key, comparator)
+
+    def contains_key(self, key, comparator):
+        return self._strategy.contains_key(self._storage, key, comparator)
+
+    def get_keys(self):
+        return self._strategy.get_keys(self._storage)
+
+
+class _HashMapStrategy(object):
+
+    @staticmethod
+    def _strategy_for(key):
+        if isinstance(key, Integer):
+            return _long_strategy
+        if isinstance(key, Symbol):
+            return _symbol_strategy
+        if isinstance(key, String):
+            return _string_strategy
+        return _obj_strategy
+
+    @staticmethod
+    def _transition_to_object_strategy(hash_map):
+        keys = hash_map._strategy.get_keys(hash_map._storage)
+        values = hash_map._strategy.get_values(hash_map._storage)
+
+        storage = _obj_strategy.new_storage()
+        store = _ObjectStrategy._unerase(storage)
+        for i in range(len(keys)):
+            # the keys so far are all native keys, which need no sends
+            store.put(keys[i], values[i], None)
+
+        hash_map._storage  = storage
+        hash_map._strategy = _obj_strategy
+
+
+class _EmptyStrategy(_HashMapStrategy):
+
+    def new_storage(self):
+        # never accessed, replaced on the first put
+        return _long_strategy.new_storage()
+
+    def get_size(self, storage):
+        return 0
+
+    def get(self, storage, key, comparator):
+        return nilObject
+
+    def put(self, hash_map, key, value, comparator):
+        strategy = self._strategy_for(key)
+        hash_map._storage  = strategy.new_storage()
+        hash_map._strategy = strategy
+        strategy.put(hash_map, key, value, comparator)
+
+    def remove(self, storage, key, comparator):
+        return nilObject
+
+    def contains_key(self, storage, key, comparator):
+        return False
+
+    def get_keys(self, storage):
+        return []
+
+    def get_values(self, storage):
+        return []
+
+
+class _LongStrategy(_HashMapStrategy):
+
+    _erase, _unerase = new_erasing_pair("int_dict")
+    _erase   = staticmethod(_erase)
+    _unerase = staticmethod(_unerase)
+
+    def new_storage(self):
+        return self._erase({})
+
+    def get_size(self, storage):
+        return len(self._unerase(storage))
+
+    def get(self, storage, key, comparator):
+        if isinstance(key, Integer):
+            return self._unerase(storage).get(key.get_embedded_integer(),
+                                              nilObject)
+        return nilObject
+
+    def put(self, hash_map, key, value, comparator):
+        if isinstance(key, Integer):
+            store = self._unerase(hash_map._storage)
+            store[key.get_embedded_integer()] = value
+        else:
+            self._transition_to_object_strategy(hash_map)
+            hash_map.put(key, value, comparator)
+
+    def remove(self, storage, key, comparator):
+        if isinstance(key, Integer):
+            store = self._unerase(storage)
+            k = key.get_embedded_integer()
+            value = store.get(k, None)
+            if value is not None:
+                del store[k]
+                return value
+        return nilObject
+
+    def contains_key(self, storage, key, comparator):
+        if isinstance(key, Integer):
+            return key.get_embedded_integer() in self._unerase(storage)
+        return False
+
+    def get_keys(self, storage):
+        return [Integer.box(k) for k in self._unerase(storage).keys()]
+
+    def get_values(self, storage):
+        return [value for value in self._unerase(storage).values()]
+
+
+class _StringStrategy(_HashMapStrategy):
+
+    _erase, _unerase = new_erasing_pair("str_dict")
+    _erase   = staticmethod(_erase)
+    _unerase = staticmethod(_unerase)
+
+    def _is_key(self, key):
+        return isinstance(key, String) and not isinstance(key, Symbol)
+
+    def _box(self, string):
+        return String(string)
+
+    def new_storage(self):
+        return self._erase({})
+
+    def get_size(self, storage):
+        return len(self._unerase(storage))
+
+    def get(self, storage, key, comparator):
+        if self._is_key(key):
+            assert isinstance(key, String)
+            return self._unerase(storage).get(key.get_embedded_string(),
+                                              nilObject)
+        return nilObject
+
+    def put(self, hash_map, key, value, comparator):
+        if self._is_key(key):
+            assert isinstance(key, String)
+            store = self._unerase(hash_map._storage)
+            store[key.get_embedded_string()] = value
+        else:
+            self._transition_to_object_strategy(hash_map)
+            hash_map.put(key, value, comparator)
+
+    def remove(self, storage, key, comparator):
+        if self._is_key(key):
+            assert isinstance(key, String)
+            store = self._unerase(storage)
+            k = key.get_embedded_string()
+            value = store.get(k, None)
+            if value is not None:
+                del store[k]
+                return value
+        return nilObject
+
+    def contains_key(self, storage, key, comparator):
+        if self._is_key(key):
+            assert isinstance(key, String)
+            return key.get_embedded_string() in self._unerase(storage)
+        return False
+
+    def get_keys(self, storage):
+        return [self._box(k) for k in self._unerase(storage).keys()]
+
+    def get_values(self, storage):
+        return [value for value in self._unerase(storage).values()]
+
+
+class _SymbolStrategy(_StringStrategy):
+    """ Symbols are unique, so they are stored by their string as well """
+
+    def _is_key(self, key):
+        return isinstance(key, Symbol)
+
+    def _box(self, string):
+        from som.vm.universe import get_current
+        return get_current().symbol_for(string)
+
+
+class _Entry(object):
+
+    def __init__(self, key, value):
+        self.key   = key
+        self.value = value
+
+
+class _ObjectStorage(object):
+    """ Entries are kept in buckets per hash, and are compared with = """
+
+    def __init__(self):
+        self.buckets = {}
+        self.size    = 0
+
+    def _find(self, bucket, key, comparator):
+        for entry in bucket:
+            if _keys_equal(key, entry.key, comparator):
+                return entry
+        return None
+
+    def get(self, key, comparator):
+        bucket = self.buckets.get(_hash_of(key, comparator), None)
+        if bucket is None:
+            return nilObject
+        entry = self._find(bucket, key, comparator)
+        if entry is None:
+            return nilObject
+        return entry.value
+
+    def put(self, key, value, comparator):
+        key_hash = _hash_of(key, comparator)
+        bucket = self.buckets.get(key_hash, None)
+        if bucket is None:
+            self.buckets[key_hash] = [_Entry(key, value)]
+            self.size += 1
+            return
+
+        entry = self._find(bucket, key, comparator)
+        if entry is None:
+            bucket.append(_Entry(key, value))
+            self.size += 1
+        else:
+            entry.value = value
+
+    def remove(self, key, comparator):
+        key_hash = _hash_of(key, comparator)
+        bucket = self.buckets.get(key_hash, None)
+        if bucket is None:
+            return nilObject
+
+        for i in range(len(bucket)):
+            entry = bucket[i]
+            if _keys_equal(key, entry.key, comparator):
+                del bucket[i]
+                if not bucket:
+                    del self.buckets[key_hash]
+                self.size -= 1
+                return entry.value
+        return nilObject
+
+    def get_keys(self):
+        return [entry.key for bucket in self.buckets.values()
+                for entry in bucket]
+
+    def get_values(self):
+        return [entry.value for bucket in self.buckets.values()
+                for entry in bucket]
+
+
+class _ObjectStrategy(_HashMapStrategy):
+
+    _erase, _unerase = new_erasing_pair("obj_storage")
+    _erase   = staticmethod(_erase)
+    _unerase = staticmethod(_unerase)
+
+    def new_storage(self):
+        return self._erase(_ObjectStorage())
+
+    def get_size(self, storage):
+        return self._unerase(storage).size
+
+    def get(self, storage, key, comparator):
+        return self._unerase(storage).get(key, comparator)
+
+    def put(self, hash_map, key, value, comparator):
+        self._unerase(hash_map._storage).put(key, value, comparator)
+
+    def remove(self, storage, key, comparator):
+        return self._unerase(storage).remove(key, comparator)
+
+    def contains_key(self, storage, key, comparator):
+        store = self._unerase(storage)
+        bucket = store.buckets.get(_hash_of(key, comparator), None)
+        return (bucket is not None and
+                store._find(bucket, key, comparator) is not None)
+
+    def get_keys(self, storage):
+        return self._unerase(storage).get_keys()
+
+    def get_values(self, storage):
+        return self._unerase(storage).get_values()
+
+
+_empty_strategy  = _EmptyStrategy()
+_long_strategy   = _LongStrategy()
+_string_strategy = _StringStrategy()
+_symbol_strategy = _SymbolStrategy()
+_obj_strategy    = _ObjectStrategy()
@@ -1,10 +1,50 @@
 from rlib.arithmetic import ovfcheck, bigint_from_int, divrem, int_type
+from rlib.jit import we_are_jitted
 from rlib.llop import as_32_bit_signed_value, int_mod, Signed
 
 from som.vmobjects.abstract_object import AbstractObject
 from som.vm.globals import trueObject, falseObject
 
 
+# Integers in this range are boxed only once, and shared afterwards
+SMALL_INTEGER_MIN = -1024
+SMALL_INTEGER_MAX = 65535
+
+
+class BoxingStatistics(object):
+    """ Counts how often Integer.box() finds a preallocated integer.
+        Counting is disabled by default, and enabled with -boxstats. """
+
+    _immutable_fields_ = ["_enabled?"]
+
+    def __init__(self):
+        self._enabled = False
+        self.hits     = 0
+        self.misses   = 0
+
+    def enable(self):
+        self._enabled = True
+
+    def disable(self):
+        self._enabled = False
+
+    def is_enabled(self):
+        return self._enabled
+
+    def reset(self):
+        self.hits   = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return float(self.hits) / float(total)
+
+
+boxing_statistics = BoxingStatistics()
+
+
 class Integer(AbstractObject):
 
     _immutable_fields_ = ["_embedded_integer"]
@@ -14,6 +54,21 @@ class Integer(AbstractObject):
         assert isinstance(value, int_type), "Value: " + str(value)
         self._embedded_integer = value
 
+    @staticmethod
+    def box(value):
+        """ Return an Integer for the value, which is shared for values in
+            the small integer range. Compiled code allocates, because the
+            JIT removes allocations of integers that do not escape. """
+        if we_are_jitted():
+            return Integer(value)
+        if SMALL_INTEGER_MIN <= value <= SMALL_INTEGER_MAX:
+            if boxing_statistics.is_enabled():
+                boxing_statistics.hits += 1
+            return _small_integers[value - SMALL_INTEGER_MIN]
+        if boxing_statistics.is_enabled():
+            boxing_statistics.misses += 1
+        return Integer(value)
+
     def get_embedded_integer(self):
         return self._embedded_integer
 
@@ -23,24 +78,6 @@ class Integer(AbstractObject):
     def get_class(self, universe):
         return universe.integerClass
 
-    def quick_add(self, from_method, frame, interpreter, bytecode_index):
-        right = frame.top()
-        frame.pop()
-        frame.pop()
-        frame.push(self.prim_add(right))
-
-    def quick_multiply(self, from_method, frame, interpreter, bytecode_index):
-        right = frame.top()
-        frame.pop()
-        frame.pop()
-        frame.push(self.prim_multiply(right))
-
-    def quick_subtract(self, from_method, frame, interpreter, bytecode_index):
-        right = frame.top()
-        frame.pop()
-        frame.pop()
-        frame.push(self.prim_subtract(right))
-
     def _to_double(self):
         from .double import Double
         return Double(float(self._embedded_integer))
@@ -101,11 +138,11 @@ class Integer(AbstractObject):
         return String(str(self._embedded_integer))
 
     def prim_abs(self):
-        return Integer(abs(self._embedded_integer))
+        return Integer.box(abs(self._embedded_integer))
 
     def prim_as_32_bit_signed_value(self):
         val = as_32_bit_signed_value(self._embedded_integer)
-        return Integer(val)
+        return Integer.box(val)
 
     def prim_max(self, right):
         from .biginteger import BigInteger
@@ -133,7 +170,7 @@ class Integer(AbstractObject):
             r = right.get_embedded_integer()
             try:
                 result = ovfcheck(l + r)
-                return Integer(result)
+                return Integer.box(result)
             except OverflowError:
                 return BigInteger(
                     bigint_from_int(l).add(bigint_from_int(r)))
@@ -152,7 +189,7 @@ class Integer(AbstractObject):
             r = right.get_embedded_integer()
             try:
                 result = ovfcheck(l - r)
-                return Integer(result)
+                return Integer.box(result)
             except OverflowError:
                 return BigInteger(
                     bigint_from_int(l).sub(bigint_from_int(r)))
@@ -172,7 +209,7 @@ class Integer(AbstractObject):
             r = right.get_embedded_integer()
             try:
                 result = ovfcheck(l * r)
-                return Integer(result)
+                return Integer.box(result)
             except OverflowError:
                 return BigInteger(
                     bigint_from_int(l).mul(bigint_from_int(r)))
@@ -205,7 +242,7 @@ class Integer(AbstractObject):
         else:
             l = self._embedded_integer
             r = right.get_embedded_integer()
-            return Integer(l // r)
+            return Integer.box(l // r)
 
     def prim_modulo(self, right):
         from .double import Double
@@ -220,7 +257,7 @@ class Integer(AbstractObject):
         else:
             l = self._embedded_integer
             r = right.get_embedded_integer()
-            return Integer(l % r)
+            return Integer.box(l % r)
 
     def prim_remainder(self, right):
         from .double import Double
@@ -235,7 +272,7 @@ class Integer(AbstractObject):
         else:
             l = self._embedded_integer
             r = right.get_embedded_integer()
-            return Integer(int_mod(Signed, l, r))
+            return Integer.box(int_mod(Signed, l, r))
 
     def prim_and(self, right):
         from .double import Double
@@ -250,7 +287,7 @@ class Integer(AbstractObject):
         else:
             l = self._embedded_integer
             r = right.get_embedded_integer()
-            return Integer(l & r)
+            return Integer.box(l & r)
 
     def prim_equals(self, right):
         from .double import Double
@@ -293,3 +330,7 @@ class Integer(AbstractObject):
             return trueObject
         else:
             return falseObject
+
+
+_small_integers = [Integer(i)
+                   for i in range(SMALL_INTEGER_MIN, SMALL_INTEGER_MAX + 1)]
@@ -36,6 +36,16 @@ class AstMethod(AbstractObject):
     def get_signature(self):
         return self._signature
 
+    def get_invokable(self):
+        return self._invokable
+
+    def create_split_copy(self):
+        """ A copy of the method with its own tree, for a single call site """
+        method = AstMethod(self._signature, self._invokable.create_split_copy(),
+                           self._embedded_block_methods, self._universe)
+        method._holder = self._holder
+        return method
+
     def get_holder(self):
         return self._holder
 
@@ -51,6 +61,18 @@ class AstMethod(AbstractObject):
     def invoke(self, receiver, args):
         return self._invokable.invoke(receiver, args)
 
+    def invoke0(self, receiver):
+        return self._invokable.invoke0(receiver)
+
+    def invoke1(self, receiver, arg1):
+        return self._invokable.invoke1(receiver, arg1)
+
+    def invoke2(self, receiver, arg1, arg2):
+        return self._invokable.invoke2(receiver, arg1, arg2)
+
+    def invoke3(self, receiver, arg1, arg2, arg3):
+        return self._invokable.invoke3(receiver, arg1, arg2, arg3)
+
     def __str__(self):
         if self._holder:
             holder = self._holder.get_name().get_embedded_string()
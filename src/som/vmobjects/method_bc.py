@@ -1,35 +1,53 @@
 from __future__ import absolute_import
 
 from rlib import jit
+from rlib.jit import we_are_jitted
 
+from som.interpreter.bc.bytecodes import bytecode_length
 from som.interpreter.bc.frame import create_frame
+from som.interpreter.bc.instructions import decode_instructions
 from som.interpreter.control_flow import ReturnException
 from som.vmobjects.abstract_object import AbstractObject
+from som.vmobjects.block_bc import BcBlock
+
+
+# The maximum number of unused frames kept per method
+FRAME_POOL_SIZE = 32
 
 
 class BcMethod(AbstractObject):
 
     _immutable_fields_ = ["_bytecodes[*]",
                           "_literals[*]",
-                          "_inline_cache_class",
-                          "_inline_cache_invokable",
-                          "_receiver_class_table",
+                          "_inline_caches",
+                          "_field_caches",
+                          "_global_caches",
                           "_number_of_locals",
                           "_maximum_number_of_stack_elements",
                           "_signature",
                           "_number_of_arguments",
-                          "_initial_stack_pointer",
-                          "_number_of_frame_elements",
+                          "_number_of_stack_elements",
+                          "_frame_pool",
+                          "_number_of_context_values",
+                          "_captured_arguments[*]",
                           "_holder"]
 
     def __init__(self, literals, num_locals, max_stack_elements,
-                 num_bytecodes, signature):
+                 num_bytecodes, signature, num_send_sites = 0,
+                 num_field_sites = 0, num_global_sites = 0):
         AbstractObject.__init__(self)
 
         # Set the number of bytecodes in this method
         self._bytecodes              = ["\x00"] * num_bytecodes
-        self._inline_cache_class     = [None]   * num_bytecodes
-        self._inline_cache_invokable = [None]   * num_bytecodes
+
+        # the decoded bytecodes, see get_instruction()
+        self._instructions           = None
+
+        # the caches are indexed by the numbers the compiler assigned to the
+        # send sites, field access sites and global sites
+        self._inline_caches          = [None] * num_send_sites
+        self._field_caches           = [None] * num_field_sites
+        self._global_caches          = [None] * num_global_sites
 
         self._literals               = literals
 
@@ -37,9 +55,15 @@ class BcMethod(AbstractObject):
         self._maximum_number_of_stack_elements = max_stack_elements
         self._signature = signature
         self._number_of_arguments = signature.get_number_of_signature_arguments()
-        self._initial_stack_pointer = self._number_of_arguments + num_locals - 1
-        self._number_of_frame_elements = (self._number_of_arguments + num_locals
-                                          + max_stack_elements + 2)
+        # extra buffer to support doesNotUnderstand
+        self._number_of_stack_elements = max_stack_elements + 2
+
+        # until the compiler knows better, see set_creates_blocks()
+        self._frame_pool = None
+
+        # the variables captured by blocks, set by the compiler
+        self._number_of_context_values = 0
+        self._captured_arguments       = []
 
         self._holder = None
 
@@ -52,9 +76,6 @@ class BcMethod(AbstractObject):
         """ We use this method to identify methods and primitives """
         return True
 
-    def get_initial_stack_pointer(self):
-        return self._initial_stack_pointer
-
     def get_number_of_locals(self):
         # Get the number of locals
         return self._number_of_locals
@@ -80,12 +101,25 @@ class BcMethod(AbstractObject):
             assert isinstance(obj, AbstractObject)
             if obj.is_invokable():
                 obj.set_holder(value)
+            elif isinstance(obj, BcBlock):
+                # the preallocated block of a clean block
+                obj.get_method().set_holder(value)
 
     # XXX this means that the JIT doesn't see changes to the constants
     @jit.elidable_promote('all')
     def get_constant(self, bytecode_index):
         # Get the constant associated to a given bytecode index
-        return self._literals[self.get_bytecode(bytecode_index + 1)]
+        return self._literals[self.get_two_byte_operand(bytecode_index + 1)]
+
+    def get_number_of_literals(self):
+        return len(self._literals)
+
+    def get_literal(self, index):
+        return self._literals[index]
+
+    def set_literal(self, index, value):
+        self._literals[index] = value
+        self._instructions = None
 
     @jit.elidable_promote('all')
     def get_number_of_arguments(self):
@@ -96,11 +130,9 @@ class BcMethod(AbstractObject):
         return len(self._bytecodes)
 
     @jit.elidable_promote('all')
-    def get_number_of_frame_elements(self):
-        # Compute the maximum number of stack locations (including arguments,
-        # locals and extra buffer to support doesNotUnderstand) and set the
-        # number of indexable fields accordingly
-        return self._number_of_frame_elements
+    def get_number_of_stack_elements(self):
+        # Get the size of the operand stack of the method's frames
+        return self._number_of_stack_elements
 
     @jit.elidable_promote('all')
     def get_bytecode(self, index):
@@ -108,27 +140,116 @@ class BcMethod(AbstractObject):
         assert 0 <= index and index < len(self._bytecodes)
         return ord(self._bytecodes[index])
 
+    @jit.elidable_promote('all')
+    def get_two_byte_operand(self, index):
+        # Get the operand stored in the two bytes at the given index, low
+        # byte first
+        return self.get_bytecode(index) + (self.get_bytecode(index + 1) << 8)
+
+    @jit.elidable_promote('all')
+    def get_jump_offset(self, bytecode_index):
+        # Get the offset of the jump at the given index
+        return self.get_two_byte_operand(bytecode_index + 1)
+
+    @jit.elidable_promote('all')
+    def get_send_site(self, bytecode_index):
+        # Get the number of the send site of the send at the given index,
+        # which is its last operand
+        end = bytecode_index + bytecode_length(self.get_bytecode(bytecode_index))
+        return self.get_two_byte_operand(end - 2)
+
+    @jit.elidable_promote('all')
+    def get_field_site(self, bytecode_index):
+        # Get the number of the field access site of the field access at the
+        # given index, which follows the field index
+        return self.get_two_byte_operand(bytecode_index + 2)
+
+    @jit.elidable_promote('all')
+    def get_global_site(self, bytecode_index):
+        # Get the number of the global site of the push_global at the given
+        # index, which follows the literal index
+        return self.get_two_byte_operand(bytecode_index + 3)
+
+    def get_number_of_send_sites(self):
+        return len(self._inline_caches)
+
+    def get_number_of_field_sites(self):
+        return len(self._field_caches)
+
+    def get_number_of_global_sites(self):
+        return len(self._global_caches)
+
+    @jit.elidable_promote('all')
+    def get_instruction(self, index):
+        # Get the decoded instruction with the given index. The bytecodes are
+        # decoded on the first execution, when they are complete
+        if self._instructions is None:
+            self._instructions = decode_instructions(self)
+        return self._instructions[index]
+
     def set_bytecode(self, index, value):
         # Set the bytecode at the given index to the given value
         assert 0 <= value and value <= 255
         self._bytecodes[index] = chr(value)
+        self._instructions = None
+
+    def creates_blocks(self):
+        return self._frame_pool is None
+
+    def set_creates_blocks(self, value):
+        # frames of methods that create no blocks are never referenced after
+        # the method returned, so they are reused
+        if value:
+            self._frame_pool = None
+        else:
+            self._frame_pool = []
+
+    def get_number_of_context_values(self):
+        return self._number_of_context_values
+
+    def get_captured_arguments(self):
+        """ The indexes of the arguments that are captured by blocks, in the
+            order of their index in the context """
+        return self._captured_arguments
+
+    def set_context_layout(self, num_values, captured_arguments):
+        self._number_of_context_values = num_values
+        self._captured_arguments       = captured_arguments
+
+    def _allocate_frame(self, previous_frame):
+        # the JIT removes the allocation of frames that do not escape
+        if self._frame_pool is None or we_are_jitted() or not self._frame_pool:
+            return create_frame(previous_frame, self, None)
+        frame = self._frame_pool.pop()
+        frame.set_previous_frame(previous_frame)
+        return frame
+
+    def _release_frame(self, frame):
+        if (self._frame_pool is None or we_are_jitted() or
+                len(self._frame_pool) >= FRAME_POOL_SIZE):
+            frame.mark_as_no_longer_on_stack()
+        else:
+            frame.clear()
+            self._frame_pool.append(frame)
 
     def invoke(self, frame, interpreter):
         # Allocate and push a new frame on the interpreter stack
-        new_frame = create_frame(frame, self, None)
+        new_frame = self._allocate_frame(frame)
         new_frame.copy_arguments_from(frame, self._number_of_arguments)
 
         try:
             result = interpreter.interpret(self, new_frame)
             frame.pop_old_arguments_and_push_result(self, result)
-            new_frame.clear_previous_frame()
+            self._release_frame(new_frame)
             return
         except ReturnException as e:
-            if e.has_reached_target(new_frame):
+            # the target of non-local returns is the context of the method
+            if e.has_reached_target(new_frame.get_inner_context()):
                 frame.pop_old_arguments_and_push_result(self, e.get_result())
+                self._release_frame(new_frame)
                 return
             else:
-                new_frame.clear_previous_frame()
+                self._release_frame(new_frame)
                 raise e
 
     def __str__(self):
@@ -139,18 +260,28 @@ class BcMethod(AbstractObject):
         return universe.methodClass
 
     @jit.elidable
-    def get_inline_cache_class(self, bytecode_index):
-        assert 0 <= bytecode_index and bytecode_index < len(self._inline_cache_class)
-        return self._inline_cache_class[bytecode_index]
+    def get_inline_cache(self, send_site):
+        assert 0 <= send_site and send_site < len(self._inline_caches)
+        return self._inline_caches[send_site]
+
+    def set_inline_cache(self, send_site, entry):
+        self._inline_caches[send_site] = entry
+
+    @jit.elidable
+    def get_field_cache(self, field_site):
+        assert 0 <= field_site and field_site < len(self._field_caches)
+        return self._field_caches[field_site]
+
+    def set_field_cache(self, field_site, entry):
+        self._field_caches[field_site] = entry
 
     @jit.elidable
-    def get_inline_cache_invokable(self, bytecode_index):
-        assert 0 <= bytecode_index and bytecode_index < len(self._inline_cache_invokable)
-        return self._inline_cache_invokable[bytecode_index]
+    def get_global_cache(self, global_site):
+        assert 0 <= global_site and global_site < len(self._global_caches)
+        return self._global_caches[global_site]
 
-    def set_inline_cache(self, bytecode_index, receiver_class, invokable):
-        self._inline_cache_class[bytecode_index]    = receiver_class
-        self._inline_cache_invokable[bytecode_index] = invokable
+    def set_global_cache(self, global_site, assoc):
+        self._global_caches[global_site] = assoc
 
     def merge_point_string(self):
         """ debug info for the jit """
@@ -141,7 +141,7 @@ class ObjectWithLayout(ObjectWithoutFields):
 
     def get_number_of_fields(self):
         # Get the number of fields in this object
-        return len(self._fields)
+        return self._object_layout.get_number_of_fields()
 
     def is_primitive_set(self, mask):
         return (promote(self._primitive_used_map) & mask) != 0
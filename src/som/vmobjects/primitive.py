@@ -2,7 +2,7 @@ from som.interp_type import is_ast_interpreter
 from som.vmobjects.abstract_object import AbstractObject
 
 
-class _AbstractPrimitive(AbstractObject):
+class AbstractPrimitive(AbstractObject):
     _immutable_fields_ = ["_is_empty", "_signature", "_holder", "_universe"]
 
     def __init__(self, signature_string, universe, is_empty=False):
@@ -49,11 +49,33 @@ class _AbstractPrimitive(AbstractObject):
         return ("Primitive(" + holder + ">>" + str(self.get_signature()) + ")")
 
 
-class _AstPrimitive(_AbstractPrimitive):
+class _AbstractAstPrimitive(AbstractPrimitive):
+    """ Primitives are invoked with the arity of their selector. The
+        invoke0/1/2/3 entry points pass the arguments without allocating a
+        list, and by default fall back to the list-based invoke """
+
+    def invoke(self, rcvr, args):
+        raise NotImplementedError()
+
+    def invoke0(self, rcvr):
+        return self.invoke(rcvr, [])
+
+    def invoke1(self, rcvr, arg1):
+        return self.invoke(rcvr, [arg1])
+
+    def invoke2(self, rcvr, arg1, arg2):
+        return self.invoke(rcvr, [arg1, arg2])
+
+    def invoke3(self, rcvr, arg1, arg2, arg3):
+        return self.invoke(rcvr, [arg1, arg2, arg3])
+
+
+class _AstPrimitive(_AbstractAstPrimitive):
     _immutable_fields_ = ["_prim_fn"]
 
     def __init__(self, signature_string, universe, prim_fn, is_empty=False):
-        _AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
+        _AbstractAstPrimitive.__init__(self, signature_string, universe,
+                                       is_empty)
         self._prim_fn = prim_fn
 
     def invoke(self, rcvr, args):
@@ -61,47 +83,59 @@ class _AstPrimitive(_AbstractPrimitive):
         return prim_fn(self, rcvr, args)
 
 
-class _AstUnaryPrimitive(_AbstractPrimitive):
+class _AstUnaryPrimitive(_AbstractAstPrimitive):
     _immutable_fields_ = ["_prim_fn"]
 
     def __init__(self, signature_string, universe, prim_fn, is_empty=False):
-        _AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
+        _AbstractAstPrimitive.__init__(self, signature_string, universe,
+                                       is_empty)
         self._prim_fn = prim_fn
 
     def invoke(self, rcvr, args):
+        return self.invoke0(rcvr)
+
+    def invoke0(self, rcvr):
         prim_fn = self._prim_fn
         return prim_fn(rcvr)
 
 
-class _AstBinaryPrimitive(_AbstractPrimitive):
+class _AstBinaryPrimitive(_AbstractAstPrimitive):
     _immutable_fields_ = ["_prim_fn"]
 
     def __init__(self, signature_string, universe, prim_fn, is_empty=False):
-        _AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
+        _AbstractAstPrimitive.__init__(self, signature_string, universe,
+                                       is_empty)
         self._prim_fn = prim_fn
 
     def invoke(self, rcvr, args):
+        return self.invoke1(rcvr, args[0])
+
+    def invoke1(self, rcvr, arg1):
         prim_fn = self._prim_fn
-        return prim_fn(rcvr, args[0])
+        return prim_fn(rcvr, arg1)
 
 
-class _AstTernaryPrimitive(_AbstractPrimitive):
+class _AstTernaryPrimitive(_AbstractAstPrimitive):
     _immutable_fields_ = ["_prim_fn"]
 
     def __init__(self, signature_string, universe, prim_fn, is_empty=False):
-        _AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
+        _AbstractAstPrimitive.__init__(self, signature_string, universe,
+                                       is_empty)
         self._prim_fn = prim_fn
 
     def invoke(self, rcvr, args):
+        return self.invoke2(rcvr, args[0], args[1])
+
+    def invoke2(self, rcvr, arg1, arg2):
         prim_fn = self._prim_fn
-        return prim_fn(rcvr, args[0], args[1])
+        return prim_fn(rcvr, arg1, arg2)
 
 
-class _BcPrimitive(_AbstractPrimitive):
+class _BcPrimitive(AbstractPrimitive):
     _immutable_fields_ = ["_prim_fn"]
 
     def __init__(self, signature_string, universe, prim_fn, is_empty=False):
-        _AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
+        AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
         self._prim_fn = prim_fn
 
     def invoke(self, frame, interpreter):
@@ -109,11 +143,11 @@ class _BcPrimitive(_AbstractPrimitive):
         prim_fn(self, frame, interpreter)
 
 
-class _BcUnaryPrimitive(_AbstractPrimitive):
+class _BcUnaryPrimitive(AbstractPrimitive):
     _immutable_fields_ = ["_prim_fn"]
 
     def __init__(self, signature_string, universe, prim_fn, is_empty=False):
-        _AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
+        AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
         self._prim_fn = prim_fn
 
     def invoke(self, frame, interpreter):
@@ -123,11 +157,11 @@ class _BcUnaryPrimitive(_AbstractPrimitive):
         frame.set_top(result)
 
 
-class _BcBinaryPrimitive(_AbstractPrimitive):
+class _BcBinaryPrimitive(AbstractPrimitive):
     _immutable_fields_ = ["_prim_fn"]
 
     def __init__(self, signature_string, universe, prim_fn, is_empty=False):
-        _AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
+        AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
         self._prim_fn = prim_fn
 
     def invoke(self, frame, interpreter):
@@ -138,11 +172,11 @@ class _BcBinaryPrimitive(_AbstractPrimitive):
         frame.set_top(result)
 
 
-class _BcTernaryPrimitive(_AbstractPrimitive):
+class _BcTernaryPrimitive(AbstractPrimitive):
     _immutable_fields_ = ["_prim_fn"]
 
     def __init__(self, signature_string, universe, prim_fn, is_empty=False):
-        _AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
+        AbstractPrimitive.__init__(self, signature_string, universe, is_empty)
         self._prim_fn = prim_fn
 
     def invoke(self, frame, interpreter):
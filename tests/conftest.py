@@ -0,0 +1,33 @@
+import os
+import pytest
+
+from som.vm.universe import create_universe, set_current
+
+
+def _class_name(source):
+    return source.split("=", 1)[0].strip()
+
+
+def _create_universe_with_classes(class_dir, sources):
+    for source in sources:
+        class_dir.join(_class_name(source) + ".som").write(source)
+
+    u = create_universe()
+    set_current(u)
+    u.setup_classpath("Smalltalk" + os.pathsep + str(class_dir))
+    u._initialize_object_system()
+    return u
+
+
+@pytest.fixture
+def universe(tmpdir, request):
+    """ A new universe, which loads the SOM classes given as source strings
+        in the `som_classes` list of the test module """
+    return _create_universe_with_classes(tmpdir, request.module.som_classes)
+
+
+@pytest.fixture
+def universe_and_class(universe, request):
+    """ The universe, and the first class of `som_classes` """
+    name = _class_name(request.module.som_classes[0])
+    return universe, universe.load_class(universe.symbol_for(name))
@@ -64,6 +64,47 @@ class NodeTest(unittest.TestCase):
         for each in parent._child_nodes:
             self.assertIs(each, child2)
 
+    def test_get_children(self):
+        child1 = ChildNode()
+        child2 = ChildNode()
+
+        self.assertEqual([child1], RootNode(child1, None).get_children())
+        self.assertEqual([child1, child2],
+                         RootNode(child1, child2).get_children())
+        self.assertEqual([child2, child1],
+                         RootNodeWithChildList([child2, child1]).get_children())
+        self.assertEqual([], ChildNode().get_children())
+
+        # inherited child fields are not reported twice
+        self.assertEqual([child1, child2],
+                         RootNodeSubclass(child1, child2).get_children())
+
+    def test_deep_copy(self):
+        child1 = ValueNode(1)
+        child2 = ValueNode(2)
+        parent = RootNodeWithChildList([RootNode(child1, None), child2])
+        root   = RootNode(parent)
+
+        copy = root._child_node1.deep_copy()
+        self.assertIsNot(parent, copy)
+        self.assertIsNone(copy.get_parent())
+        self.assertEqual(2, len(copy._child_nodes))
+
+        sub_root, value = copy._child_nodes
+        self.assertIsNot(child2, value)
+        self.assertIs(copy, value.get_parent())
+        self.assertEqual(2, value._value)
+
+        self.assertIsNone(sub_root._child_node2)
+        self.assertIsNot(child1, sub_root._child_node1)
+        self.assertIs(sub_root, sub_root._child_node1.get_parent())
+        self.assertEqual(1, sub_root._child_node1._value)
+
+        # the original is unchanged
+        self.assertIs(parent, child2.get_parent())
+        self.assertEqual([RootNode, ValueNode],
+                         [type(n) for n in parent.get_children()])
+
 
 class RootNode(Node):
 
@@ -75,6 +116,10 @@ class RootNode(Node):
         self._child_node2 = self.adopt_child(child_node2)
 
 
+class RootNodeSubclass(RootNode):
+    pass
+
+
 class RootNodeWithChildList(Node):
 
     _child_nodes_ = ['_child_nodes[*]']
@@ -87,3 +132,12 @@ class RootNodeWithChildList(Node):
 
 class ChildNode(Node):
     pass
+
+
+class ValueNode(Node):
+
+    _immutable_fields_ = ['_value']
+
+    def __init__(self, value):
+        Node.__init__(self)
+        self._value = value
@@ -1,7 +1,8 @@
 import unittest
 from som.vm.globals import trueObject
 from som.vmobjects.array_strategy import Array, _EmptyStrategy, _ObjectStrategy, \
-    _LongStrategy, _PartiallyEmptyStrategy, _BoolStrategy
+    _LongStrategy, _PartiallyEmptyStrategy, _BoolStrategy, _DoubleStrategy
+from som.vmobjects.double import Double
 from som.vmobjects.integer import Integer
 
 
@@ -48,3 +49,21 @@ class ArrayTest(unittest.TestCase):
         self.assertIsNot(arr, new_arr)
         self.assertEqual(4, new_arr.get_number_of_indexable_fields())
         self.assertIsInstance(new_arr._strategy, _PartiallyEmptyStrategy)
+
+    def test_double_to_obj(self):
+        arr = Array.from_values([Double(1.5), Double(2.5)])
+        self.assertIsInstance(arr._strategy, _DoubleStrategy)
+
+        arr.set_indexable_field(1, Integer(3))
+        self.assertIsInstance(arr._strategy, _ObjectStrategy)
+        self.assertEqual(1.5, arr.get_indexable_field(0).get_embedded_double())
+        self.assertEqual(3, arr.get_indexable_field(1).get_embedded_integer())
+
+    def test_bool_to_obj(self):
+        arr = Array.from_values([trueObject, trueObject])
+        self.assertIsInstance(arr._strategy, _BoolStrategy)
+
+        arr.set_indexable_field(0, Integer(3))
+        self.assertIsInstance(arr._strategy, _ObjectStrategy)
+        self.assertEqual(3, arr.get_indexable_field(0).get_embedded_integer())
+        self.assertIs(trueObject, arr.get_indexable_field(1))
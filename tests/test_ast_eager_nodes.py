@@ -0,0 +1,117 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+from som.vm.globals import trueObject, falseObject
+
+pytestmark = pytest.mark.skipif(not is_ast_interpreter(),
+                                reason="eager message nodes of the AST compiler")
+
+if is_ast_interpreter():
+    from som.interpreter.ast.nodes.message.eager_node import \
+        EagerAddNode, EagerAtPutNode, EagerGreaterThanEqualNode, \
+        EagerValueArgNode
+
+
+_test_class = """AstEagerTest = (
+    + other = ( ^#plus )
+----
+    add          = ( ^3 + 4 )
+    addDouble    = ( ^(1.5 + 2) = 3.5 )
+    subtract     = ( ^3 - 4 )
+    multiply     = ( ^3 * 4 )
+    intDiv       = ( ^7 / 2 )
+    doubleDiv    = ( ^(7 // 2) = 3.5 )
+    modulo       = ( ^-7 % 2 )
+    lessThan     = ( ^3 < 4 )
+    lessEqual    = ( ^4 <= 4 )
+    greaterThan  = ( ^3 > 4 )
+    greaterEqual = ( ^4 >= 4 )
+    greaterEqualDouble = ( ^3.5 >= 4 )
+    equal        = ( ^3 = 3 )
+    equalString  = ( ^'abc' = 'abc' )
+    equalEqual   = ( ^3 == 3 )
+    equalEqualDouble = ( ^3 == 3.0 )
+    unequal      = ( ^3 ~= 4 )
+    at           = ( ^#(5 6 7) at: 2 )
+    atPut        = ( | a | a := Array new: 2. ^(a at: 1 put: 8) + (a at: 1) )
+    value        = ( ^[ 9 ] value )
+    valueArg     = ( ^[ :x | x + 1 ] value: 9 )
+    valueNonBlock = ( ^11 value )
+    userAdd      = ( ^self new + 3 )
+    polymorphic  = ( | r | #(1 2.5 'a') do: [ :e | r := e + e ]. ^r )
+)
+"""
+
+
+som_classes = [_test_class]
+
+
+def _execute(universe_and_class, selector):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    return u._start_method_execution(clazz, method)
+
+
+def _contains_node(node, node_class):
+    if isinstance(node, node_class):
+        return True
+    for child in node.get_children():
+        if _contains_node(child, node_class):
+            return True
+    return False
+
+
+@pytest.mark.parametrize("selector,expected_result", [
+    ("add",         7),
+    ("subtract",   -1),
+    ("multiply",   12),
+    ("intDiv",      3),
+    ("modulo",      1),
+    ("at",          6),
+    ("atPut",      16),
+    ("value",       9),
+    ("valueArg",   10),
+    ("valueNonBlock", 11),
+])
+def test_integer_results(universe_and_class, selector, expected_result):
+    result = _execute(universe_and_class, selector)
+    assert expected_result == result.get_embedded_integer()
+
+
+@pytest.mark.parametrize("selector,expected_result", [
+    ("addDouble",          True),
+    ("doubleDiv",          True),
+    ("lessThan",           True),
+    ("lessEqual",          True),
+    ("greaterThan",        False),
+    ("greaterEqual",       True),
+    ("greaterEqualDouble", False),
+    ("equal",              True),
+    ("equalString",        True),
+    ("equalEqual",         True),
+    ("equalEqualDouble",   False),
+    ("unequal",            True),
+])
+def test_boolean_results(universe_and_class, selector, expected_result):
+    result = _execute(universe_and_class, selector)
+    assert (trueObject if expected_result else falseObject) is result
+
+
+@pytest.mark.parametrize("selector,node_class", [
+    ("add",          EagerAddNode if is_ast_interpreter() else None),
+    ("greaterEqual", EagerGreaterThanEqualNode if is_ast_interpreter() else None),
+    ("atPut",        EagerAtPutNode if is_ast_interpreter() else None),
+    ("valueArg",     EagerValueArgNode if is_ast_interpreter() else None),
+])
+def test_parser_creates_eager_nodes(universe_and_class, selector, node_class):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    assert _contains_node(method.get_invokable(), node_class)
+
+
+def test_other_receivers_are_sent_the_message(universe_and_class):
+    u, _ = universe_and_class
+    assert u.symbol_for("plus") is _execute(universe_and_class, "userAdd")
+
+    result = _execute(universe_and_class, "polymorphic")
+    assert "aa" == result.get_embedded_string()
@@ -0,0 +1,121 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+from som.vm.globals import nilObject
+
+pytestmark = pytest.mark.skipif(not is_ast_interpreter(),
+                                reason="inlining of blocks by the AST compiler")
+
+if is_ast_interpreter():
+    from som.interpreter.ast.nodes.block_node import BlockNode, \
+        BlockNodeWithContext
+
+
+_test_class = """AstInliningTest = (
+----
+    | field |
+
+    ifTrue       = ( ^true  ifTrue: [ 1 ] )
+    ifTrueNil    = ( ^false ifTrue: [ 1 ] )
+    ifFalse      = ( ^false ifFalse: [ 2 ] )
+    ifTrueIfFalse = ( ^false ifTrue: [ 1 ] ifFalse: [ 3 ] )
+    ifFalseIfTrue = ( ^false ifFalse: [ 4 ] ifTrue: [ 1 ] )
+    and          = ( ^(true and: [ false ]) ifTrue: [ 1 ] ifFalse: [ 5 ] )
+    or           = ( ^(false or: [ true ]) ifTrue: [ 6 ] ifFalse: [ 1 ] )
+    whileTrue    = ( | i | i := 0. [ i < 7 ] whileTrue: [ i := i + 1 ]. ^i )
+    whileFalse   = ( | i | i := 0. [ i = 8 ] whileFalse: [ i := i + 1 ]. ^i )
+    whileResult  = ( ^([ false ] whileTrue: [ 1 ]) isNil ifTrue: [ 9 ] )
+    localReset   = ( | i c | i := 0. c := 0.
+                     [ i < 10 ] whileTrue: [ | t |
+                       t isNil ifTrue: [ c := c + 1 ].
+                       t := i.
+                       i := i + 1 ].
+                     ^c )
+    nestedBlock  = ( | b | true ifTrue: [ | x | x := 11. b := [ x ] ]. ^b value )
+    toDo         = ( | sum | sum := 0. 1 to: 4 do: [ :i | sum := sum + i ].
+                     ^sum + 2 )
+    toDoDouble   = ( | sum | sum := 0. 1 to: 3.5 do: [ :i | sum := sum + i ].
+                     ^sum + 7 )
+    toDoCaptured = ( | blocks sum | blocks := Array new: 3.
+                     1 to: 3 do: [ :i | blocks at: i put: [ i ] ].
+                     sum := 0. blocks do: [ :b | sum := sum + b value ].
+                     ^sum + 7 )
+    timesRepeat  = ( | c | c := 0. 14 timesRepeat: [ c := c + 1 ]. ^c )
+    ifNil        = ( ^nil ifNil: [ 15 ] )
+    ifNilNotNil  = ( ^16 ifNil: [ 1 ] )
+    deepNesting  = ( | a | a := 5.
+                     ^true ifTrue: [ | x | x := 7.
+                         [ :y | y > 0 ifTrue: [ [ a + x + y ] value ] ] value: 5 ] )
+    nonLocalReturn = ( true ifTrue: [ ^18 ]. ^0 )
+    nonLocalReturnInLoop = ( 1 to: 10 do: [ :i | i = 19 ifTrue: [ ^i ] ].
+                             ^19 + 1 )
+    nonLocalReturnInBlock = ( #(1 2 3) do: [ :e | e = 2 ifTrue: [ ^20 ] ]. ^0 )
+    fieldInLoop  = ( | i | field := 0. i := 0.
+                     [ i < 21 ] whileTrue: [ field := field + 1. i := i + 1 ].
+                     ^field )
+    nestedLoops  = ( | sum | sum := 0.
+                     1 to: 2 do: [ :i | 1 to: 11 do: [ :j | sum := sum + 1 ] ].
+                     ^sum )
+    superInBlock = ( ^true ifTrue: [ super name == #AstInliningTest
+                                       ifTrue: [ 23 ] ifFalse: [ 0 ] ] )
+    notLiteral   = ( | b c | c := 24. b := [ c ]. ^true ifTrue: b )
+)
+"""
+
+
+som_classes = [_test_class]
+
+
+def _contains_block(node):
+    if isinstance(node, BlockNode) or isinstance(node, BlockNodeWithContext):
+        return True
+    for child in node.get_children():
+        if _contains_block(child):
+            return True
+    return False
+
+
+@pytest.mark.parametrize("selector,expected_result,inlined", [
+    ("ifTrue",         1, True),
+    ("ifFalse",        2, True),
+    ("ifTrueIfFalse",  3, True),
+    ("ifFalseIfTrue",  4, True),
+    ("and",            5, True),
+    ("or",             6, True),
+    ("whileTrue",      7, True),
+    ("whileFalse",     8, True),
+    ("whileResult",    9, True),
+    ("localReset",    10, True),
+    ("nestedBlock",   11, False),
+    ("toDo",          12, True),
+    ("toDoDouble",    13, True),
+    ("toDoCaptured",  13, False),
+    ("timesRepeat",   14, True),
+    ("ifNil",         15, True),
+    ("ifNilNotNil",   16, True),
+    ("deepNesting",   17, False),
+    ("nonLocalReturn", 18, True),
+    ("nonLocalReturnInLoop", 20, True),
+    ("nonLocalReturnInBlock", 20, False),
+    ("fieldInLoop",   21, True),
+    ("nestedLoops",   22, True),
+    ("superInBlock",  23, True),
+    ("notLiteral",    24, False),
+])
+def test_inlining(universe_and_class, selector, expected_result, inlined):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+
+    assert inlined != _contains_block(method.get_invokable())
+
+    result = u._start_method_execution(clazz, method)
+    assert expected_result == result.get_embedded_integer()
+
+
+def test_if_true_on_false_is_nil(universe_and_class):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for("ifTrueNil"))
+    assert not _contains_block(method.get_invokable())
+
+    result = u._start_method_execution(clazz, method)
+    assert result is nilObject
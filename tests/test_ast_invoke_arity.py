@@ -0,0 +1,57 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+from som.vmobjects.integer import Integer
+
+pytestmark = pytest.mark.skipif(not is_ast_interpreter(),
+                                reason="invoke entry points of the AST interpreter")
+
+
+_test_class = """AstInvokeArityTest = (
+    a: a b: b c: c = ( ^a - b - c )
+    a: a b: b c: c d: d e: e = ( ^a - b - c - d - e )
+    doesNotUnderstand: selector arguments: arguments = (
+        ^arguments length + 30 )
+----
+    zero    = ( ^1 )
+    one: a  = ( ^a )
+    one     = ( ^self one: 2 )
+    two     = ( ^self new a: 3 b: 4 c: -4 )
+    three   = ( ^self new a: 10 b: 1 c: 2 d: 1 e: 2 )
+    shared  = ( ^self sharedArg: 5 )
+    sharedArg: a = ( ^[ a ] value )
+    block2  = ( ^[ :a :b | a - b ] value: 9 with: 3 )
+    perform = ( ^self new perform: #a:b:c:d:e: withArguments: #(20 1 2 3 4) )
+    dnu     = ( ^self new foo: 1 bar: 2 )
+    dnu3    = ( ^self new foo: 1 bar: 2 baz: 3 qux: 4 )
+)
+"""
+
+
+som_classes = [_test_class]
+
+
+@pytest.mark.parametrize("selector,expected_result", [
+    ("zero",     1),
+    ("one",      2),
+    ("two",      3),
+    ("three",    4),
+    ("shared",   5),
+    ("block2",   6),
+    ("perform", 10),
+    ("dnu",     32),
+    ("dnu3",    34),
+])
+def test_invoke_with_arity(universe_and_class, selector, expected_result):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    result = u._start_method_execution(clazz, method)
+    assert expected_result == result.get_embedded_integer()
+
+
+def test_invoke_with_argument_list(universe_and_class):
+    u, clazz = universe_and_class
+    method = clazz.lookup_invokable(u.symbol_for("a:b:c:d:e:"))
+    args = [Integer.box(i) for i in [15, 1, 2, 3, 4]]
+    result = method.invoke(clazz, args)
+    assert 5 == result.get_embedded_integer()
@@ -0,0 +1,46 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+
+pytestmark = pytest.mark.skipif(not is_ast_interpreter(),
+                                reason="non-local returns of the AST interpreter")
+
+
+_test_class = """AstNonLocalReturnTest = (
+----
+    plain        = ( ^1 )
+    blockNoReturn = ( ^[ 2 ] value )
+    blockReturn  = ( [ ^3 ] value. ^0 )
+    nestedReturn = ( [ [ ^4 ] value ] value. ^0 )
+    inlinedReturn = ( true ifTrue: [ ^5 ]. ^0 )
+    loopReturn   = ( #(1 6 3) do: [ :e | e > 5 ifTrue: [ ^e ] ]. ^0 )
+    escaped      = ( ^(self escape: 7) value )
+    escape: v    = ( ^[ v ] )
+)
+"""
+
+
+som_classes = [_test_class]
+
+
+@pytest.mark.parametrize("selector,expected_result,catches", [
+    ("plain",         1, False),
+    ("blockNoReturn", 2, False),
+    ("blockReturn",   3, True),
+    ("nestedReturn",  4, True),
+    ("inlinedReturn", 5, True),
+    ("loopReturn",    6, True),
+    ("escaped",       7, False),
+])
+def test_only_methods_with_non_local_returns_catch_them(
+        universe_and_class, selector, expected_result, catches):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    invokable = method.get_invokable()
+    assert catches == invokable.catches_non_local_return()
+
+    frame = invokable._create_frame(clazz, None, None, None, [])
+    assert catches == (frame.get_on_stack_marker() is not None)
+
+    result = u._start_method_execution(clazz, method)
+    assert expected_result == result.get_embedded_integer()
@@ -0,0 +1,126 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+from som.vm.universe import create_universe
+
+pytestmark = pytest.mark.skipif(not is_ast_interpreter(),
+                                reason="splitting of methods in the AST interpreter")
+
+if is_ast_interpreter():
+    from som.interpreter.ast.nodes.dispatch import split_budget, \
+        UninitializedDispatchNode
+    from som.interpreter.ast.nodes.message.generic_node import \
+        GenericMessageNode
+
+
+_test_class = """AstSplittingTest = (
+----
+    describe: x = ( ^x asString length )
+    countdown: n = ( n asString. ^n = 0 ifTrue: [ 0 ] ifFalse: [
+                       self countdown: n - 1 ] )
+
+    describeAll = ( ^(self describe: 123) + (self describe: #ab) +
+                     (self describe: 1.5) )
+    recurse     = ( ^(self countdown: 3) + (self countdown: 2.5 - 0.5) )
+)
+"""
+
+
+som_classes = [_test_class]
+
+
+@pytest.fixture
+def budget():
+    remaining = split_budget.get_remaining()
+    yield split_budget
+    split_budget.set_budget(remaining)
+
+
+def _execute(u, clazz, selector):
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    return u._start_method_execution(clazz, method).get_embedded_integer()
+
+
+def _sends(node, selector):
+    result = []
+    if (isinstance(node, GenericMessageNode) and
+            node._selector.get_embedded_string() == selector):
+        result.append(node)
+    for child in node.get_children():
+        result += _sends(child, selector)
+    return result
+
+
+def _cached_methods(send):
+    methods = []
+    dispatch = send._dispatch
+    while not isinstance(dispatch, UninitializedDispatchNode):
+        methods.append(dispatch._cached_method)
+        dispatch = dispatch._next
+    return methods
+
+
+def test_polymorphic_method_is_split_per_call_site(universe_and_class,
+                                                   budget):
+    u, clazz = universe_and_class
+    budget.set_budget(1000)
+    describe = clazz.get_class(u).lookup_invokable(u.symbol_for("describe:"))
+    caller   = clazz.get_class(u).lookup_invokable(u.symbol_for("describeAll"))
+
+    assert 8 == _execute(u, clazz, "describeAll")
+    assert describe.get_invokable().has_polymorphic_dispatch()
+
+    assert 8 == _execute(u, clazz, "describeAll")
+    sends = _sends(caller.get_invokable(), "describe:")
+    assert 3 == len(sends)
+
+    copies = [_cached_methods(send)[0] for send in sends]
+    for copy in copies:
+        assert copy is not describe
+        assert copy.get_invokable().get_split_source() is describe.get_invokable()
+
+        # each copy saw a single receiver class for asString
+        as_string, = _sends(copy.get_invokable(), "asString")
+        assert 1 == len(_cached_methods(as_string))
+
+    assert 1000 > budget.get_remaining()
+
+
+def test_recursive_calls_are_not_split(universe_and_class, budget):
+    u, clazz = universe_and_class
+    budget.set_budget(1000)
+
+    for _ in range(3):
+        assert 0 == _execute(u, clazz, "recurse")
+
+    countdown = clazz.get_class(u).lookup_invokable(u.symbol_for("countdown:"))
+    for copy in _cached_methods(
+            _sends(countdown.get_invokable(), "countdown:")[0]):
+        assert copy is countdown
+
+
+def test_no_splitting_without_budget(universe_and_class, budget):
+    u, clazz = universe_and_class
+    budget.set_budget(0)
+    describe = clazz.get_class(u).lookup_invokable(u.symbol_for("describe:"))
+    caller   = clazz.get_class(u).lookup_invokable(u.symbol_for("describeAll"))
+
+    for _ in range(2):
+        assert 8 == _execute(u, clazz, "describeAll")
+    for send in _sends(caller.get_invokable(), "describe:"):
+        assert [describe] == _cached_methods(send)
+
+
+@pytest.mark.parametrize("value", ["foo", "-3", ""])
+def test_invalid_split_budget_prints_usage(budget, capfd, value):
+    remaining = budget.get_remaining()
+    u = create_universe(True)
+    u.handle_arguments(["-splitbudget", value])
+    assert "Usage" in capfd.readouterr()[0]
+    assert budget.get_remaining() == remaining
+
+
+def test_split_budget_option(budget):
+    u = create_universe(True)
+    assert u.handle_arguments(["-splitbudget", "42", "Foo"]) == ["Foo"]
+    assert budget.get_remaining() == 42
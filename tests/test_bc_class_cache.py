@@ -0,0 +1,108 @@
+import os
+import pytest
+
+from som.interp_type import is_ast_interpreter
+from som.vm.universe import create_universe, set_current
+
+pytestmark = pytest.mark.skipif(is_ast_interpreter(),
+                                reason="the class cache stores bytecodes")
+
+if not is_ast_interpreter():
+    from som.compiler.bc.class_cache import ClassCacheError, _Writer
+
+
+_test_class = """ClassCacheTest = (
+    | a b |
+----
+    literals = ( ^#(1 -2 'str' #sym 1.5 12345678901) )
+    blocks   = ( | x | x := 3. ^[ :y | [ x + y ] value ] value: 4 )
+    loop     = ( | i | i := 0. [ i < 5 ] whileTrue: [ i := i + 1 ]. ^i )
+    clean    = ( ^[ :x | x * 2 ] )
+)
+"""
+
+
+def _new_universe(class_dir, cache_dir=None):
+    u = create_universe()
+    set_current(u)
+    u.setup_classpath("Smalltalk" + os.pathsep + str(class_dir))
+    if cache_dir is not None:
+        u.get_class_cache().set_cache_dir(str(cache_dir))
+    u._initialize_object_system()
+    return u
+
+
+def _cache_file(cache_dir):
+    files = cache_dir.listdir("ClassCacheTest-*.somc")
+    assert 1 == len(files)
+    return files[0]
+
+
+def _execute(u, selector):
+    clazz = u.load_class(u.symbol_for("ClassCacheTest"))
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    return u._start_method_execution(clazz, method)
+
+
+def _literals_as_strings(u):
+    arr = _execute(u, "literals")
+    return [str(arr.get_indexable_field(i))
+            for i in range(arr.get_number_of_indexable_fields())]
+
+
+def test_cached_class_behaves_like_parsed_class(tmpdir):
+    tmpdir.join("ClassCacheTest.som").write(_test_class)
+    cache_dir = tmpdir.mkdir("cache")
+
+    u = _new_universe(tmpdir, cache_dir)
+    literals = _literals_as_strings(u)
+    assert 7 == _execute(u, "blocks").get_embedded_integer()
+    assert _cache_file(cache_dir).check()
+
+    u = _new_universe(tmpdir, cache_dir)
+    clazz = u.load_class(u.symbol_for("ClassCacheTest"))
+    assert 2 == clazz.get_number_of_instance_fields()
+    assert literals == _literals_as_strings(u)
+    assert 7 == _execute(u, "blocks").get_embedded_integer()
+    assert 5 == _execute(u, "loop").get_embedded_integer()
+
+    block = _execute(u, "clean")
+    assert block is _execute(u, "clean")
+    assert block.get_context() is None
+    assert block.get_method().get_holder() is clazz.get_class(u)
+
+
+def test_changed_source_is_recompiled(tmpdir):
+    source = tmpdir.join("ClassCacheTest.som")
+    source.write(_test_class)
+    cache_dir = tmpdir.mkdir("cache")
+    u = _new_universe(tmpdir, cache_dir)
+    assert 5 == _execute(u, "loop").get_embedded_integer()
+
+    source.write(_test_class.replace("i < 5", "i < 6"))
+    u = _new_universe(tmpdir, cache_dir)
+    assert 6 == _execute(u, "loop").get_embedded_integer()
+
+
+def test_corrupt_cache_file_is_ignored(tmpdir):
+    tmpdir.join("ClassCacheTest.som").write(_test_class)
+    cache_dir = tmpdir.mkdir("cache")
+    u = _new_universe(tmpdir, cache_dir)
+    assert 5 == _execute(u, "loop").get_embedded_integer()
+
+    cache_file = _cache_file(cache_dir)
+    cache_file.write(cache_file.read()[:40])
+    u = _new_universe(tmpdir, cache_dir)
+    assert 5 == _execute(u, "loop").get_embedded_integer()
+
+
+def test_classes_are_not_cached_without_cache_dir(tmpdir):
+    tmpdir.join("ClassCacheTest.som").write(_test_class)
+    u = _new_universe(tmpdir)
+    assert 5 == _execute(u, "loop").get_embedded_integer()
+    assert [] == tmpdir.listdir("*.somc")
+
+
+def test_unsupported_literal_raises_class_cache_error():
+    with pytest.raises(ClassCacheError):
+        _Writer()._write_literal(object())
@@ -0,0 +1,143 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+
+pytestmark = pytest.mark.skipif(is_ast_interpreter(),
+                                reason="contexts of the BC interpreter")
+
+if not is_ast_interpreter():
+    from som.interpreter.bc.bytecodes import bytecode_length, Bytecodes
+    from som.interpreter.bc.frame import Context, create_frame
+    from som.vmobjects.block_bc import BcBlock
+
+
+_test_class = """ClosureTest = (
+    | field |
+    field: val = ( field := val )
+    fieldBlock = ( ^[ field ] )
+----
+    counter = ( | c | c := 0. ^[ c := c + 1 ] )
+    counters = ( | a b | a := self counter. b := self counter.
+                 a value. a value. b value.
+                 ^a value * 10 + b value )
+    argument: n = ( ^[ :x | x + n ] )
+    arguments = ( ^(self argument: 3) value: 4 )
+    nested = ( | a | a := 1.
+               ^[ | b | b := 10.
+                  [ | c | c := 100. [ a + b + c ] value ] value ] value )
+    nestedWrite = ( | a | a := 0.
+                    [ [ a := a + 1 ] value. [ a := a + 2 ] value ] value.
+                    ^a )
+    inLoop = ( | blocks sum | blocks := Array new: 3.
+               1 to: 3 do: [ :i | blocks at: i put: [ i ] ].
+               sum := 0. blocks do: [ :b | sum := sum + b value ].
+               ^sum )
+    selfInBlock = ( ^(self new field: 5) fieldBlock value )
+    nonLocal = ( #(1 2 3) do: [ :e | e = 2 ifTrue: [ ^e * 10 ] ]. ^0 )
+    notCaptured = ( | a b | a := 1. b := 2. ^[ a ] value + b )
+    cleanBlock  = ( ^[ :a :b | | c | c := a < b. c ] )
+    cleanOuter  = ( ^[ :a | [ :b | a + b ] ] )
+    cleanSum    = ( ^((self cleanOuter value: 1) value: 2) +
+                     ((self cleanOuter value: 3) value: 4) )
+)
+"""
+
+
+som_classes = [_test_class]
+
+
+def _method(u, clazz, selector):
+    return clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+
+
+def _bytecodes(method):
+    result = []
+    i = 0
+    while i < method.get_number_of_bytecodes():
+        bc = method.get_bytecode(i)
+        result.append(bc)
+        i += bytecode_length(bc)
+    return result
+
+
+@pytest.mark.parametrize("selector,expected", [
+    ("counters",    32),
+    ("arguments",   7),
+    ("nested",      111),
+    ("nestedWrite", 3),
+    ("inLoop",      6),
+    ("selfInBlock", 5),
+    ("nonLocal",    20),
+    ("notCaptured", 3),
+    ("cleanSum",    10),
+])
+def test_closures(universe_and_class, selector, expected):
+    u, clazz = universe_and_class
+    result = u._start_method_execution(clazz, _method(u, clazz, selector))
+    assert expected == result.get_embedded_integer()
+
+
+def test_blocks_reference_only_the_context(universe_and_class):
+    u, clazz = universe_and_class
+    block = u._start_method_execution(clazz, _method(u, clazz, "counter"))
+    context = block.get_context()
+    assert isinstance(context, Context)
+    assert 1 == block.get_method().get_number_of_arguments()
+    assert context.get_outer() is None
+
+
+def test_block_frames_keep_receiver_and_home_context(universe_and_class):
+    u, clazz = universe_and_class
+    block = u._start_method_execution(clazz, _method(u, clazz, "counter"))
+    home  = Context(None, clazz, 0)
+    outer = Context(home, clazz, 0)
+    frame = create_frame(None, block.get_method(), Context(outer, clazz, 0))
+    assert frame.get_self() is clazz
+    assert frame.get_home_context() is home
+
+
+def test_only_captured_variables_are_in_the_context(universe_and_class):
+    u, clazz = universe_and_class
+    method = _method(u, clazz, "notCaptured")
+    assert 1 == method.get_number_of_context_values()
+
+    bytecodes = _bytecodes(method)
+    assert Bytecodes.pop_context in bytecodes
+    assert Bytecodes.pop_local in bytecodes
+
+    method = _method(u, clazz, "argument:")
+    assert 1 == method.get_number_of_context_values()
+    assert [1] == method.get_captured_arguments()
+
+
+def test_clean_blocks_are_preallocated(universe_and_class):
+    u, clazz = universe_and_class
+    method = _method(u, clazz, "cleanBlock")
+    block1 = u._start_method_execution(clazz, method)
+    block2 = u._start_method_execution(clazz, method)
+    assert block1 is block2
+    assert block1.get_context() is None
+    assert not method.creates_blocks()
+    assert Bytecodes.push_block not in _bytecodes(method)
+    assert method.get_holder() is block1.get_method().get_holder()
+
+
+def test_blocks_accessing_their_outer_context_are_not_preallocated(
+        universe_and_class):
+    u, clazz = universe_and_class
+    for selector in ["counter", "fieldBlock"]:
+        holder = clazz if selector == "fieldBlock" else clazz.get_class(u)
+        method = holder.lookup_invokable(u.symbol_for(selector))
+        assert method.creates_blocks()
+        assert Bytecodes.push_block in _bytecodes(method)
+
+    # the outer block is clean, only its nested block needs a context
+    method = _method(u, clazz, "cleanOuter")
+    assert not method.creates_blocks()
+    blocks = [method.get_literal(i)
+              for i in range(method.get_number_of_literals())
+              if isinstance(method.get_literal(i), BcBlock)]
+    assert 1 == len(blocks)
+    outer_block = blocks[0]
+    assert outer_block.get_context() is None
+    assert outer_block.get_method().creates_blocks()
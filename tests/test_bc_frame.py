@@ -0,0 +1,101 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+from som.vm.globals import nilObject
+from som.vm.universe import create_universe, set_current
+from som.vmobjects.integer import Integer
+
+pytestmark = pytest.mark.skipif(is_ast_interpreter(),
+                                reason="frames of the BC interpreter")
+
+if not is_ast_interpreter():
+    from som.interpreter.bc.frame import create_frame
+    from som.vmobjects.method_bc import BcMethod
+
+
+@pytest.fixture
+def method():
+    u = create_universe()
+    set_current(u)
+    # two arguments (self and one), one local, and a stack of two elements
+    return BcMethod([], 1, 2, 1, u.symbol_for("with:"))
+
+
+def test_arguments_locals_and_stack_are_separate(method):
+    caller = create_frame(None, method, None)
+    caller.push(Integer.box(1))
+    caller.push(Integer.box(2))
+
+    frame = create_frame(caller, method, None)
+    frame.copy_arguments_from(caller, 2)
+    assert 1 == frame.get_argument(0).get_embedded_integer()
+    assert 2 == frame.get_argument(1).get_embedded_integer()
+    assert frame.get_local(0) is nilObject
+
+    frame.set_local(0, Integer.box(3))
+    frame.push(Integer.box(4))
+    assert 3 == frame.get_local(0).get_embedded_integer()
+    assert 4 == frame.pop().get_embedded_integer()
+    assert 2 == frame.get_argument(1).get_embedded_integer()
+
+    caller.pop_old_arguments_and_push_result(method, Integer.box(5))
+    assert 5 == caller.pop().get_embedded_integer()
+
+
+def test_captured_arguments_are_copied_into_the_context(method):
+    method.set_context_layout(2, [1])
+    caller = create_frame(None, method, None)
+    caller.push(Integer.box(1))
+    caller.push(Integer.box(2))
+
+    frame = create_frame(caller, method, None)
+    frame.copy_arguments_from(caller, 2)
+    context = frame.get_inner_context()
+    assert context.get_home() is context
+    assert 1 == context.get_receiver().get_embedded_integer()
+    assert 2 == frame.get_context_value(0, 0).get_embedded_integer()
+    assert frame.get_context_value(1, 0) is nilObject
+
+    block_frame = create_frame(frame, method, context)
+    block_frame.copy_arguments_from(caller, 2)
+    block_frame.set_context_value(1, 1, Integer.box(6))
+    assert 6 == frame.get_context_value(1, 0).get_embedded_integer()
+    assert block_frame.get_home_context() is context
+    assert 1 == block_frame.get_self().get_embedded_integer()
+
+
+_test_class = """FramePoolTest = (
+----
+    fib: n = ( n < 2 ifTrue: [ ^n ]. ^(self fib: n - 1) + (self fib: n - 2) )
+    counter = ( | c | c := 0. ^[ c := c + 1 ] )
+    count = ( | b | b := self counter. b value. ^b value )
+)
+"""
+
+
+som_classes = [_test_class]
+
+
+def _method(u, clazz, selector):
+    return clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+
+
+def test_frames_of_methods_without_blocks_are_reused(universe_and_class):
+    u, clazz = universe_and_class
+    fib = _method(u, clazz, "fib:")
+    assert not fib.creates_blocks()
+    assert _method(u, clazz, "counter").creates_blocks()
+
+    frame = create_frame(None, _method(u, clazz, "count"), None)
+    frame.push(clazz)
+    frame.push(Integer.box(10))
+    fib.invoke(frame, u.get_interpreter())
+    assert 55 == frame.pop().get_embedded_integer()
+    assert 0 < len(fib._frame_pool)
+
+
+def test_captured_frames_are_not_reused(universe_and_class):
+    u, clazz = universe_and_class
+    result = u._start_method_execution(clazz, _method(u, clazz, "count"))
+    assert 2 == result.get_embedded_integer()
+    assert _method(u, clazz, "counter")._frame_pool is None
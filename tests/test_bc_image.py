@@ -0,0 +1,85 @@
+import os
+import pytest
+
+from som.interp_type import is_ast_interpreter
+from som.vm.universe import create_universe, set_current
+
+pytestmark = pytest.mark.skipif(is_ast_interpreter(),
+                                reason="images store bytecode methods")
+
+
+_test_class = """ImageTest = (
+    | a |
+    a = ( ^a )
+    a: val = ( a := val )
+----
+    | counter |
+    sum      = ( | s | s := 0. #(1 2 3 4) do: [ :e | s := s + e ]. ^s )
+    literals = ( ^#(1.5 'str' #sym 12345678901) )
+    clean    = ( ^[ :x | x * 2 ] )
+    field    = ( | o | o := self new. o a: 42. ^o a )
+    count    = ( counter isNil ifTrue: [ counter := 0 ].
+                 counter := counter + 1. ^counter )
+)
+"""
+
+
+def _new_universe(classpath):
+    u = create_universe()
+    set_current(u)
+    u.setup_classpath(classpath)
+    return u
+
+
+def _execute(u, selector):
+    clazz = u.load_class(u.symbol_for("ImageTest"))
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    return u._start_method_execution(clazz, method)
+
+
+@pytest.fixture
+def image_file(tmpdir):
+    source = tmpdir.join("ImageTest.som")
+    source.write(_test_class)
+    image = str(tmpdir.join("test.image"))
+
+    u = _new_universe("Smalltalk" + os.pathsep + str(tmpdir))
+    u._initialize_object_system()
+    _execute(u, "count")
+    u._save_image(image, ["ImageTest"])
+
+    # the class needs to come from the image
+    source.remove()
+    return image
+
+
+def test_image_restores_classes_and_primitives(image_file):
+    u = _new_universe("")
+    system_object = u._load_image(image_file)
+
+    assert system_object.get_class(u) is u.systemClass
+    assert u.is_object_system_initialized()
+    assert 10 == _execute(u, "sum").get_embedded_integer()
+    assert 42 == _execute(u, "field").get_embedded_integer()
+
+    arr = _execute(u, "literals")
+    assert ["1.5", '"str"', "#sym", "12345678901"] == [
+        str(arr.get_indexable_field(i)) for i in range(4)]
+
+    block = _execute(u, "clean")
+    assert block is _execute(u, "clean")
+    assert 2 == block.get_method().get_number_of_arguments()
+
+
+def test_image_restores_class_side_fields(image_file):
+    u = _new_universe("")
+    u._load_image(image_file)
+    assert 2 == _execute(u, "count").get_embedded_integer()
+
+
+def test_symbols_are_shared(image_file):
+    u = _new_universe("")
+    u._load_image(image_file)
+    clazz = u.load_class(u.symbol_for("ImageTest"))
+    assert clazz.get_name() is u.symbol_for("ImageTest")
+    assert u.get_global(u.symbol_for("ImageTest")) is clazz
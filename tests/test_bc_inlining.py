@@ -0,0 +1,111 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+from som.vm.globals import nilObject
+
+pytestmark = pytest.mark.skipif(is_ast_interpreter(),
+                                reason="inlining into jumps is done by the BC compiler")
+
+if not is_ast_interpreter():
+    from som.interpreter.bc.bytecodes import bytecode_length, Bytecodes
+
+
+_test_class = """InliningTest = (
+----
+    | field |
+
+    ifTrue       = ( ^true  ifTrue: [ 1 ] )
+    ifTrueNil    = ( ^false ifTrue: [ 1 ] )
+    ifFalse      = ( ^false ifFalse: [ 2 ] )
+    ifTrueIfFalse = ( ^false ifTrue: [ 1 ] ifFalse: [ 3 ] )
+    ifFalseIfTrue = ( ^false ifFalse: [ 4 ] ifTrue: [ 1 ] )
+    and          = ( ^(true and: [ false ]) ifTrue: [ 1 ] ifFalse: [ 5 ] )
+    or           = ( ^(false or: [ true ]) ifTrue: [ 6 ] ifFalse: [ 1 ] )
+    whileTrue    = ( | i | i := 0. [ i < 7 ] whileTrue: [ i := i + 1 ]. ^i )
+    whileFalse   = ( | i | i := 0. [ i = 8 ] whileFalse: [ i := i + 1 ]. ^i )
+    whileResult  = ( ^([ false ] whileTrue: [ 1 ]) isNil ifTrue: [ 9 ] )
+    localReset   = ( | i c | i := 0. c := 0.
+                     [ i < 10 ] whileTrue: [ | t |
+                       t isNil ifTrue: [ c := c + 1 ].
+                       t := i.
+                       i := i + 1 ].
+                     ^c )
+    nestedBlock  = ( | b | true ifTrue: [ | x | x := 11. b := [ x ] ]. ^b value )
+    deepNesting  = ( | a | a := 5.
+                     ^true ifTrue: [ | x | x := 7.
+                         [ :y | y > 0 ifTrue: [ [ a + x + y ] value ] ] value: 1 ] )
+    nonLocalReturn = ( true ifTrue: [ ^14 ]. ^0 )
+    nonLocalReturnInBlock = ( #(1 2 3) do: [ :e | e = 2 ifTrue: [ ^15 ] ]. ^0 )
+    fieldInLoop  = ( | i | field := 0. i := 0.
+                     [ i < 16 ] whileTrue: [ field := field + 1. i := i + 1 ].
+                     ^field )
+    notLiteral   = ( | b c | c := 17. b := [ c ]. ^true ifTrue: b )
+    capturedInLoop = ( | i blocks |
+                     i := 1. blocks := Array new: 3.
+                     [ i <= 3 ] whileTrue: [ | t |
+                       t := i * 10. blocks at: i put: [ t ]. i := i + 1 ].
+                     ^self sum: blocks )
+    capturedInIfTrueInLoop = ( | i blocks |
+                     i := 1. blocks := Array new: 3.
+                     [ i <= 3 ] whileTrue: [
+                       true ifTrue: [ | t |
+                         t := i * 10. blocks at: i put: [ t ] ].
+                       i := i + 1 ].
+                     ^self sum: blocks )
+    sum: blocks  = ( | sum | sum := 0.
+                     blocks do: [ :b | sum := sum + b value ].
+                     ^sum )
+)
+"""
+
+
+def _contains_bytecode(method, bytecode):
+    i = 0
+    while i < method.get_number_of_bytecodes():
+        bc = method.get_bytecode(i)
+        if bc == bytecode:
+            return True
+        i += bytecode_length(bc)
+    return False
+
+
+som_classes = [_test_class]
+
+
+@pytest.mark.parametrize("selector,expected_result,inlined", [
+    ("ifTrue",         1, True),
+    ("ifFalse",        2, True),
+    ("ifTrueIfFalse",  3, True),
+    ("ifFalseIfTrue",  4, True),
+    ("and",            5, True),
+    ("or",             6, True),
+    ("whileTrue",      7, True),
+    ("whileFalse",     8, True),
+    ("whileResult",    9, True),
+    ("localReset",    10, True),
+    ("nestedBlock",   11, False),
+    ("deepNesting",   13, False),
+    ("nonLocalReturn", 14, True),
+    ("nonLocalReturnInBlock", 15, False),
+    ("fieldInLoop",   16, True),
+    ("notLiteral",    17, False),
+    ("capturedInLoop", 60, False),
+    ("capturedInIfTrueInLoop", 60, False),
+])
+def test_inlining(universe_and_class, selector, expected_result, inlined):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+
+    assert inlined != _contains_bytecode(method, Bytecodes.push_block)
+
+    result = u._start_method_execution(clazz, method)
+    assert expected_result == result.get_embedded_integer()
+
+
+def test_if_true_on_false_is_nil(universe_and_class):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for("ifTrueNil"))
+    assert _contains_bytecode(method, Bytecodes.jump_on_false_top_nil)
+
+    result = u._start_method_execution(clazz, method)
+    assert result is nilObject
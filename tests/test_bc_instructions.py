@@ -0,0 +1,67 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+
+pytestmark = pytest.mark.skipif(is_ast_interpreter(),
+                                reason="instructions of the BC interpreter")
+
+if not is_ast_interpreter():
+    from som.interpreter.bc.bytecodes import bytecode_length, Bytecodes
+    from som.interpreter.bc.instructions import decode_instructions
+
+
+_test_class = """InstructionTest = (
+    | field |
+    incField = ( field := 0. [ field < 5 ] whileTrue: [ field := field + 1 ].
+                 ^field )
+----
+    loop = ( | i | i := 0. [ i < 10 ] whileTrue: [ i := i + 1 ]. ^i )
+    incField = ( ^self new incField )
+)
+"""
+
+
+som_classes = [_test_class]
+
+
+def _bytecode_indexes(method):
+    result = []
+    i = 0
+    while i < method.get_number_of_bytecodes():
+        result.append(i)
+        i += bytecode_length(method.get_bytecode(i))
+    return result
+
+
+def test_instructions_carry_resolved_operands(universe_and_class):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for("loop"))
+    instructions = decode_instructions(method)
+
+    indexes = _bytecode_indexes(method)
+    assert indexes == [inst.bytecode_index for inst in instructions]
+
+    for inst in instructions:
+        assert inst.bytecode == method.get_bytecode(inst.bytecode_index)
+        if inst.bytecode == Bytecodes.push_constant:
+            assert inst.literal is method.get_constant(inst.bytecode_index)
+        elif inst.bytecode == Bytecodes.jump_backward:
+            target = instructions[inst.target]
+            assert target.bytecode_index == (
+                inst.bytecode_index - method.get_jump_offset(inst.bytecode_index))
+        elif inst.bytecode == Bytecodes.add_to_local:
+            assert 1 == inst.literal.get_embedded_integer()
+            assert 0 <= inst.send_site < method.get_number_of_send_sites()
+
+    assert 10 == u._start_method_execution(clazz, method).get_embedded_integer()
+
+
+def test_field_accesses_use_their_site(universe_and_class):
+    u, clazz = universe_and_class
+    method = clazz.lookup_invokable(u.symbol_for("incField"))
+    sites = [inst.field_site for inst in decode_instructions(method)
+             if inst.field_site != -1]
+    assert list(range(method.get_number_of_field_sites())) == sites
+
+    main = clazz.get_class(u).lookup_invokable(u.symbol_for("incField"))
+    assert 5 == u._start_method_execution(clazz, main).get_embedded_integer()
@@ -0,0 +1,101 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+
+pytestmark = pytest.mark.skipif(is_ast_interpreter(),
+                                reason="quick sends and superinstructions of the BC interpreter")
+
+if not is_ast_interpreter():
+    from som.interpreter.bc.bytecodes import bytecode_length, Bytecodes
+
+
+_test_class = """QuickSendTest = (
+    | field |
+    field = ( ^field )
+    self  = ( ^self )
+    incField = ( | i | field := 0. i := 0.
+                 [ i < 10 ] whileTrue: [ field := field + 2. i := i + 1 ].
+                 ^field )
+----
+    intArith    = ( ^3 + 4 * 5 - 1 )
+    mixedArith  = ( ^(1 + 1.5) * 2 )
+    division    = ( ^(7 / 2) + (7 % 2) + (7 // 2) )
+    comparisons = ( | c | c := 0.
+                    1 < 2    ifTrue: [ c := c + 1 ].
+                    2 > 1    ifTrue: [ c := c + 1 ].
+                    2 <= 2   ifTrue: [ c := c + 1 ].
+                    2 = 2    ifTrue: [ c := c + 1 ].
+                    2 == 2   ifTrue: [ c := c + 1 ].
+                    1.5 < 2  ifTrue: [ c := c + 1 ].
+                    'a' = 'a' ifTrue: [ c := c + 1 ].
+                    ^c )
+    atAndAtPut  = ( | a | a := Array new: 3.
+                    a at: 1 put: 5.
+                    ^(a at: 1) + (a at: 1 put: 6) size )
+    hashMapAt   = ( | m | m := HashMap new. m at: 1 put: 15. ^m at: 1 )
+    blockValue  = ( | b | b := [ 11 ]. ^b value )
+    valueOfInt  = ( ^12 value )
+    addToLocal  = ( | i | i := 0. [ i < 13 ] whileTrue: [ i := i + 1 ]. ^i )
+    lastAssign  = ( ^[ | x | x := 14 ] value )
+    incField    = ( ^self new incField )
+    returnSelf  = ( | o | o := self new. ^(o self == o) ifTrue: [ 16 ] )
+)
+"""
+
+
+def _contains_bytecode(method, bytecode):
+    i = 0
+    while i < method.get_number_of_bytecodes():
+        bc = method.get_bytecode(i)
+        if bc == bytecode:
+            return True
+        i += bytecode_length(bc)
+    return False
+
+
+som_classes = [_test_class]
+
+
+def _execute(u, clazz, selector):
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    return u._start_method_execution(clazz, method)
+
+
+@pytest.mark.parametrize("selector,expected", [
+    ("intArith",    34),
+    ("mixedArith",  "5.0"),
+    ("division",    "7.5"),
+    ("comparisons", 7),
+    ("atAndAtPut",  8),
+    ("hashMapAt",   15),
+    ("blockValue",  11),
+    ("valueOfInt",  12),
+    ("addToLocal",  13),
+    ("lastAssign",  14),
+    ("incField",    20),
+    ("returnSelf",  16),
+])
+def test_quick_sends(universe_and_class, selector, expected):
+    u, clazz = universe_and_class
+    result = _execute(u, clazz, selector)
+    if isinstance(expected, int):
+        assert expected == result.get_embedded_integer()
+    else:
+        assert expected == str(result)
+
+
+@pytest.mark.parametrize("selector,class_side,bytecode", [
+    ("addToLocal", True,  "add_to_local"),
+    ("incField",   False, "add_to_field"),
+    ("field",      False, "return_field"),
+    ("self",       False, "return_self"),
+    ("comparisons", True, "less_than"),
+    ("division",   True,  "int_div"),
+    ("atAndAtPut", True,  "at_put"),
+])
+def test_superinstructions_are_emitted(universe_and_class, selector,
+                                       class_side, bytecode):
+    u, clazz = universe_and_class
+    holder = clazz.get_class(u) if class_side else clazz
+    method = holder.lookup_invokable(u.symbol_for(selector))
+    assert _contains_bytecode(method, getattr(Bytecodes, bytecode))
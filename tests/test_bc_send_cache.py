@@ -0,0 +1,137 @@
+import pytest
+
+from som.interp_type import is_ast_interpreter
+from som.vmobjects.integer import Integer
+from som.vmobjects.primitive import Primitive
+
+pytestmark = pytest.mark.skipif(is_ast_interpreter(),
+                                reason="send caches of the BC interpreter")
+
+
+_test_class = """SendCacheTest = (
+    foo = ( ^1 )
+----
+    callFoo = ( ^self new foo )
+    megamorphic = ( | arr count |
+        arr := Array new: 9.
+        arr at: 1 put: 1.
+        arr at: 2 put: 'str'.
+        arr at: 3 put: #sym.
+        arr at: 4 put: 1.5.
+        arr at: 5 put: true.
+        arr at: 6 put: false.
+        arr at: 7 put: Object new.
+        arr at: 8 put: self new.
+        arr at: 9 put: (Array new: 1).
+        count := 0.
+        arr do: [ :e | e isNil ifFalse: [ count := count + 1 ] ].
+        arr at: 5 put: nil.
+        arr do: [ :e | e isNil ifFalse: [ count := count + 1 ] ].
+        ^count )
+    fieldAndSends = ( | o | o := self new. ^o foo + o foo + 1 )
+    readGlobal = ( ^SendCacheTestGlobal )
+    unknownGlobal: name = ( ^#unknown )
+    manyLiterals = ( ^#(%s) )
+)
+""" % " ".join(["#s%d" % i for i in range(300)])
+
+_test_subclass = """SendCacheSubTest = SendCacheTest (
+    foo = ( ^super foo + 10 )
+----
+    callFoo = ( ^self new foo )
+)
+"""
+
+
+som_classes = [_test_class, _test_subclass]
+
+
+def _execute(u, clazz, selector):
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    return u._start_method_execution(clazz, method).get_embedded_integer()
+
+
+def test_megamorphic_send_site(universe_and_class):
+    u, clazz = universe_and_class
+    assert 9 + 8 == _execute(u, clazz, "megamorphic")
+    assert 9 + 8 == _execute(u, clazz, "megamorphic")
+
+
+def _foo_returning_2(ivkbl, frame, interpreter):
+    frame.pop()
+    frame.push(Integer(2))
+
+
+def test_cache_invalidated_when_method_is_replaced(universe_and_class):
+    u, clazz = universe_and_class
+    assert 1 == _execute(u, clazz, "callFoo")
+
+    clazz.add_instance_invokable(Primitive("foo", u, _foo_returning_2))
+    assert 2 == _execute(u, clazz, "callFoo")
+
+
+def test_replaced_method_keeps_other_cache_entries(universe_and_class):
+    u, clazz = universe_and_class
+    subclass = u.load_class(u.symbol_for("SendCacheSubTest"))
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for("callFoo"))
+    assert 1 == _execute(u, clazz, "callFoo")
+
+    # the unrelated redefinition does not discard the entry of the class
+    entry = method.get_inline_cache(1)
+    assert entry.receiver_class is clazz
+    subclass.add_instance_invokable(Primitive("foo", u, _foo_returning_2))
+    assert 1 == _execute(u, clazz, "callFoo")
+    assert method.get_inline_cache(1) is entry
+
+
+def test_caches_are_allocated_only_for_send_sites(universe_and_class):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(
+        u.symbol_for("fieldAndSends"))
+    # new, foo, foo, and the two quick sends of +
+    assert 5 == method.get_number_of_send_sites()
+    assert 0 == method.get_number_of_field_sites()
+    assert 3 == _execute(u, clazz, "fieldAndSends")
+
+
+def test_methods_with_many_literals(universe_and_class):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for("manyLiterals"))
+    assert method.get_number_of_literals() > 256
+
+    arr = u._start_method_execution(clazz, method)
+    assert 300 == arr.get_number_of_indexable_fields()
+    assert "#s0" == str(arr.get_indexable_field(0))
+    assert "#s299" == str(arr.get_indexable_field(299))
+
+
+def test_global_associations_are_cached(universe_and_class):
+    u, clazz = universe_and_class
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for("readGlobal"))
+    name = u.symbol_for("SendCacheTestGlobal")
+
+    # unknown globals are not cached, and looked up again
+    assert u.symbol_for("unknown") is u._start_method_execution(clazz, method)
+    assert method.get_global_cache(0) is None
+
+    u.set_global(name, Integer.box(5))
+    assert 5 == _execute(u, clazz, "readGlobal")
+    assert method.get_global_cache(0) is u.get_globals_association(name)
+
+    u.set_global(name, Integer.box(6))
+    assert 6 == _execute(u, clazz, "readGlobal")
+
+
+def test_super_send_cache_invalidated_when_method_is_replaced(
+        universe_and_class):
+    u, clazz = universe_and_class
+    subclass = u.load_class(u.symbol_for("SendCacheSubTest"))
+    method = subclass.lookup_invokable(u.symbol_for("foo"))
+    # the super send and the quick send of +
+    assert 2 == method.get_number_of_send_sites()
+
+    assert 11 == _execute(u, subclass, "callFoo")
+    assert method.get_inline_cache(0).receiver_class is clazz
+
+    clazz.add_instance_invokable(Primitive("foo", u, _foo_returning_2))
+    assert 12 == _execute(u, subclass, "callFoo")
@@ -0,0 +1,89 @@
+import pytest
+
+from rlib.arithmetic import bigint_from_str
+from som.vm.globals import trueObject
+from som.vmobjects.biginteger import BigInteger
+from som.vmobjects.hash_map import KeyComparator, _hash_of
+
+
+_key_class = """HashMapKey = (
+    | id |
+    id = ( ^id )
+    id: anId = ( id := anId )
+    = other = ( ^(other class == HashMapKey) and: [ id = other id ] )
+    hashcode = ( ^id / 3 )
+----
+    id: anId = ( ^self new id: anId )
+)
+"""
+
+_test_class = """HashMapTest = (
+----
+    ints = ( | m | m := HashMap new.
+             1 to: 100 do: [ :i | m at: i put: i * 2 ].
+             m removeKey: 50.
+             ^(m at: 10) + m size + ((m includesKey: 50) ifTrue: [ 1000 ] ifFalse: [ 0 ]) )
+    strings = ( | m | m := HashMap new.
+             m at: 'a' put: 1. m at: 'b' put: 2. m at: 'a' put: 3.
+             ^(m at: 'a') + (m at: 'b') + m size )
+    symbolsAreNotStrings = ( | m | m := HashMap new.
+             m at: #a put: 1. m at: 'a' put: 2.
+             ^(m at: #a) * 10 + (m at: 'a') )
+    mixed = ( | m sum | m := HashMap new.
+             m at: 1 put: 1. m at: 'one' put: 2. m at: #one put: 3.
+             m at: 1.5 put: 4. m at: (Array new: 1) put: 5.
+             sum := 0.
+             m keysDo: [ :k | sum := sum + (m at: k) ].
+             ^sum * 10 + m size )
+    customKeys = ( | m |  m := HashMap new.
+             1 to: 20 do: [ :i | m at: (HashMapKey id: i) put: i ].
+             m at: (HashMapKey id: 3) put: 33.
+             m removeKey: (HashMapKey id: 4).
+             ^(m at: (HashMapKey id: 3)) + m size +
+              ((m includesKey: (HashMapKey id: 4)) ifTrue: [ 1000 ] ifFalse: [ 0 ]) )
+    missing = ( | m | m := HashMap new. m at: 1 put: 2.
+             ^(m removeKey: 3) isNil and: [ (m at: 'x') isNil ] )
+)
+"""
+
+
+som_classes = [_key_class, _test_class]
+
+
+def _execute(u, selector):
+    clazz = u.load_class(u.symbol_for("HashMapTest"))
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    return u._start_method_execution(clazz, method)
+
+
+@pytest.mark.parametrize("selector,expected", [
+    ("ints",                  20 + 99),
+    ("strings",               3 + 2 + 2),
+    ("symbolsAreNotStrings",  12),
+    ("mixed",                 155),
+    ("customKeys",            33 + 19),
+])
+def test_hash_map(universe, selector, expected):
+    assert expected == _execute(universe, selector).get_embedded_integer()
+
+
+def test_missing_keys_answer_nil(universe):
+    assert _execute(universe, "missing") is trueObject
+
+
+class _BigHashcodeComparator(KeyComparator):
+    """ Answers a new, but equal, BigInteger for every hashcode send """
+
+    def __init__(self):
+        self.hashcodes = []
+
+    def hashcode(self, key):
+        result = BigInteger(bigint_from_str("100000000000000000000"))
+        self.hashcodes.append(result)
+        return result
+
+
+def test_big_integer_hashcodes_are_hashed_by_value():
+    comparator = _BigHashcodeComparator()
+    key = object()
+    assert _hash_of(key, comparator) == _hash_of(key, comparator)
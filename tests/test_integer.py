@@ -0,0 +1,37 @@
+from som.vmobjects.integer import (Integer, boxing_statistics,
+                                   SMALL_INTEGER_MIN, SMALL_INTEGER_MAX)
+
+
+def test_small_integers_are_shared():
+    assert Integer.box(0) is Integer.box(0)
+    assert Integer.box(SMALL_INTEGER_MIN) is Integer.box(SMALL_INTEGER_MIN)
+    assert Integer.box(SMALL_INTEGER_MAX) is Integer.box(SMALL_INTEGER_MAX)
+    assert SMALL_INTEGER_MAX == Integer.box(SMALL_INTEGER_MAX).get_embedded_integer()
+
+
+def test_other_integers_are_allocated():
+    big = SMALL_INTEGER_MAX + 1
+    assert Integer.box(big) is not Integer.box(big)
+    assert big == Integer.box(big).get_embedded_integer()
+    assert SMALL_INTEGER_MIN - 1 == Integer.box(SMALL_INTEGER_MIN - 1).get_embedded_integer()
+
+
+def test_arithmetic_results_are_boxed_from_the_cache():
+    assert Integer.box(3).prim_add(Integer.box(4)) is Integer.box(7)
+    assert Integer.box(3).prim_subtract(Integer.box(4)) is Integer.box(-1)
+
+
+def test_hit_rate_is_counted():
+    boxing_statistics.enable()
+    boxing_statistics.reset()
+    try:
+        Integer.box(1)
+        Integer.box(2)
+        Integer.box(3)
+        Integer.box(SMALL_INTEGER_MAX + 1)
+        assert 3 == boxing_statistics.hits
+        assert 1 == boxing_statistics.misses
+        assert 0.75 == boxing_statistics.hit_rate()
+    finally:
+        boxing_statistics.disable()
+        boxing_statistics.reset()
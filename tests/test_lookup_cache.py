@@ -0,0 +1,81 @@
+from som.vmobjects.primitive import Primitive
+
+
+_super_class = """LookupSuper = (
+    foo = ( ^1 )
+    bar = ( ^2 )
+)
+"""
+
+_sub_class = """LookupSub = LookupSuper (
+    bar = ( ^3 )
+)
+"""
+
+
+som_classes = [_super_class, _sub_class]
+
+
+def _lookup(u, class_name, selector):
+    clazz = u.load_class(u.symbol_for(class_name))
+    return clazz.lookup_invokable(u.symbol_for(selector))
+
+
+def test_lookup_finds_inherited_and_overridden_methods(universe):
+    u = universe
+    super_class = u.load_class(u.symbol_for("LookupSuper"))
+    sub_class   = u.load_class(u.symbol_for("LookupSub"))
+
+    assert _lookup(u, "LookupSub", "foo").get_holder() is super_class
+    assert _lookup(u, "LookupSub", "bar").get_holder() is sub_class
+    assert _lookup(u, "LookupSuper", "bar").get_holder() is super_class
+    assert _lookup(u, "LookupSub", "baz") is None
+
+
+def test_redefinition_in_superclass_invalidates_subclass_lookup(universe):
+    u = universe
+    assert _lookup(u, "LookupSub", "foo") is _lookup(u, "LookupSuper", "foo")
+
+    new_foo = Primitive("foo", u, None)
+    u.load_class(u.symbol_for("LookupSuper")).add_instance_invokable(new_foo)
+
+    assert _lookup(u, "LookupSuper", "foo") is new_foo
+    assert _lookup(u, "LookupSub", "foo") is new_foo
+
+
+def test_redefinition_in_subclass_does_not_affect_superclass(universe):
+    u = universe
+    super_foo = _lookup(u, "LookupSuper", "foo")
+    assert _lookup(u, "LookupSub", "foo") is super_foo
+
+    new_foo = Primitive("foo", u, None)
+    u.load_class(u.symbol_for("LookupSub")).add_instance_invokable(new_foo)
+
+    assert _lookup(u, "LookupSub", "foo") is new_foo
+    assert _lookup(u, "LookupSuper", "foo") is super_foo
+
+
+def test_redefinition_bumps_version_of_class_and_subclasses(universe):
+    u = universe
+    super_class = u.load_class(u.symbol_for("LookupSuper"))
+    sub_class   = u.load_class(u.symbol_for("LookupSub"))
+    super_version = super_class._version
+    sub_version   = sub_class._version
+
+    sub_class.add_instance_invokable(Primitive("foo", u, None))
+    assert super_class._version == super_version
+    assert sub_class._version   == sub_version + 1
+
+    super_class.add_instance_invokable(Primitive("bar", u, None))
+    assert super_class._version == super_version + 1
+    assert sub_class._version   == sub_version + 2
+
+
+def test_redefinition_in_unrelated_class_keeps_cached_lookups(universe):
+    u = universe
+    super_class = u.load_class(u.symbol_for("LookupSuper"))
+    foo = _lookup(u, "LookupSuper", "foo")
+    assert u.get_lookup_cache().lookup(super_class, u.symbol_for("foo")) is foo
+
+    u.integerClass.add_instance_invokable(Primitive("foo", u, None))
+    assert u.get_lookup_cache().lookup(super_class, u.symbol_for("foo")) is foo
@@ -0,0 +1,73 @@
+from som.interpreter.objectstorage.storage_location import \
+    UnwrittenStorageLocation
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
+from som.vmobjects.object_with_layout import ObjectWithLayout
+
+
+_test_class = """LayoutTest = (
+    | int dbl obj |
+    int = ( ^int )
+    dbl = ( ^dbl )
+    obj = ( ^obj )
+    int: i dbl: d obj: o = ( int := i. dbl := d. obj := o )
+    inc = ( int := int + 1 )
+----
+    | counter |
+    withInt: i dbl: d obj: o = ( ^self new int: i dbl: d obj: o )
+    count = ( counter isNil ifTrue: [ counter := 0 ].
+              counter := counter + 1. ^counter )
+    loop  = ( | o | o := self withInt: 0 dbl: 1.5 obj: nil.
+              1 to: 100 do: [ :i | o inc ].
+              ^o int )
+    generalize = ( | o | o := self withInt: 1 dbl: 2.5 obj: 3.
+                   o int: 'str' dbl: o dbl obj: o obj.
+                   ^o )
+)
+"""
+
+
+som_classes = [_test_class]
+
+
+def _execute(u, selector):
+    clazz = u.load_class(u.symbol_for("LayoutTest"))
+    method = clazz.get_class(u).lookup_invokable(u.symbol_for(selector))
+    return u._start_method_execution(clazz, method)
+
+
+def test_fields_are_stored_unboxed(universe):
+    assert 100 == _execute(universe, "loop").get_embedded_integer()
+
+    clazz = universe.load_class(universe.symbol_for("LayoutTest"))
+    layout = clazz.get_layout_for_instances()
+    assert [Integer, Double] == layout._storage_types[:2]
+    assert isinstance(layout.get_storage_location(2), UnwrittenStorageLocation)
+
+
+def test_fields_are_generalized(universe):
+    obj = _execute(universe, "generalize")
+    assert isinstance(obj, ObjectWithLayout)
+    assert 3 == obj.get_number_of_fields()
+    assert '"str"' == str(obj.get_field(0))
+    assert 2.5 == obj.get_field(1).get_embedded_double()
+    assert 3 == obj.get_field(2).get_embedded_integer()
+    assert obj.get_object_layout() is obj.get_class(universe).get_layout_for_instances()
+
+
+def test_class_side_fields(universe):
+    assert 1 == _execute(universe, "count").get_embedded_integer()
+    assert 2 == _execute(universe, "count").get_embedded_integer()
+
+
+def test_number_of_layouts_of_class(universe):
+    assert 100 == _execute(universe, "loop").get_embedded_integer()
+    assert 100 == _execute(universe, "loop").get_embedded_integer()
+
+    clazz = universe.load_class(universe.symbol_for("LayoutTest"))
+    # the initial layout, and the ones with int and dbl initialized
+    assert 3 == clazz.get_number_of_layouts()
+
+    _execute(universe, "generalize")
+    # obj initialized, then int generalized
+    assert 5 == clazz.get_number_of_layouts()